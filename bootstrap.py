@@ -0,0 +1,91 @@
+from statistics import NormalDist
+
+import numpy as np
+
+"""
+🥾 Multinomial Bootstrap for Count-Based Metrics 🥾
+
+Metrics such as precision or sensitivity are ratios of category counts. Bootstrapping them the naive
+way means resampling (or re-simulating) the whole population thousands of times. Resampling a
+population of N people with replacement only changes how many of them fall in each category, so a
+bootstrap replicate is exactly one multinomial draw of N over the observed category shares.
+Thousands of replicates are a single (replicates x categories) array, whatever the population size.
+
+Intervals:
+- Percentile: the quantiles of the replicated metric.
+- BCa (bias-corrected and accelerated): the quantiles are shifted by the median bias z0 of the
+  replicates and the acceleration a from a jackknife. Leaving one person out only removes one count
+  from their category, so the jackknife needs one value per category, weighted by its count.
+"""
+
+
+class BootstrapInterval:
+    def __init__(self, estimate, percentile, bca, replicates):
+        self.estimate = estimate
+        self.percentile = percentile  # (lower, upper)
+        self.bca = bca  # (lower, upper)
+        self.replicates = replicates  # Replicated metric values (NaN where undefined)
+
+
+def multinomial_bootstrap(counts, statistic, replicates=10000, confidence=0.95, rng=None):
+    """
+    :param counts: Observed count of every category, e.g. [TP, FP, TN, FN]
+    :param statistic: f(counts) -> metric, vectorized over the last axis of a (..., categories) array
+    :param replicates: Number of bootstrap replicates
+    :return: BootstrapInterval with the percentile and BCa intervals
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    counts = np.asarray(counts, dtype=np.int64)
+    total = counts.sum()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimate = float(statistic(counts))
+        resampled = rng.multinomial(total, counts / total, size=replicates)
+        values = statistic(resampled)
+
+    valid = values[~np.isnan(values)]
+    if np.isnan(estimate) or len(valid) == 0:
+        return BootstrapInterval(estimate, (np.nan, np.nan), (np.nan, np.nan), values)
+
+    alpha = (1 - confidence) / 2
+    percentile = tuple(np.quantile(valid, [alpha, 1 - alpha]))
+    return BootstrapInterval(estimate, percentile, bca_interval(counts, statistic, estimate, valid, alpha), values)
+
+
+def bca_interval(counts, statistic, estimate, values, alpha):
+    normal = NormalDist()
+
+    # Median bias: share of replicates below the estimate, on the normal scale (ties count half)
+    below = (np.count_nonzero(values < estimate) + 0.5 * np.count_nonzero(values == estimate)) / len(values)
+    if below <= 0 or below >= 1:
+        return tuple(np.quantile(values, [alpha, 1 - alpha]))
+    z0 = normal.inv_cdf(below)
+    acceleration = jackknife_acceleration(counts, statistic)
+
+    bounds = []
+    for z_alpha in (normal.inv_cdf(alpha), normal.inv_cdf(1 - alpha)):
+        adjusted = z0 + (z0 + z_alpha) / (1 - acceleration * (z0 + z_alpha))
+        bounds.append(np.quantile(values, normal.cdf(adjusted)))
+    return tuple(bounds)
+
+
+def jackknife_acceleration(counts, statistic):
+    """
+    BCa acceleration from the jackknife over all N people, computed from one value per category.
+
+    :param counts: Observed count of every category
+    :param statistic: f(counts) -> metric, vectorized over the last axis
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+
+    # Jackknife over people: removing one person of category k gives the same value for all n_k of them
+    present = np.flatnonzero(counts > 0)
+    leave_one_out = counts[None, :] - (present[:, None] == np.arange(len(counts)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jackknife = statistic(leave_one_out)
+    weights = counts[present]
+    usable = ~np.isnan(jackknife)
+    weights, jackknife = weights[usable], jackknife[usable]
+    mean = np.sum(weights * jackknife) / weights.sum()
+    spread = np.sum(weights * (mean - jackknife)**2)
+    return np.sum(weights * (mean - jackknife)**3) / (6 * spread**1.5) if spread > 0 else 0.0
@@ -0,0 +1,113 @@
+import importlib
+import inspect
+import os
+import pickle
+import sys
+import time
+
+"""
+💾 Checkpoint & Resume for Long-Running Simulations 💾
+
+Very large runs (e.g. billions of trading paths) can take hours, and a crash or a pre-empted
+machine would otherwise lose all progress. Simulations that support checkpointing periodically
+write their accumulators together with the exact state of their random bit generator to disk.
+
+Key Features:
+- `Checkpointer(path, every_seconds, every_chunks)` decides when to write and writes atomically.
+- A resumed run continues from the saved chunk with the saved generator state, so its results
+  are identical to a run that was never interrupted.
+- The checkpoint is deleted once the run completes.
+
+A simulation supports checkpointing by accepting a `checkpoint` argument, naming its compute method
+in the `checkpoint_method` class attribute (that method takes `resume_from`), and returning its
+constructor arguments from `checkpoint_params()`.
+
+Usage:
+    app = MonteCarloTradeMarket(100, 110, 95, rep_num=10**9, checkpoint=Checkpointer("trade.ckpt"))
+    app.run()
+
+    # After a crash, continue from the command line:
+    python checkpoint.py trade.ckpt
+"""
+
+
+class Checkpointer:
+    def __init__(self, path, every_seconds=60, every_chunks=None):
+        """
+        :param path: File the checkpoint is written to
+        :param every_seconds: Minimum time between two checkpoints
+        :param every_chunks: Also write after this many chunks, regardless of time (optional)
+        """
+        self.path = path
+        self.every_seconds = every_seconds
+        self.every_chunks = every_chunks
+        self.last_save = time.monotonic()
+        self.chunks_since_save = 0
+
+    def maybe_save(self, simulation, completed, accumulators, rng):
+        self.chunks_since_save += 1
+        due_by_time = self.every_seconds is not None and time.monotonic() - self.last_save >= self.every_seconds
+        due_by_chunks = self.every_chunks is not None and self.chunks_since_save >= self.every_chunks
+        if due_by_time or due_by_chunks:
+            self.save(simulation, completed, accumulators, rng)
+
+    def save(self, simulation, completed, accumulators, rng):
+        cls = type(simulation)
+        payload = {
+            "module": os.path.splitext(os.path.basename(inspect.getfile(cls)))[0],
+            "class": cls.__qualname__,
+            "params": simulation.checkpoint_params(),
+            "completed": completed,
+            "accumulators": accumulators,
+            "rng_state": rng.bit_generator.state,
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)  # A crash while writing never corrupts the last checkpoint
+
+        self.last_save = time.monotonic()
+        self.chunks_since_save = 0
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def load_checkpoint(path):
+    with open(path, "rb") as file:
+        return pickle.load(file)
+
+
+def resume(path, every_seconds=60, every_chunks=None):
+    """
+    Rebuilds the simulation stored in a checkpoint and finishes its compute phase.
+    Further checkpoints keep being written to the same file until the run completes.
+    """
+    payload = load_checkpoint(path)
+    module = importlib.import_module(payload["module"])
+    cls = getattr(module, payload["class"])
+
+    checkpointer = Checkpointer(path, every_seconds=every_seconds, every_chunks=every_chunks)
+    simulation = cls(**payload["params"], checkpoint=checkpointer)
+    getattr(simulation, cls.checkpoint_method)(resume_from=payload)
+    return simulation
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python checkpoint.py <checkpoint file> [figure output path]")
+        return
+
+    simulation = resume(sys.argv[1])
+    if hasattr(simulation, "display_results"):
+        simulation.display_results()
+    else:
+        simulation.display_result()
+
+    if len(sys.argv) > 2:
+        simulation.visualization(sys.argv[2])
+
+
+if __name__ == "__main__":
+    main()
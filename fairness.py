@@ -0,0 +1,295 @@
+import math
+
+import numpy as np
+
+"""
+⚖️ Fairness Tests for Discrete Outcomes ⚖️
+
+Dice, coins, wheels and lotteries should land on every outcome with known probabilities. Printing
+the frequencies does not say whether a deviation is noise or bias; these tests do, and they only
+need the outcome counts, so they run on streaming histograms of any length (1e10 draws included).
+
+Tests (no SciPy needed):
+- Pearson chi-square: Σ (O - E)² / E, chi-square distributed with k - 1 degrees of freedom.
+- G-test: 2 Σ O ln(O / E), the likelihood-ratio version of the same test, with Williams' correction
+  (which helps when there are many outcomes with few expected draws each). Below 10 expected draws
+  per outcome it still rejects too often, so verdicts then ignore it and rely on the chi-square.
+- Maximum cell deviation: the most significant single outcome (exact binomial tails), with a Šidák
+  correction for testing k outcomes. Sensitive to one biased outcome among many.
+- Maximum cumulative deviation: the Kolmogorov-Smirnov distance between the cumulative observed and
+  expected shares (in outcome order), with the Kolmogorov p-value (conservative for discrete outcomes).
+
+The chi-square p-values use the regularized upper incomplete gamma function Q(k/2, x/2), computed
+with its power series or continued fraction; the binomial tails use the regularized incomplete beta
+function, computed with its continued fraction.
+
+Early stopping: `FairnessMonitor` looks at the counts each time the number of draws has doubled.
+Every look (and every test) gets an equal share of the significance level (Bonferroni), so stopping
+at the first rejected look still keeps the overall false alarm rate below `alpha`.
+"""
+
+
+def regularized_gamma(a, x, tolerance=1e-15, max_iterations=1_000_000):
+    """
+    (P(a, x), Q(a, x)), the regularized lower and upper incomplete gamma functions: the series gives P
+    for x < a + 1, Lentz's continued fraction gives Q otherwise. The directly computed one keeps its
+    full relative precision even when it is tiny.
+    """
+    if x <= 0:
+        return 0.0, 1.0
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        term = total = 1 / a
+        denominator = a
+        for _ in range(max_iterations):
+            denominator += 1
+            term *= x / denominator
+            total += term
+            if term < total * tolerance:
+                break
+        lower = min(1.0, total * math.exp(log_prefactor))
+        return lower, 1 - lower
+
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    fraction = d
+    for i in range(1, max_iterations):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        fraction *= delta
+        if abs(delta - 1) < tolerance:
+            break
+    upper = min(1.0, math.exp(log_prefactor) * fraction)
+    return 1 - upper, upper
+
+
+def regularized_gamma_q(a, x):
+    return regularized_gamma(a, x)[1]
+
+
+def chi_square_sf(statistic, dof):
+    """
+    P(X >= statistic) for a chi-square variable with `dof` degrees of freedom.
+    """
+    return regularized_gamma_q(dof / 2, statistic / 2)
+
+
+def regularized_beta(a, b, x, tolerance=1e-15, max_iterations=1_000_000):
+    """
+    I_x(a, b), the regularized incomplete beta function, from Lentz's continued fraction. It converges
+    quickly for x < (a + 1) / (a + b + 2); above that, I_x(a, b) = 1 - I_(1-x)(b, a) is used.
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1 - regularized_beta(b, a, 1 - x, tolerance, max_iterations)
+    log_prefactor = a * math.log(x) + b * math.log1p(-x) - (math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b))
+
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (tiny if abs(d) < tiny else d)
+    fraction = d
+    for m in range(1, max_iterations):
+        # Even and odd terms of the continued fraction
+        for an in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                   -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = an * d + 1
+            d = 1 / (tiny if abs(d) < tiny else d)
+            c = an / c + 1
+            c = tiny if abs(c) < tiny else c
+            delta = d * c
+            fraction *= delta
+        if abs(delta - 1) < tolerance:
+            break
+    return min(1.0, math.exp(log_prefactor) * fraction / a)
+
+
+def outcome_tail_p(count, draws, probability):
+    """
+    Two-sided p-value of one outcome's count, from the exact binomial tails
+    P(X >= k) = I_p(k, n - k + 1) and P(X <= k) = I_(1-p)(n - k, k + 1).
+    """
+    # Only the tail on the side of the deviation can be the smaller one (the median lies next to n·p)
+    if count >= draws * probability:
+        tail = regularized_beta(count, draws - count + 1, probability) if count > 0 else 1.0
+    else:
+        tail = regularized_beta(draws - count, count + 1, 1 - probability) if count < draws else 1.0
+    return min(1.0, 2 * tail)
+
+
+def kolmogorov_sf(x):
+    """
+    P(K >= x) for the Kolmogorov distribution (limit of √n · D).
+    """
+    if x < 0.2:
+        return 1.0
+    total = sum((-1)**(k - 1) * math.exp(-2 * k**2 * x**2) for k in range(1, 101))
+    return min(1.0, max(0.0, 2 * total))
+
+
+class FairnessResult:
+    def __init__(self, draws, chi_square, g_statistic, dof, chi_square_p, g_p, max_cell_z, max_cell, max_cell_p,
+                 max_cumulative_deviation, cumulative_p, min_expected):
+        self.draws = draws
+        self.dof = dof
+        self.chi_square = chi_square
+        self.chi_square_p = chi_square_p
+        self.g_statistic = g_statistic
+        self.g_p = g_p
+        self.max_cell_z = max_cell_z
+        self.max_cell = max_cell  # Index of the outcome with the largest standardized deviation
+        self.max_cell_p = max_cell_p
+        self.max_cumulative_deviation = max_cumulative_deviation
+        self.cumulative_p = cumulative_p
+        self.min_expected = min_expected  # Fewest expected draws of any possible outcome
+
+    @property
+    def g_reliable(self):
+        return self.min_expected >= 10
+
+    @property
+    def min_p_value(self):
+        p_values = [self.chi_square_p, self.max_cell_p, self.cumulative_p] + ([self.g_p] if self.g_reliable else [])
+        return min(p_values)
+
+    def display(self, labels=None):
+        worst = labels[self.max_cell] if labels is not None else self.max_cell
+        print(f"⚖️ Fairness Tests ({self.draws:,} draws, {self.dof + 1} outcomes):")
+        print(f"Chi-Square: {self.chi_square:.2f} with {self.dof} degrees of freedom, p = {self.chi_square_p:.4g}")
+        note = "" if self.g_reliable else f" (unreliable: only {self.min_expected:.1f} draws expected for some outcomes)"
+        print(f"G-Test: {self.g_statistic:.2f}, p = {self.g_p:.4g}{note}")
+        print(f"Max Outcome Deviation: {self.max_cell_z:.2f} standard errors (outcome {worst}), p = {self.max_cell_p:.4g}")
+        print(f"Max Cumulative Deviation: {self.max_cumulative_deviation:.3g}, p = {self.cumulative_p:.4g}")
+
+
+def fairness_statistics(counts, probabilities=None):
+    """
+    :param counts: Observed count of every outcome
+    :param probabilities: Expected probability of every outcome (default: uniform)
+    :return: FairnessResult with all statistics and p-values
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    k = len(counts)
+    probabilities = np.full(k, 1 / k) if probabilities is None else np.asarray(probabilities, dtype=np.float64)
+    draws = counts.sum()
+    expected = draws * probabilities
+
+    # Outcomes with probability 0 carry no degrees of freedom; observing one of them is bias by itself
+    possible = probabilities > 0
+    impossible_hits = counts[~possible].sum()
+    dof = max(int(np.count_nonzero(possible)) - 1, 1)
+    observed, expected_possible = counts[possible], expected[possible]
+
+    chi_square = float(np.sum((observed - expected_possible)**2 / expected_possible))
+    nonzero = observed > 0
+    g_statistic = float(2 * np.sum(observed[nonzero] * np.log(observed[nonzero] / expected_possible[nonzero])))
+    g_statistic /= 1 + (dof + 2) / (6 * draws)  # Williams' correction, (k + 1) / 6N for k outcomes
+
+    spread = np.sqrt(expected * (1 - probabilities))
+    z = np.divide(np.abs(counts - expected), spread, out=np.zeros(k), where=spread > 0)
+    # Exact tails for the most deviant outcomes, then Šidák: the chance that at least one of the
+    # k outcomes deviates this much by chance
+    candidates = np.argpartition(-z, min(16, k) - 1)[:16] if k > 16 else np.arange(k)
+    tails = [outcome_tail_p(int(counts[i]), draws, probabilities[i]) if probabilities[i] > 0 else 1.0 for i in candidates]
+    max_cell = int(candidates[int(np.argmin(tails))])
+    smallest = min(tails)
+    max_cell_p = -math.expm1(k * math.log1p(-smallest)) if smallest < 1 else 1.0
+
+    deviation = float(np.max(np.abs(np.cumsum(counts) - np.cumsum(expected)))) / draws
+    cumulative_p = kolmogorov_sf(math.sqrt(draws) * deviation)
+
+    chi_square_p, g_p = chi_square_sf(chi_square, dof), chi_square_sf(g_statistic, dof)
+    if impossible_hits > 0:
+        chi_square_p = g_p = max_cell_p = 0.0
+    return FairnessResult(int(draws), chi_square, g_statistic, dof, chi_square_p, g_p, float(z[max_cell]), max_cell,
+                          max_cell_p, deviation, cumulative_p, float(expected_possible.min()))
+
+
+class FairnessMonitor:
+    def __init__(self, probabilities, alpha=0.01, planned_draws=None, first_look=100_000):
+        """
+        Accumulates outcome counts chunk by chunk and tests them every time the draws have doubled.
+
+        :param probabilities: Expected probability of every outcome
+        :param alpha: Overall false alarm rate, split evenly over the looks and the four tests
+        :param planned_draws: Total draws planned; fixes the number of looks (default: up to 40 looks)
+        :param first_look: Draws before the first test
+        """
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.counts = np.zeros(len(self.probabilities), dtype=np.int64)
+        self.draws = 0
+        self.alpha = alpha
+        self.next_look = first_look
+        self.max_looks = math.ceil(math.log2(max(planned_draws / first_look, 1))) + 1 if planned_draws else 40
+        self.look_alpha = alpha / (4 * self.max_looks)
+        self.looks = 0
+        self.result = None
+        self.biased = False
+
+    def update(self, counts):
+        """
+        :return: True once a bias has been detected
+        """
+        self.counts += counts
+        self.draws += int(np.sum(counts))
+        if self.draws >= self.next_look and self.looks < self.max_looks - 1:
+            self.look()
+            while self.next_look <= self.draws:
+                self.next_look *= 2
+        return self.biased
+
+    def look(self):
+        self.looks += 1
+        self.result = fairness_statistics(self.counts, self.probabilities)
+        # Rejection is sticky: the alpha split over the looks assumes a detected bias is never withdrawn
+        self.biased = self.biased or self.result.min_p_value < self.look_alpha
+
+    def finish(self):
+        # Final test on all draws, unless the last look already saw them
+        if self.result is None or self.result.draws != self.draws:
+            self.look()
+        return self.result
+
+    def display(self, labels=None):
+        self.result.display(labels)
+        verdict = "⚠️ Bias detected" if self.biased else "✅ No bias detected"
+        print(f"{verdict} at overall significance {self.alpha} ({self.looks} looks, threshold p < {self.look_alpha:.2g} per test)")
+
+
+def count_outcomes(outcomes, num_outcomes):
+    """
+    Histogram of outcome indices. For a few outcomes, one comparison pass per outcome is faster than
+    bincount, which first converts small integer types to the platform integer.
+    """
+    if num_outcomes <= 16:
+        return np.array([np.count_nonzero(outcomes == i) for i in range(num_outcomes)], dtype=np.int64)
+    return np.bincount(outcomes, minlength=num_outcomes)
+
+
+def stream_fairness(draw, probabilities, num_draws, chunk_size=10_000_000, alpha=0.01, early_stop=True, first_look=100_000):
+    """
+    Draws outcomes chunk by chunk, counts them and tests the counts along the way.
+
+    :param draw: draw(size) -> array of outcome indices in 0..k-1
+    :param early_stop: Stop drawing at the first look that detects a bias
+    :return: FairnessMonitor holding the counts, the final result and the verdict
+    """
+    monitor = FairnessMonitor(probabilities, alpha, num_draws, first_look)
+    for start in range(0, num_draws, chunk_size):
+        outcomes = draw(min(chunk_size, num_draws - start))
+        if monitor.update(count_outcomes(outcomes, len(monitor.counts))) and early_stop:
+            break
+    monitor.finish()
+    return monitor
@@ -0,0 +1,106 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+"""
+🖼️ Figure Export: Rendering Simulation Charts to Files 🖼️
+
+Every simulation in this repository ends its visualization with a chart. By default the chart
+is shown in a window, which blocks and needs a display. This module lets the same charts be
+written to PNG or SVG files with the non-interactive Agg backend instead.
+
+Key Features:
+- `show_or_save` is called at the end of every `visualization` / `visualize` method.
+  Without an output path it behaves exactly like `plt.show()`.
+- `BatchRenderer` draws the figures of many finished simulations in a process pool, so the
+  next simulations can keep computing while the (slow) seaborn heatmaps are being rendered.
+
+Usage:
+    renderer = BatchRenderer(max_workers=4)
+    for size in (8, 10, 12):
+        app = Wheel_EqualDivide(section_size=size)
+        app.monte_carlo_wheel()
+        renderer.submit(app, f"figures/wheel_{size}.png")
+    renderer.wait()
+    renderer.close()
+"""
+
+FIGURE_FORMATS = ("png", "svg")
+
+
+def use_agg_backend():
+    matplotlib.use("Agg", force=True)
+
+
+def show_or_save(fig, output_path=None, dpi=100):
+    """
+    Shows the figure interactively, or saves it to `output_path` and closes it.
+    The file format is taken from the extension of `output_path` (.png or .svg).
+    """
+    if output_path is None:
+        plt.show()
+        return None
+
+    file_format = os.path.splitext(output_path)[1].lstrip(".").lower()
+    if file_format not in FIGURE_FORMATS:
+        plt.close(fig)
+        raise ValueError(f"Unsupported figure format '{file_format}'. Use one of: {', '.join(FIGURE_FORMATS)}")
+
+    try:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fig.savefig(output_path, format=file_format, dpi=dpi)
+    finally:
+        plt.close(fig)  # Also when saving fails, so batch renders do not leak figures
+    return output_path
+
+
+def render_figure(simulation, output_path):
+    """
+    Draws the chart of an already computed simulation into `output_path` using the Agg backend.
+    Works with both method names used in this repository (`visualization` and `visualize`).
+    """
+    use_agg_backend()
+    draw = getattr(simulation, "visualization", None) or getattr(simulation, "visualize")
+    draw(output_path=output_path)
+    return output_path
+
+
+class BatchRenderer:
+    def __init__(self, max_workers=None):
+        """
+        Renders figures of completed simulations in background worker processes.
+
+        :param max_workers: Number of worker processes (default: number of CPUs)
+        """
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, initializer=use_agg_backend)
+        self.futures = []
+
+    def submit(self, simulation, output_path):
+        """
+        Queues the figure of a simulation whose compute step has already run.
+        The simulation object is pickled and sent to a worker, so it must not be modified afterwards.
+        """
+        future = self.executor.submit(render_figure, simulation, output_path)
+        self.futures.append(future)
+        return future
+
+    def wait(self):
+        """
+        Blocks until all queued figures are written and returns their paths.
+        """
+        paths = [future.result() for future in self.futures]
+        self.futures = []
+        return paths
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,131 @@
+import numpy as np
+
+"""
+⚙️ Chunked Monte Carlo Engine ⚙️
+
+Large simulations cannot hold all of their samples in memory at once, so they are generated in
+fixed-size chunks. Every chunk draws from its own random stream, spawned from the run's seed with
+the chunk index, which makes any chunk reproducible on its own.
+
+Key Features:
+- `chunk_rng(seed, index)` gives the independent, reproducible random stream of one chunk.
+- `run_counting_chunks` accumulates hit counts chunk by chunk and returns a small state dict.
+- Passing that state back in extends the run to a larger sample size: only the missing samples
+  are simulated, and the result is identical to a fresh run with the same seed and chunk size.
+- The bit generator is chosen by name (`BIT_GENERATORS`); PCG64, NumPy's default, gives the same
+  streams as `np.random.default_rng`. `rng_benchmark.py` compares them on this repo's kernels.
+- The precision policy is chosen by name (`PRECISIONS`): "double" keeps float64 uniforms and int64
+  outcomes, "single" draws float32 uniforms and uint8/uint16 outcomes to halve (or better) the memory
+  traffic. Counts and sums are always accumulated in int64/float64. `precision_benchmark.py` checks
+  that the estimates stay within tolerance.
+
+📌 Note: A kernel must draw its samples row by row (e.g. `rng.uniform(size=(n, 2))`), so that
+a shorter chunk is always a prefix of the same chunk at full size.
+"""
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+BIT_GENERATORS = {
+    "MT19937": np.random.MT19937,
+    "PCG64": np.random.PCG64,
+    "PCG64DXSM": np.random.PCG64DXSM,
+    "Philox": np.random.Philox,
+    "SFC64": np.random.SFC64,
+}
+DEFAULT_BIT_GENERATOR = "PCG64"
+
+PRECISIONS = {
+    "double": np.float64,
+    "single": np.float32,
+}
+DEFAULT_PRECISION = "double"
+
+
+def resolve_seed(seed):
+    """
+    Returns the seed unchanged, or fresh OS entropy when no seed is given.
+    Keeping the drawn entropy lets an unseeded run be reproduced and extended later (by passing
+    the entropy back as its seed); a ResultCache needs an explicit seed to ever be hit again.
+    """
+    if seed is None:
+        return np.random.SeedSequence().entropy
+    return seed
+
+
+def make_rng(seed=None, bit_generator=DEFAULT_BIT_GENERATOR):
+    """
+    Generator on the named bit generator; make_rng(seed) equals np.random.default_rng(seed).
+
+    :param seed: Integer, SeedSequence or None (fresh OS entropy)
+    :param bit_generator: One of BIT_GENERATORS
+    """
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Unknown bit generator {bit_generator!r}, choose one of {', '.join(BIT_GENERATORS)}")
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seed))
+
+
+def check_precision(precision):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}, choose one of {', '.join(PRECISIONS)}")
+    return precision
+
+
+def float_dtype(precision=DEFAULT_PRECISION):
+    """
+    dtype of the uniforms drawn under the precision policy.
+    """
+    return np.dtype(PRECISIONS[check_precision(precision)])
+
+
+def outcome_dtype(high, precision=DEFAULT_PRECISION):
+    """
+    dtype of discrete outcomes in [0, high): int64 for "double", the smallest unsigned type that holds
+    high - 1 for "single" (uint8 for dice and digits).
+    """
+    if check_precision(precision) == "double":
+        return np.dtype(np.int64)
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if high - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def chunk_rng(seed, index, bit_generator=DEFAULT_BIT_GENERATOR):
+    return make_rng(np.random.SeedSequence(seed, spawn_key=(index,)), bit_generator)
+
+
+def run_counting_chunks(kernel, seed, sample_size, chunk_size=DEFAULT_CHUNK_SIZE, state=None, bit_generator=DEFAULT_BIT_GENERATOR):
+    """
+    Runs `kernel(rng, size, index)` (which returns a hit count) over all chunks of a run.
+
+    :param state: State returned by an earlier run with the same seed and chunk size. Completed
+                  chunks are reused; a trailing partial chunk is simulated again at its new size.
+    :return: State dict with the total `hits` and everything needed to extend the run later.
+    """
+    if state is None or state["chunk_size"] != chunk_size or state["sample_size"] > sample_size:
+        state = {"sample_size": 0, "chunk_size": chunk_size, "full_chunks": 0, "full_hits": 0, "hits": 0}
+    elif state["sample_size"] == sample_size:
+        return state
+
+    full_chunks = state["full_chunks"]
+    full_hits = state["full_hits"]
+    hits = full_hits
+    done = full_chunks * chunk_size
+
+    while done < sample_size:
+        size = min(chunk_size, sample_size - done)
+        count = int(kernel(chunk_rng(seed, full_chunks, bit_generator), size, full_chunks))
+        hits += count
+        done += size
+
+        if size == chunk_size:
+            full_chunks += 1
+            full_hits += count
+
+    return {
+        "sample_size": sample_size,
+        "chunk_size": chunk_size,
+        "full_chunks": full_chunks,
+        "full_hits": full_hits,
+        "hits": hits,
+    }
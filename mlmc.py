@@ -0,0 +1,140 @@
+import math
+
+import matplotlib.pyplot as plt
+import numpy as np
+from figure_export import show_or_save
+from mc_engine import DEFAULT_BIT_GENERATOR, make_rng
+
+"""
+🪜 Multilevel Monte Carlo (MLMC) 🪜
+
+Estimating a quantity that depends on a time discretization (e.g. a barrier on a price path) with
+plain Monte Carlo needs many paths AND many time steps: halving the error costs 4x the paths and
+more steps per path. MLMC writes the finest-level estimate as a telescoping sum
+
+    E[P_L] = E[P_0] + Σ_(l=1..L) E[P_l - P_(l-1)]
+
+and estimates every term independently. The coarse levels are cheap, and the corrections
+P_l - P_(l-1) are computed from the SAME random increments on a fine and a coarse grid, so their
+variance is small and they need few samples. The total cost falls towards O(ε⁻²).
+
+How It Works (Giles, 2008):
+1. Start with a few levels and `initial_samples` samples on each.
+2. From the observed variances V_l and costs C_l, choose N_l ∝ √(V_l / C_l) so that the
+   estimator variance is ε²/2.
+3. When the last level corrections show a bias above ε/√2, add a finer level.
+
+A level function has the signature `level_function(level, num_samples, rng)` and returns
+(sums, cost), with sums = [Σ Y, Σ Y², Σ P_l, Σ P_l²] where Y = P_l - P_(l-1) (Y = P_0 on level 0),
+and cost the work spent (e.g. number of path steps). Level l is expected to use twice the time
+steps of level l - 1.
+"""
+
+
+class MLMCResult:
+    def __init__(self, estimate, rmse, samples, level_means, level_variances, level_costs, plain_variance, target_rmse, plain_unit_cost):
+        self.estimate = estimate
+        self.rmse = rmse  # Estimated from the sampling variance and the bias of the last level
+        self.target_rmse = target_rmse
+        self.samples = samples
+        self.level_means = level_means
+        self.level_variances = level_variances
+        self.level_costs = level_costs  # Cost of one sample on every level
+        self.total_cost = float(np.sum(samples * level_costs))
+        # Plain Monte Carlo on the finest grid reaching the same sampling error
+        self.plain_cost = 2 * plain_variance * plain_unit_cost / target_rmse**2
+
+    @property
+    def levels(self):
+        return len(self.samples) - 1
+
+
+def run_mlmc(level_function, target_rmse, initial_samples=2000, min_levels=3, max_level=12, seed=None, alpha=None, beta=None,
+             bit_generator=DEFAULT_BIT_GENERATOR):
+    """
+    :param level_function: level_function(level, num_samples, rng) -> (sums, cost), see the module docstring
+    :param target_rmse: Root-mean-square error the estimate should reach
+    :param min_levels: Levels used from the start (levels 0..min_levels-1)
+    :param alpha: Weak-error decay rate |E[Y_l]| ∝ 2^(-α l) (estimated from the data if None)
+    :param beta: Variance decay rate V_l ∝ 2^(-β l) (estimated from the data if None)
+    :param bit_generator: Name of the bit generator (see mc_engine.py)
+    """
+    if min_levels < 3:
+        raise ValueError("MLMC needs at least 3 initial levels to estimate the decay rates.")
+
+    rng = make_rng(seed, bit_generator)
+    num_levels = min_levels
+    sums = np.zeros((num_levels, 4))
+    costs = np.zeros(num_levels)
+    samples = np.zeros(num_levels, dtype=np.int64)
+    extra = np.full(num_levels, initial_samples, dtype=np.int64)
+
+    while extra.sum() > 0:
+        for level in np.flatnonzero(extra > 0):
+            level_sums, cost = level_function(level, int(extra[level]), rng)
+            sums[level] += level_sums
+            costs[level] += cost
+        samples += extra
+
+        means = np.abs(sums[:, 0] / samples)
+        variances = np.maximum(sums[:, 1] / samples - (sums[:, 0] / samples)**2, 0)
+        unit_costs = costs / samples
+
+        # Decay rates from a fit over the levels above 0, whose corrections follow the asymptotic regime
+        levels = np.arange(1, num_levels)
+        alpha_hat = alpha if alpha is not None else max(0.5, -np.polyfit(levels, np.log2(means[1:] + 1e-300), 1)[0])
+        beta_hat = beta if beta is not None else max(0.5, -np.polyfit(levels, np.log2(variances[1:] + 1e-300), 1)[0])
+
+        # Optimal samples per level for a sampling variance of ε²/2
+        optimal = np.ceil(2 / target_rmse**2 * np.sqrt(variances / unit_costs) * np.sum(np.sqrt(variances * unit_costs)))
+        extra = np.maximum(optimal.astype(np.int64) - samples, 0)
+
+        if np.all(extra <= 0.01 * samples):
+            # Remaining bias, extrapolated from the last corrections
+            last = num_levels - 1
+            remaining = max(means[last - k] / 2**(alpha_hat * k) for k in range(min(3, num_levels - 1))) / (2**alpha_hat - 1)
+            if remaining > target_rmse / math.sqrt(2) and num_levels <= max_level:
+                # Add a level; its variance and cost are extrapolated until it has samples of its own
+                num_levels += 1
+                variances = np.append(variances, variances[-1] / 2**beta_hat)
+                unit_costs = np.append(unit_costs, unit_costs[-1] * 2)
+                sums = np.vstack([sums, np.zeros(4)])
+                costs = np.append(costs, 0.0)
+                samples = np.append(samples, 0)
+                optimal = np.ceil(2 / target_rmse**2 * np.sqrt(variances / unit_costs) * np.sum(np.sqrt(variances * unit_costs)))
+                extra = np.maximum(optimal.astype(np.int64) - samples, 0)
+            else:
+                extra[:] = 0
+
+    estimate = np.sum(sums[:, 0] / samples)
+    level_means = sums[:, 0] / samples
+    sampling_variance = np.sum(variances / samples)
+    bias = abs(level_means[-1]) / (2**alpha_hat - 1)
+    plain_variance = sums[-1, 3] / samples[-1] - (sums[-1, 2] / samples[-1])**2
+    plain_unit_cost = unit_costs[0] * 2**(num_levels - 1)  # One path on the finest grid, without a coarse partner
+    return MLMCResult(estimate, math.sqrt(sampling_variance + bias**2), samples, level_means, variances, unit_costs,
+                      plain_variance, target_rmse, plain_unit_cost)
+
+
+def cost_study(level_function, target_rmses, **options):
+    """
+    Runs MLMC for several accuracy targets; the results show how the total cost grows as ε shrinks.
+    """
+    return [run_mlmc(level_function, target, **options) for target in target_rmses]
+
+
+def plot_cost_study(results, title="Multilevel Monte Carlo: Cost versus Accuracy", output_path=None):
+    targets = np.array([result.target_rmse for result in results])
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.loglog(targets, [result.total_cost for result in results], "o-", color="#f6be06", label="MLMC")
+    ax.loglog(targets, [result.plain_cost for result in results], "s--", color="#370560", label="Plain Monte Carlo (finest grid)")
+    ax.set_xlabel("Target RMSE ε", fontsize=12)
+    ax.set_ylabel("Total Cost (path steps)", fontsize=12)
+    ax.set_title(title, fontsize=17, color="#393d47")
+    ax.legend()
+    ax.grid(True, which="both", alpha=0.3)
+
+    for result in results:
+        ax.annotate(f"RMSE {result.rmse:.1e}", (result.target_rmse, result.total_cost), textcoords="offset points",
+                    xytext=(5, 8), fontsize=9, color="#393d47")
+    show_or_save(fig, output_path)
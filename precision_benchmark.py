@@ -0,0 +1,212 @@
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+from figure_export import show_or_save
+from mc_engine import PRECISIONS, float_dtype, outcome_dtype
+from simulation_of_area_of_right_triangle import Triangle
+from simulation_of_dice_roll_distribution import Dice
+from simulation_of_last_digit_even_number import PhoneNumber
+from simulation_of_metro_waiting import MetroWaitSim
+from simulation_of_pi import MonteCarloPi
+
+"""
+🎯 Precision Policy Benchmark 🎯
+
+The "single" precision policy (see mc_engine.py) draws uniforms as float32 and discrete outcomes as
+uint8/uint16 instead of float64/int64, while counts and sums stay int64/float64. This benchmark runs
+the simulations that support it under both policies and reports:
+- Speed: seconds per run (fastest of several) and the speedup of "single" over "double".
+- Memory: bytes of sample data held per sample.
+- Accuracy: every estimate against its exact answer, in standard errors (z). Both policies should
+  stay within ±3; float32 uniforms sit on a 2⁻²⁴ grid, a bias far below the Monte Carlo error.
+
+Simulations:
+- pi: MonteCarloPi chunk kernel, π = 4 · P(inside the unit circle)
+- triangle: Triangle on a PCG64 Generator, area of the right triangle x >= y, 1/2
+- metro: MetroWaitSim chunked kernel, P(|A - B| > 5) = 1/4
+- dice: Dice, mean face 3.5
+- digits: last digit of 10-digit phone numbers, P(even) = 1/2
+"""
+
+
+class PrecisionCase:
+    def __init__(self, name, simulate, expected, variance, values_per_sample, value_dtype, description):
+        """
+        :param simulate: simulate(num_samples, precision, seed) -> estimate
+        :param expected: Exact answer
+        :param variance: Variance of one sample's contribution to the estimate
+        :param values_per_sample: Random values stored per sample
+        :param value_dtype: value_dtype(precision) -> dtype of those values
+        """
+        self.name = name
+        self.simulate = simulate
+        self.expected = expected
+        self.variance = variance
+        self.values_per_sample = values_per_sample
+        self.value_dtype = value_dtype
+        self.description = description
+
+
+def simulate_pi(num_samples, precision, seed):
+    app = MonteCarloPi(num_points=num_samples, seed=seed, precision=precision)
+    app.monte_carlo_pi()
+    return app.estimated_pi
+
+
+def simulate_triangle(num_samples, precision, seed):
+    # Triangle's default "double" points come from the legacy MT19937 stream, which alone is ~1.8x slower
+    # than PCG64; the same bit generator under both policies compares only the precision
+    app = Triangle(num_samples, seed=seed, precision=precision, bit_generator="PCG64")
+    app.monte_carlo_triangle_area()
+    return app.area
+
+
+def simulate_metro(num_samples, precision, seed):
+    app = MetroWaitSim(num_samples, chunk_size=1_000_000, precision=precision)
+    app.seed = seed
+    app.simulate()
+    return app.not_meet_prob
+
+
+def simulate_dice(num_samples, precision, seed):
+    app = Dice(num_samples, seed=seed, precision=precision)
+    app.monte_carlo_dice()
+    return float(np.sum(app.df["DiceSide"].to_numpy(np.int64) * app.df["Count"].to_numpy())) / num_samples
+
+
+def simulate_digits(num_samples, precision, seed):
+    app = PhoneNumber(num_samples, precision=precision)
+    np.random.seed(seed)  # PhoneNumber draws from the legacy global stream
+    app.monte_carlo_even_num_last_digit()
+    return app.probability
+
+
+CASES = {
+    "pi": PrecisionCase("pi", simulate_pi, np.pi, 16 * (np.pi / 4) * (1 - np.pi / 4), 2, float_dtype, "π (circle kernel)"),
+    "triangle": PrecisionCase("triangle", simulate_triangle, 0.5, 0.25, 2, float_dtype, "Triangle area (PCG64)"),
+    "metro": PrecisionCase("metro", simulate_metro, 0.25, 0.25 * 0.75, 2, float_dtype, "Metro waiting (chunked)"),
+    "dice": PrecisionCase("dice", simulate_dice, 3.5, 35 / 12, 1, lambda precision: outcome_dtype(7, precision), "Dice mean face"),
+    "digits": PrecisionCase("digits", simulate_digits, 0.5, 0.25, 10, lambda precision: outcome_dtype(10, precision),
+                            "Phone number digits"),
+}
+
+
+class PrecisionBenchmark:
+    def __init__(self, num_values=20_000_000, cases=tuple(CASES), precisions=tuple(PRECISIONS), repeats=3, seed=100,
+                 max_abs_z=3.0):
+        """
+        :param num_values: Random values per simulation run; a simulation storing k values per sample runs num_values // k samples
+        :param repeats: Timed runs per simulation and precision; the fastest one counts
+        :param max_abs_z: Tolerance of every estimate, in standard errors from the exact answer
+        """
+        self.num_values = num_values
+        self.cases = [CASES[name] for name in cases]
+        self.precisions = list(precisions)
+        self.repeats = repeats
+        self.seed = seed
+        self.max_abs_z = max_abs_z
+        self.rows = []
+
+    def run_case(self, case, precision):
+        samples = max(100_000, self.num_values // case.values_per_sample)
+        best = np.inf
+        for _ in range(self.repeats):
+            start_time = time.perf_counter()
+            estimate = case.simulate(samples, precision, self.seed)
+            best = min(best, time.perf_counter() - start_time)
+
+        standard_error = np.sqrt(case.variance / samples)
+        return {
+            "Case": case.name,
+            "Precision": precision,
+            "Samples": samples,
+            "Seconds": best,
+            "Bytes per Sample": case.values_per_sample * case.value_dtype(precision).itemsize,
+            "Estimate": estimate,
+            "Exact": case.expected,
+            "Z": (estimate - case.expected) / standard_error,
+        }
+
+    def benchmark(self):
+        self.rows = [self.run_case(case, precision) for case in self.cases for precision in self.precisions]
+
+    def row(self, case, precision):
+        return next(row for row in self.rows if row["Case"] == case.name and row["Precision"] == precision)
+
+    def speedups(self):
+        """
+        Seconds under "double" divided by seconds under "single", per simulation.
+        """
+        return {case.name: self.row(case, "double")["Seconds"] / self.row(case, "single")["Seconds"] for case in self.cases}
+
+    def within_tolerance(self):
+        return all(abs(row["Z"]) <= self.max_abs_z for row in self.rows)
+
+    def display_results(self):
+        print("\n🎯 Precision Policy Benchmark")
+        print(f"Random Values per Run: {self.num_values:,} (fastest of {self.repeats} runs)\n")
+        speedups = self.speedups() if {"double", "single"} <= set(self.precisions) else {}
+        for case in self.cases:
+            speedup = f", single is {speedups[case.name]:.2f}x faster" if case.name in speedups else ""
+            print(f"🔹 {case.description}, exact answer {case.expected:.6f}{speedup}")
+            for precision in self.precisions:
+                row = self.row(case, precision)
+                print(f"   {precision:<7} {row['Seconds']:7.3f} s | {row['Bytes per Sample']:3d} B/sample | "
+                      f"estimate {row['Estimate']:.6f} | z = {row['Z']:+.2f}")
+        verdict = "✅ All estimates" if self.within_tolerance() else "⚠️ Not all estimates"
+        print(f"\n{verdict} within ±{self.max_abs_z} standard errors of the exact answers")
+
+    def visualization(self, output_path=None):
+        colors = ["#81a4f7", "#a8f781", "#b081f7"]
+        fig, axes = plt.subplots(1, 3, figsize=(18, 8))
+        positions = np.arange(len(self.cases))
+        width = 0.8 / len(self.precisions)
+        labels = [case.description for case in self.cases]
+
+        for i, precision in enumerate(self.precisions):
+            rows = [self.row(case, precision) for case in self.cases]
+            offset = positions - 0.4 + (i + 0.5) * width
+            color = colors[i % len(colors)]
+            axes[0].bar(offset, [row["Seconds"] for row in rows], width, color=color, label=precision)
+            axes[1].bar(offset, [row["Bytes per Sample"] for row in rows], width, color=color, label=precision)
+            axes[2].bar(offset, [row["Z"] for row in rows], width, color=color, label=precision)
+
+        axes[2].axhline(self.max_abs_z, color="#393d47", linestyle="--", linewidth=1)
+        axes[2].axhline(-self.max_abs_z, color="#393d47", linestyle="--", linewidth=1)
+        titles = ["Run Time", "Sample Memory", "Error Against the Exact Answer"]
+        y_labels = ["Seconds (fastest run)", "Bytes per Sample", "Error in Standard Errors (z)"]
+        for ax, title, y_label in zip(axes, titles, y_labels):
+            ax.set_xticks(positions, labels, rotation=20)
+            ax.set_ylabel(y_label, fontsize=12, color="#393d47")
+            ax.set_title(title, fontsize=15, color="#393d47")
+            ax.legend()
+            ax.grid(axis="y")
+            ax.set_axisbelow(True)
+
+        fig.suptitle("Monte Carlo Simulation: Double vs. Single Precision", fontsize=17, color="#393d47", weight="bold")
+        fig.tight_layout()
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.benchmark()
+        self.display_results()
+        self.visualization(output_path)
+
+
+def main():
+    try:
+        num_values = int(input("Enter the number of random values per simulation run (default: 20,000,000): "))
+        if num_values < 1_000_000:
+            num_values = 1_000_000
+            print("⚠️ Warning: Input too low. Defaulting to 1,000,000 values.")
+    except:
+        num_values = 20_000_000
+        print("⚠️ Warning: Invalid input detected. Defaulting to 20,000,000 values.")
+
+    app = PrecisionBenchmark(num_values=num_values)
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import warnings
+
+import numpy as np
+
+"""
+🧮 Quasi-Monte Carlo Sampling for the Geometric Estimators 🧮
+
+The area-ratio simulations (π, archery, right triangle, metro meeting) throw pseudo-random points
+into a square, so their error only shrinks as O(1/√N). Low-discrepancy sequences cover the square
+far more evenly, and the error of the same estimators shrinks close to O(1/N).
+
+Key Features:
+- Halton points (bases 2, 3, 5, ...) computed with NumPy in chunks, with a random shift per replicate.
+- Scrambled Sobol points through `scipy.stats.qmc` when SciPy is installed. Sobol nets are only
+  balanced for powers of two, so each replicate uses the largest power of two within its share of
+  the budget, and `points_used(num_points)` reports the total.
+- Independent randomized replicates give an honest standard error for the estimate,
+  which a single deterministic low-discrepancy run cannot provide.
+
+Usage:
+    sampler = QMCSampler("sobol", replicates=16, seed=1)
+    MonteCarloPi(num_points=2**20, sampler=sampler).run()
+"""
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53)
+QMC_METHODS = ("halton", "sobol")
+
+
+def radical_inverse(indices, base):
+    """
+    Van der Corput radical inverse of integer indices in the given base.
+    """
+    indices = indices.copy()
+    result = np.zeros(len(indices))
+    fraction = 1.0 / base
+    while np.any(indices > 0):
+        result += (indices % base) * fraction
+        indices //= base
+        fraction /= base
+    return result
+
+
+class HaltonStream:
+    def __init__(self, dim, rng):
+        if dim > len(PRIMES):
+            raise ValueError(f"Halton points are supported up to {len(PRIMES)} dimensions")
+        self.dim = dim
+        self.next_index = 1  # Index 0 is the origin for every base, so it is skipped
+        self.shift = rng.random(dim)  # Cranley-Patterson rotation, one per replicate
+
+    def random(self, n):
+        indices = np.arange(self.next_index, self.next_index + n, dtype=np.int64)
+        self.next_index += n
+        points = np.column_stack([radical_inverse(indices, base) for base in PRIMES[:self.dim]])
+        return (points + self.shift) % 1.0
+
+
+class SobolStream:
+    def __init__(self, dim, rng):
+        try:
+            from scipy.stats import qmc
+        except ImportError as error:
+            raise ImportError("Sobol sampling requires the optional 'scipy' package; use method='halton' instead") from error
+        self.engine = qmc.Sobol(d=dim, scramble=True, seed=rng)
+
+    def random(self, n):
+        total = self.engine.num_generated + n
+        if n & (n - 1) == 0 and total & (total - 1) == 0:
+            return self.engine.random_base2(int(n).bit_length() - 1)
+        # A chunk of 2^c points starting at a multiple of 2^c is a balanced net of its own, but SciPy
+        # warns whenever the running total is not a power of two
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="The balance properties of Sobol")
+            return self.engine.random(n)
+
+
+class QMCSampler:
+    def __init__(self, method="halton", replicates=8, seed=None, chunk_size=2**16):
+        """
+        :param method: "halton" or "sobol" (scrambled, needs SciPy)
+        :param replicates: Independently randomized copies of the sequence used for the error estimate
+        :param seed: Seed for the randomizations
+        :param chunk_size: Points generated at once per replicate (rounded down to a power of two for Sobol)
+        """
+        if method not in QMC_METHODS:
+            raise ValueError(f"Unknown QMC method '{method}'. Use one of: {', '.join(QMC_METHODS)}")
+        if replicates < 2:
+            raise ValueError("At least 2 replicates are needed to estimate the error")
+        self.method = method
+        self.replicates = replicates
+        self.seed = seed
+        self.chunk_size = chunk_size if method == "halton" else 1 << (max(chunk_size, 1).bit_length() - 1)
+
+    def stream(self, dim, replicate):
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=(replicate,)))
+        if self.method == "sobol":
+            return SobolStream(dim, rng)
+        return HaltonStream(dim, rng)
+
+    def points_per_replicate(self, num_points):
+        """
+        Even share of the point budget per replicate; for Sobol the largest power of two within it.
+        """
+        share = max(num_points // self.replicates, 1)
+        return share if self.method == "halton" else 1 << (share.bit_length() - 1)
+
+    def points_used(self, num_points):
+        """
+        Points an estimate with this budget actually draws, over all replicates.
+        """
+        return self.points_per_replicate(num_points) * self.replicates
+
+    def estimate(self, indicator, num_points, dim=2):
+        """
+        Estimates the probability that `indicator(points)` is True for points uniform in [0, 1)^dim.
+        The point budget is split evenly between the replicates.
+
+        The points within one replicate are not independent, so the binomial formula √(p(1-p)/n)
+        does not describe their error. The replicates are, so the standard error comes from the
+        spread of their estimates.
+
+        :return: (estimate, standard error, first chunk of points of the first replicate)
+        """
+        points_per_replicate = self.points_per_replicate(num_points)
+        estimates = np.empty(self.replicates)
+        sample_points = None
+
+        for replicate in range(self.replicates):
+            stream = self.stream(dim, replicate)
+            hits = 0
+            done = 0
+            while done < points_per_replicate:
+                points = stream.random(min(self.chunk_size, points_per_replicate - done))
+                hits += np.count_nonzero(indicator(points))
+                done += len(points)
+                if sample_points is None:
+                    sample_points = points
+            estimates[replicate] = hits / points_per_replicate
+
+        standard_error = estimates.std(ddof=1) / np.sqrt(self.replicates)
+        return estimates.mean(), standard_error, sample_points
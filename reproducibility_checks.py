@@ -0,0 +1,161 @@
+import os
+import tempfile
+
+import numpy as np
+from bootstrap import jackknife_acceleration
+from checkpoint import Checkpointer, resume
+from kernels import CircleKernel, MeetingKernel
+from mc_engine import make_rng
+from result_cache import ResultCache
+from simulation_of_archery import ArcherySimulation
+from simulation_of_disease_test_accuracy import MonteCarloAccuracyDisease
+from simulation_of_passing_test import TestScore
+from simulation_of_pi import MonteCarloPi
+from simulation_of_trade_market import MonteCarloTradeMarket
+
+"""
+🔁 Reproducibility Checks 🔁
+
+Several features promise results that are EXACTLY equal to another way of running the same
+simulation. Nothing else would notice if a change to the chunking or the random number plumbing
+broke one of these promises, so this script runs every one of them on small runs and fails loudly.
+
+Checks:
+- cache_extension: a cached run extended to more points equals a fresh run with the same seed
+  (MonteCarloPi and ArcherySimulation, including a trailing partial chunk).
+- checkpoint_resume: a run that crashes after a checkpoint and is resumed from it equals an
+  uninterrupted run (MonteCarloTradeMarket and TestScore).
+- kernels_bit_identical: the buffer-reusing kernels return exactly the points, arrival times and
+  counts of the allocating code they replaced, including shorter chunks that reuse a buffer prefix.
+- bootstrap_jackknife: the BCa acceleration computed from one leave-one-out value per category equals
+  a brute-force jackknife that leaves out every person in turn (up to rounding).
+
+Run `python reproducibility_checks.py`; it raises an AssertionError on the first broken promise.
+"""
+
+
+def check_cache_extension():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(os.path.join(directory, "cache"))
+
+        # 250,000 points leave a partial chunk behind, which the extension has to redraw at full size
+        MonteCarloPi(num_points=250_000, seed=7, chunk_size=100_000, cache=cache).monte_carlo_pi()
+        extended = MonteCarloPi(num_points=630_000, seed=7, chunk_size=100_000, cache=cache)
+        extended.monte_carlo_pi()
+        fresh = MonteCarloPi(num_points=630_000, seed=7, chunk_size=100_000)
+        fresh.monte_carlo_pi()
+        assert extended.inside_circle == fresh.inside_circle, "Extended MonteCarloPi run differs from a fresh run"
+
+        ArcherySimulation(250_000, seed=7, chunk_size=100_000, cache=cache).monte_carlo_archery()
+        extended = ArcherySimulation(630_000, seed=7, chunk_size=100_000, cache=cache)
+        extended.monte_carlo_archery()
+        fresh = ArcherySimulation(630_000, seed=7, chunk_size=100_000)
+        fresh.monte_carlo_archery()
+        assert extended.hits == fresh.hits, "Extended ArcherySimulation run differs from a fresh run"
+
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+class CrashingCheckpointer(Checkpointer):
+    def __init__(self, path, crash_after_saves):
+        """
+        Saves after every chunk and raises SimulatedCrash right after the given number of saves.
+        """
+        super().__init__(path, every_seconds=None, every_chunks=1)
+        self.crash_after_saves = crash_after_saves
+        self.saves = 0
+
+    def save(self, simulation, completed, accumulators, rng):
+        super().save(simulation, completed, accumulators, rng)
+        self.saves += 1
+        if self.saves == self.crash_after_saves:
+            raise SimulatedCrash()
+
+
+def crash_and_resume(make_simulation, compute_method, path):
+    try:
+        getattr(make_simulation(CrashingCheckpointer(path, crash_after_saves=2)), compute_method)()
+    except SimulatedCrash:
+        pass
+    else:
+        raise AssertionError("The run finished before the simulated crash")
+    return resume(path, every_seconds=None)
+
+
+def check_checkpoint_resume():
+    with tempfile.TemporaryDirectory() as directory:
+        make_trade = lambda checkpoint: MonteCarloTradeMarket(100, 110, 95, rep_num=45_000, seed=7, chunk_size=10_000,
+                                                              checkpoint=checkpoint)
+        resumed = crash_and_resume(make_trade, "monte_carlo_trade", os.path.join(directory, "trade.ckpt"))
+        uninterrupted = make_trade(None)
+        uninterrupted.monte_carlo_trade()
+        assert resumed.profit_count == uninterrupted.profit_count, "Resumed trade run differs in its profit count"
+        assert np.array_equal(resumed.exit_step_counts, uninterrupted.exit_step_counts), "Resumed trade run differs in its exit days"
+        assert np.array_equal(resumed.pnl_histogram.counts, uninterrupted.pnl_histogram.counts), "Resumed trade run differs in its P&L"
+
+        make_test = lambda checkpoint: TestScore(num_experiments=45_000, seed=7, chunk_size=10_000, checkpoint=checkpoint)
+        resumed = crash_and_resume(make_test, "monte_carlo_passing_test", os.path.join(directory, "test.ckpt"))
+        uninterrupted = make_test(None)
+        uninterrupted.monte_carlo_passing_test()
+        assert np.array_equal(resumed.correct_counts, uninterrupted.correct_counts), "Resumed TestScore run differs"
+
+
+
+def check_kernels_bit_identical():
+    circle = CircleKernel(100_000)
+    meeting = MeetingKernel(100_000, window=10, max_gap=5)
+    for size in (100_000, 37_123):
+        points = make_rng(7).uniform(-1, 1, size=(size, 2))
+        inside, kernel_points = circle(make_rng(7), size, keep_points=True)
+        assert np.array_equal(kernel_points, points), "CircleKernel points differ from rng.uniform(-1, 1, (n, 2))"
+        assert inside == np.count_nonzero(np.sum(points**2, axis=1) <= 1), "CircleKernel count differs"
+
+        rng = make_rng(7)
+        arrival_a, arrival_b = rng.uniform(0, 10, size), rng.uniform(0, 10, size)
+        apart, (kernel_a, kernel_b) = meeting(make_rng(7), size, keep_arrivals=True)
+        assert np.array_equal(kernel_a, arrival_a) and np.array_equal(kernel_b, arrival_b), "MeetingKernel arrivals differ"
+        assert apart == np.count_nonzero(np.abs(arrival_a - arrival_b) > 5), "MeetingKernel count differs"
+
+
+def brute_force_acceleration(counts, statistic):
+    people = np.repeat(np.arange(len(counts)), counts)
+    jackknife = []
+    for person in range(len(people)):
+        remaining = np.bincount(np.delete(people, person), minlength=len(counts))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jackknife.append(float(statistic(remaining)))
+    jackknife = np.array(jackknife)
+    jackknife = jackknife[~np.isnan(jackknife)]
+    mean = jackknife.mean()
+    spread = np.sum((mean - jackknife)**2)
+    return np.sum((mean - jackknife)**3) / (6 * spread**1.5) if spread > 0 else 0.0
+
+
+def check_bootstrap_jackknife():
+    for counts in ([3, 1, 10, 2], [95, 495, 940, 5], [7, 0, 12, 1]):
+        for name, metric in MonteCarloAccuracyDisease.METRIC_FUNCTIONS.items():
+            expected = brute_force_acceleration(np.array(counts), metric)
+            assert np.isclose(jackknife_acceleration(counts, metric), expected), \
+                f"Jackknife acceleration of {name} differs from the brute force for counts {counts}"
+
+
+CHECKS = {
+    "cache_extension": check_cache_extension,
+    "checkpoint_resume": check_checkpoint_resume,
+    "kernels_bit_identical": check_kernels_bit_identical,
+    "bootstrap_jackknife": check_bootstrap_jackknife,
+}
+
+
+def main():
+    for name, check in CHECKS.items():
+        check()
+        print(f"✅ {name}")
+    print(f"\nAll {len(CHECKS)} reproducibility checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from figure_export import show_or_save
+from mc_engine import BIT_GENERATORS, make_rng
+
+"""
+🏎️ Bit Generator Benchmark 🏎️
+
+Every simulation in this repository spends most of its time drawing random numbers, and NumPy
+offers several bit generators with different speeds. This benchmark runs the repository's typical
+kernels under each of them and reports:
+- Throughput: random variates per second on one core (NumPy draws on a single thread).
+- Bias: the kernel's estimate against its exact answer, in standard errors (z). A sound generator
+  stays within about ±3; a larger |z| at a large sample size points to a flawed stream.
+
+Kernels:
+- uniform_pairs: points in the unit square, π from the quarter circle (MonteCarloPi, Archery)
+- dice: small integers 1-6, mean 3.5 (Dice)
+- bernoulli: fair bits, heads share 0.5 (CoinToss)
+- normals: 30 daily returns N(0.05%, 1%) per path, mean gross return (1.0005)^30 (MonteCarloTradeMarket)
+
+The chosen generator is then passed by name, e.g. MonteCarloPi(..., bit_generator="SFC64").
+"""
+
+
+class BenchmarkKernel:
+    def __init__(self, name, simulate, expected, variance, draws_per_sample, description):
+        """
+        :param simulate: simulate(rng, samples) -> sum of the per-sample values
+        :param expected: Exact mean of one sample value
+        :param variance: Exact variance of one sample value
+        :param draws_per_sample: Random variates drawn per sample
+        """
+        self.name = name
+        self.simulate = simulate
+        self.expected = expected
+        self.variance = variance
+        self.draws_per_sample = draws_per_sample
+        self.description = description
+
+
+def uniform_pairs(rng, samples):
+    points = rng.random((samples, 2))
+    return 4.0 * np.count_nonzero(np.sum(points**2, axis=1) <= 1)
+
+
+def dice(rng, samples):
+    return float(np.sum(rng.integers(1, 7, samples, dtype=np.uint8), dtype=np.int64))
+
+
+def bernoulli(rng, samples):
+    return float(np.count_nonzero(rng.integers(0, 2, samples, dtype=np.uint8)))
+
+
+def normals(rng, samples):
+    returns = rng.normal(0.0005, 0.01, size=(samples, 30))
+    return float(np.sum(np.prod(1 + returns, axis=1)))
+
+
+KERNELS = {
+    "uniform_pairs": BenchmarkKernel("uniform_pairs", uniform_pairs, np.pi, 16 * (np.pi / 4) * (1 - np.pi / 4), 2,
+                                     "Uniform pairs (π / archery)"),
+    "dice": BenchmarkKernel("dice", dice, 3.5, 35 / 12, 1, "Small integers (dice)"),
+    "bernoulli": BenchmarkKernel("bernoulli", bernoulli, 0.5, 0.25, 1, "Bernoulli bits (coin toss)"),
+    # Product of 30 independent (1 + r): E = (1 + μ)^30 and E[X²] = ((1 + μ)² + σ²)^30
+    "normals": BenchmarkKernel("normals", normals, 1.0005**30, (1.0005**2 + 0.01**2)**30 - 1.0005**60, 30,
+                               "Normal returns (trade market)"),
+}
+
+
+class RNGBenchmark:
+    def __init__(self, num_draws=20_000_000, bit_generators=tuple(BIT_GENERATORS), kernels=tuple(KERNELS), repeats=3,
+                 seed=100, chunk_size=1_000_000):
+        """
+        :param num_draws: Random variates drawn per kernel and generator
+        :param repeats: Timed runs per kernel and generator; the fastest one counts
+        :param chunk_size: Samples drawn at a time
+        """
+        self.num_draws = num_draws
+        self.bit_generators = list(bit_generators)
+        self.kernels = [KERNELS[name] for name in kernels]
+        self.repeats = repeats
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.df = None
+
+    def run_kernel(self, kernel, bit_generator):
+        samples = max(1, self.num_draws // kernel.draws_per_sample)
+        best = np.inf
+        for _ in range(self.repeats):
+            rng = make_rng(self.seed, bit_generator)
+            total = 0.0
+            start_time = time.perf_counter()
+            for start in range(0, samples, self.chunk_size):
+                total += kernel.simulate(rng, min(self.chunk_size, samples - start))
+            best = min(best, time.perf_counter() - start_time)
+
+        estimate = total / samples
+        standard_error = np.sqrt(kernel.variance / samples)
+        return {
+            "Kernel": kernel.name,
+            "Bit Generator": bit_generator,
+            "Draws": samples * kernel.draws_per_sample,
+            "Seconds": best,
+            "Draws per Second": samples * kernel.draws_per_sample / best,
+            "Estimate": estimate,
+            "Exact": kernel.expected,
+            "Bias": estimate - kernel.expected,
+            "Z": (estimate - kernel.expected) / standard_error,
+        }
+
+    def benchmark(self):
+        rows = [self.run_kernel(kernel, bit_generator) for kernel in self.kernels for bit_generator in self.bit_generators]
+        self.df = pd.DataFrame(rows)
+
+    def recommendations(self, max_abs_z=3.0):
+        """
+        Fastest generator per kernel among those whose bias stays within max_abs_z standard errors.
+        """
+        sound = self.df[self.df["Z"].abs() <= max_abs_z]
+        best = sound.loc[sound.groupby("Kernel")["Draws per Second"].idxmax()]
+        return dict(zip(best["Kernel"], best["Bit Generator"]))
+
+    def display_results(self):
+        print("\n🏎️ Bit Generator Benchmark (single core)")
+        print(f"Draws per Kernel and Generator: {self.num_draws:,} (fastest of {self.repeats} runs)\n")
+        for kernel in self.kernels:
+            rows = self.df[self.df["Kernel"] == kernel.name]
+            baseline = rows.loc[rows["Bit Generator"] == "PCG64", "Draws per Second"]
+            print(f"🔹 {kernel.description}, exact answer {kernel.expected:.6f}")
+            for generator, speed, estimate, z in zip(rows["Bit Generator"], rows["Draws per Second"], rows["Estimate"], rows["Z"]):
+                relative = f" ({speed / baseline.iloc[0]:.2f}x PCG64)" if len(baseline) else ""
+                print(f"   {generator:<10} {speed / 1e6:8.1f} M draws/s{relative} | estimate {estimate:.6f} | z = {z:+.2f}")
+        print(f"\n✅ Fastest sound generator per kernel: {self.recommendations()}")
+
+    def visualization(self, output_path=None):
+        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946", "#f781a4"]
+        fig, (axes_0, axes_1) = plt.subplots(1, 2, figsize=(16.5, 8))
+        positions = np.arange(len(self.kernels))
+        width = 0.8 / len(self.bit_generators)
+
+        for i, generator in enumerate(self.bit_generators):
+            rows = self.df[self.df["Bit Generator"] == generator].set_index("Kernel").loc[[kernel.name for kernel in self.kernels]]
+            offset = positions - 0.4 + (i + 0.5) * width
+            axes_0.bar(offset, rows["Draws per Second"] / 1e6, width, color=colors[i % len(colors)], label=generator)
+            axes_1.bar(offset, rows["Z"], width, color=colors[i % len(colors)], label=generator)
+
+        labels = [kernel.description for kernel in self.kernels]
+        axes_0.set_xticks(positions, labels, rotation=15)
+        axes_0.set_ylabel("Million Draws per Second (one core)", fontsize=12, color="#393d47")
+        axes_0.set_title("Throughput", fontsize=15, color="#393d47")
+        axes_0.legend()
+        axes_0.grid(axis="y")
+        axes_0.set_axisbelow(True)
+
+        axes_1.axhline(3, color="#393d47", linestyle="--", linewidth=1)
+        axes_1.axhline(-3, color="#393d47", linestyle="--", linewidth=1)
+        axes_1.set_xticks(positions, labels, rotation=15)
+        axes_1.set_ylabel("Bias in Standard Errors (z)", fontsize=12, color="#393d47")
+        axes_1.set_title("Bias Against the Exact Answer", fontsize=15, color="#393d47")
+        axes_1.grid(axis="y")
+        axes_1.set_axisbelow(True)
+
+        fig.suptitle("Monte Carlo Simulation: Bit Generator Throughput and Bias", fontsize=17, color="#393d47", weight="bold")
+        fig.tight_layout()
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.benchmark()
+        self.display_results()
+        self.visualization(output_path)
+
+
+def main():
+    try:
+        num_draws = int(input("Enter the number of draws per kernel and generator (default: 20,000,000): "))
+        if num_draws < 1_000_000:
+            num_draws = 1_000_000
+            print("⚠️ Warning: Input too low. Defaulting to 1,000,000 draws.")
+    except:
+        num_draws = 20_000_000
+        print("⚠️ Warning: Invalid input detected. Defaulting to 20,000,000 draws.")
+
+    app = RNGBenchmark(num_draws=num_draws)
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
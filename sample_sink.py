@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+
+"""
+📦 Raw Sample Sink: Streaming Simulation Draws to Disk 📦
+
+Simulations usually keep only their summary results, and their raw draws disappear when the
+program exits. A sink streams the raw draws chunk by chunk to disk while they are generated,
+in compact dtypes (e.g. uint8 for dice faces and digits, float32 for coordinates).
+
+Key Features:
+- `.npy` files are preallocated and written through a memory map, so capturing a billion rows
+  needs neither the RAM to hold them nor a second run.
+- `.parquet` files are written one row group per chunk (requires the optional `pyarrow` package).
+- `read_samples` opens the stored draws without loading them: a read-only memory map for .npy
+  files, a lazy `pyarrow.parquet.ParquetFile` for .parquet files (read it one row group at a time
+  with `read_row_group(i)`; `read()` loads the whole table).
+
+Usage:
+    sink = open_sink("rolls.npy", np.uint8, total_rows=10**9)
+    Dice(10**9, sink=sink).monte_carlo_dice()
+    rolls = read_samples("rolls.npy")
+"""
+
+
+class NpySink:
+    def __init__(self, path, dtype, total_rows, row_shape=()):
+        """
+        :param path: Output .npy file
+        :param dtype: Compact dtype the draws are stored in
+        :param total_rows: Number of rows the simulation will write
+        :param row_shape: Shape of one row, e.g. (2,) for (x, y) points or (10,) for phone numbers
+        """
+        self.path = path
+        self.total_rows = total_rows
+        self.rows_written = 0
+        self.array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(total_rows, *row_shape))
+
+    def write(self, chunk):
+        end = self.rows_written + len(chunk)
+        if end > self.total_rows:
+            raise ValueError(f"Sink {self.path} holds {self.total_rows} rows, but {end} were written")
+        self.array[self.rows_written:end] = chunk
+        self.rows_written = end
+
+    def close(self):
+        self.array.flush()
+        return self.array
+
+
+class ParquetSink:
+    def __init__(self, path, dtype, total_rows, row_shape=(), columns=None):
+        """
+        Writes every chunk as one Parquet row group. Each position of a row becomes a column.
+
+        :param columns: Column names (default: value_0, value_1, ...)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            raise ImportError("Writing Parquet files requires the optional 'pyarrow' package") from error
+
+        width = int(np.prod(row_shape))
+        self.pa = pa
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.total_rows = total_rows
+        self.rows_written = 0
+        self.columns = columns or [f"value_{i}" for i in range(width)]
+        schema = pa.schema([(name, pa.from_numpy_dtype(self.dtype)) for name in self.columns])
+        self.writer = pq.ParquetWriter(path, schema)
+
+    def write(self, chunk):
+        chunk = np.asarray(chunk, dtype=self.dtype).reshape(len(chunk), -1)
+        end = self.rows_written + len(chunk)
+        if end > self.total_rows:
+            raise ValueError(f"Sink {self.path} holds {self.total_rows} rows, but {end} were written")
+
+        arrays = [self.pa.array(chunk[:, i]) for i in range(chunk.shape[1])]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, names=self.columns))
+        self.rows_written = end
+
+    def close(self):
+        self.writer.close()
+        return read_samples(self.path)  # Lazy ParquetFile: only the footer metadata is read
+
+
+def open_sink(path, dtype, total_rows, row_shape=(), columns=None):
+    """
+    Creates a sink whose format is chosen by the file extension (.npy or .parquet).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return NpySink(path, dtype, total_rows, row_shape)
+    if extension == ".parquet":
+        return ParquetSink(path, dtype, total_rows, row_shape, columns)
+    raise ValueError(f"Unsupported sample file '{path}'. Use a .npy or .parquet file.")
+
+
+def read_samples(path):
+    """
+    Opens stored draws without loading them into memory: a read-only memory map for .npy files,
+    a pyarrow ParquetFile for .parquet files, which reads row groups only when asked for them.
+    """
+    if path.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path, memory_map=True)
+    return np.load(path, mmap_mode="r")
@@ -1,112 +1,164 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-
-"""
-🏹 Monte Carlo Archery Simulation 🏹
-
-This simulation estimates the probability of hitting a circular target 
-placed at the center of a square field using the Monte Carlo method.
-
-Key Features:
-- Randomly simulates arrow shots within the square.
-- Calculates the probability of hitting the circular target.
-- Visualizes hit vs. miss with a scatter plot and shows convergence.
-- Demonstrates the geometric relationship between circle and square.
-
-Expected Outcome:
-- As the number of arrows increases, the empirical hit rate should converge 
-  to the theoretical value (Area of Circle / Area of Square = πr² / (2r)² = π/4 ≈ 0.7854)
-
-📌 Note: np.random.seed is set for reproducibility.
-"""
-
-class ArcherySimulation:
-    def __init__(self, num_arrows):
-        self.num_arrows = num_arrows
-
-    def monte_carlo_archery(self):
-        np.random.seed(42)
-        self.radius = 1  # Radius of the circular target
-        self.hits = 0
-        
-        self.x_hit, self.y_hit = [], []
-        self.x_miss, self.y_miss = [], []
-
-        # Simulate arrows being shot randomly in a square from -1 to 1 (width = 2r)
-        for _ in range(self.num_arrows):
-            x = np.random.uniform(-self.radius, self.radius)
-            y = np.random.uniform(-self.radius, self.radius)
-
-            distance = x**2 + y**2  # squared distance from center (0,0)
-
-            if distance <= self.radius**2:
-                self.hits += 1
-                self.x_hit.append(x)
-                self.y_hit.append(y)
-            else:
-                self.x_miss.append(x)
-                self.y_miss.append(y)
-        
-        self.hit_probability = self.hits / self.num_arrows
-
-    def calculate_error_margin(self, confidence=0.95):
-        z = 1.96 if confidence == 0.95 else 1.64
-        p = self.hit_probability
-        n = self.num_arrows
-        self.error_margin = z * np.sqrt((p * (1 - p)) / n)
-    
-    def display_result(self):
-        print("\n🏹 Monte Carlo Archery Simulation Result 🏹")
-        print(f"Total Arrows Shot: {self.num_arrows}")
-        print(f"Arrows Hit Target: {self.hits}")
-        print(f"Empirical Hit Probability: {self.hit_probability:.4f}")
-        print(f"Theoretical Probability (π/4): {np.pi/4:.4f}")
-        print("\n🔍 Note: As the number of arrows increases, the experimental probability should converge to π/4 (≈0.7854).")
-
-    def visualization(self):
-        fig, ax = plt.subplots(figsize=(8, 8))
-        ax.scatter(self.x_hit, self.y_hit, color="#81f7b2", s=1, label="Hits")
-        ax.scatter(self.x_miss, self.y_miss, color="#f78181", s=1, label="Misses")
-        
-        # Draw the circular target
-        circle = plt.Circle((0, 0), self.radius, color="#6c7ae0", fill=False, linewidth=2, label="Target")
-        ax.add_patch(circle)
-
-        ax.set_title("Monte Carlo Archery Simulation", fontsize=16, color="#333333", weight="bold")
-        ax.set_xlabel("X-axis")
-        ax.set_ylabel("Y-axis")
-        ax.legend(loc="upper right")
-        ax.grid(True)
-        ax.set_aspect("equal")
-        fig.text(
-            0.5, 0.05,
-            f"Theoretical Probability (π/4): {np.pi/4:.4f} | Estimated Probability: {self.hit_probability:.4f} | Error Margin: {self.error_margin:.6f}",
-            ha="center", fontsize=12, color="#555555"
-        )
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
-        plt.show()
-
-    def run(self):
-        self.monte_carlo_archery()
-        self.display_result()
-        self.calculate_error_margin()
-        self.visualization()
-
-
-def main():
-    try:
-        num_arrows = int(input("Please enter the number of arrows (minimum 10,000): "))
-        if num_arrows < 10000:
-            num_arrows = 10000
-            print("Warning: Sample size increased to 10,000 for better accuracy.")
-    except:
-        num_arrows = 10000
-        print("Warning: Invalid input detected. Defaulting to 10,000 arrows.")
-
-    simulation = ArcherySimulation(num_arrows)
-    simulation.run()
-
-
-if __name__ == "__main__":
-    main()
+import numpy as np
+import matplotlib.pyplot as plt
+import pandas as pd
+from figure_export import show_or_save
+from mc_engine import DEFAULT_BIT_GENERATOR, DEFAULT_CHUNK_SIZE, chunk_rng, run_counting_chunks
+
+"""
+🏹 Monte Carlo Archery Simulation 🏹
+
+This simulation estimates the probability of hitting a circular target 
+placed at the center of a square field using the Monte Carlo method.
+
+Key Features:
+- Randomly simulates arrow shots within the square.
+- Calculates the probability of hitting the circular target.
+- Visualizes hit vs. miss with a scatter plot and shows convergence.
+- Demonstrates the geometric relationship between circle and square.
+
+Expected Outcome:
+- As the number of arrows increases, the empirical hit rate should converge 
+  to the theoretical value (Area of Circle / Area of Square = πr² / (2r)² = π/4 ≈ 0.7854)
+
+📌 Note: The seed is fixed for reproducibility. Arrows are shot in chunks, so with a ResultCache
+an earlier run can be extended to more arrows by simulating only the missing ones.
+A QMCSampler (see qmc.py) replaces the random shots with a randomized low-discrepancy sequence.
+"""
+
+class ArcherySimulation:
+    def __init__(self, num_arrows, seed=42, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, sink=None, sampler=None,
+                 bit_generator=DEFAULT_BIT_GENERATOR):
+        if cache is not None and sink is not None:
+            raise ValueError("A raw-sample sink needs every arrow of the run, so it cannot be combined with a cache.")
+        if sampler is not None and (cache is not None or sink is not None):
+            raise ValueError("A QMC sampler cannot be combined with a cache or a raw-sample sink.")
+        if sampler is not None and bit_generator != DEFAULT_BIT_GENERATOR:
+            raise ValueError("QMC points do not come from a bit generator; choose either sampler or bit_generator.")
+
+        self.num_arrows = num_arrows
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.cache = cache  # Optional ResultCache holding the extendable accumulator state
+        self.sink = sink  # Optional raw-sample sink (see sample_sink.py), receives (x, y) as float32
+        self.sampler = sampler  # Optional QMCSampler (see qmc.py) replacing the pseudo-random shots
+        self.bit_generator = bit_generator  # Name of the bit generator behind the shots (see mc_engine.py)
+        self.standard_error = None  # Set by monte_carlo_archery_qmc
+        self.radius = 1  # Radius of the circular target
+        self.x_hit = None  # Hit / miss coordinates of the first chunk, used for plotting
+
+    def shoot_arrows(self, rng, size, index):
+        # Simulate arrows being shot randomly in a square from -1 to 1 (width = 2r)
+        shots = rng.uniform(-self.radius, self.radius, size=(size, 2))
+        hit = np.sum(shots**2, axis=1) <= self.radius**2  # squared distance from center (0,0)
+
+        if index == 0:
+            self.x_hit, self.y_hit = shots[hit, 0], shots[hit, 1]
+            self.x_miss, self.y_miss = shots[~hit, 0], shots[~hit, 1]
+        if self.sink is not None:
+            self.sink.write(shots.astype(np.float32))
+        return np.count_nonzero(hit)
+
+    def monte_carlo_archery(self):
+        if self.sampler is not None:
+            self.monte_carlo_archery_qmc()
+            return
+
+        state = None
+        if self.cache is not None:
+            params = {"chunk_size": self.chunk_size, "radius": self.radius}
+            if self.bit_generator != DEFAULT_BIT_GENERATOR:
+                params["bit_generator"] = self.bit_generator  # Keeps the keys of PCG64 runs unchanged
+            key = self.cache.make_key(self, params, self.seed, None)
+            state = self.cache.get(key)
+
+        new_state = run_counting_chunks(self.shoot_arrows, self.seed, self.num_arrows, self.chunk_size, state, self.bit_generator)
+
+        if self.cache is not None and (state is None or new_state["sample_size"] > state["sample_size"]):
+            self.cache.put(key, new_state)
+
+        self.hits = new_state["hits"]
+        self.hit_probability = self.hits / self.num_arrows
+
+        if self.sink is not None:
+            self.shots = self.sink.close()
+
+    def monte_carlo_archery_qmc(self):
+        hit = lambda unit_points: np.sum((2 * unit_points - 1)**2, axis=1) <= 1
+        self.hit_probability, self.standard_error, unit_points = self.sampler.estimate(hit, self.num_arrows)
+        self.hits = round(self.hit_probability * self.sampler.points_used(self.num_arrows))
+
+        shots = self.radius * (2 * unit_points - 1)
+        inside = hit(unit_points)
+        self.x_hit, self.y_hit = shots[inside, 0], shots[inside, 1]
+        self.x_miss, self.y_miss = shots[~inside, 0], shots[~inside, 1]
+
+    def calculate_error_margin(self, confidence=0.95):
+        z = 1.96 if confidence == 0.95 else 1.64
+        if self.standard_error is not None:
+            # Measured from the QMC replicates (see QMCSampler.estimate)
+            self.error_margin = z * self.standard_error
+            return
+        p = self.hit_probability
+        n = self.num_arrows
+        self.error_margin = z * np.sqrt((p * (1 - p)) / n)
+    
+    def display_result(self):
+        print("\n🏹 Monte Carlo Archery Simulation Result 🏹")
+        print(f"Total Arrows Shot: {self.num_arrows if self.sampler is None else self.sampler.points_used(self.num_arrows)}")
+        print(f"Arrows Hit Target: {self.hits}")
+        print(f"Empirical Hit Probability: {self.hit_probability:.4f}")
+        if self.sampler is not None:
+            print(f"QMC Sampling ({self.sampler.method}, {self.sampler.replicates} replicates): {self.sampler.points_used(self.num_arrows):,} points used")
+        print(f"Theoretical Probability (π/4): {np.pi/4:.4f}")
+        print("\n🔍 Note: As the number of arrows increases, the experimental probability should converge to π/4 (≈0.7854).")
+
+    def visualization(self, output_path=None):
+        if self.x_hit is None:
+            # Extended runs skip the first chunk, so redraw it from its own stream for plotting
+            self.shoot_arrows(chunk_rng(self.seed, 0, self.bit_generator), min(self.num_arrows, self.chunk_size), 0)
+
+        fig, ax = plt.subplots(figsize=(8, 8))
+        ax.scatter(self.x_hit, self.y_hit, color="#81f7b2", s=1, label="Hits")
+        ax.scatter(self.x_miss, self.y_miss, color="#f78181", s=1, label="Misses")
+        
+        # Draw the circular target
+        circle = plt.Circle((0, 0), self.radius, color="#6c7ae0", fill=False, linewidth=2, label="Target")
+        ax.add_patch(circle)
+
+        ax.set_title("Monte Carlo Archery Simulation", fontsize=16, color="#333333", weight="bold")
+        ax.set_xlabel("X-axis")
+        ax.set_ylabel("Y-axis")
+        ax.legend(loc="upper right")
+        ax.grid(True)
+        ax.set_aspect("equal")
+        fig.text(
+            0.5, 0.05,
+            f"Theoretical Probability (π/4): {np.pi/4:.4f} | Estimated Probability: {self.hit_probability:.4f} | Error Margin: {self.error_margin:.6f}",
+            ha="center", fontsize=12, color="#555555"
+        )
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_archery()
+        self.display_result()
+        self.calculate_error_margin()
+        self.visualization(output_path)
+
+
+def main():
+    try:
+        num_arrows = int(input("Please enter the number of arrows (minimum 10,000): "))
+        if num_arrows < 10000:
+            num_arrows = 10000
+            print("Warning: Sample size increased to 10,000 for better accuracy.")
+    except:
+        num_arrows = 10000
+        print("Warning: Invalid input detected. Defaulting to 10,000 arrows.")
+
+    simulation = ArcherySimulation(num_arrows)
+    simulation.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,95 +1,220 @@
-import matplotlib.pyplot as plt
-import numpy as np
-
-"""
-Monte Carlo Simulation: Estimating the Area of a Right Triangle Inside a Unit Square
-
-This simulation generates random points within a unit square (1x1) and calculates the proportion of points 
-that fall inside a right triangle defined within the square. The estimated area of the triangle is determined 
-by computing the ratio of points inside the triangle to the total generated points.
-
-Steps:
-1. Generate `num_points` random (x, y) coordinates within the unit square.
-2. Check if the point falls inside the right triangle (x >= y condition).
-3. Compute the estimated area as the ratio of points inside the triangle to total points.
-4. Visualize the results with a scatter plot, highlighting points inside and outside the triangle.
-"""
-
-class Triangle:
-    def __init__(self, num_points):
-        
-        self.num_points = num_points
-        self.points_in_triangle = []
-        self.area = 0
-
-    def monte_carlo_triangle_area(self):
-       
-        np.random.seed(100)
-        self.all_points = np.random.rand(self.num_points, 2)
-        self.points_in_triangle = self.all_points[self.all_points[:, 0] >= self.all_points[:, 1]]
-        self.area = len(self.points_in_triangle) / self.num_points
-
-    def display_results(self):
-       
-        print(f"Out of {self.num_points} generated points, {len(self.points_in_triangle)} fell inside the right triangle.")
-        print(f"Estimated area of the right triangle: {self.area:.4f}")
-
-    def visualization(self):
-        
-        triangle_points = np.array([
-            [0, 0],  # Starting point of the triangle
-            [1, 0],  # The other end of the base of the triangle
-            [1, 1],  # Height of triangle
-            [0, 0],  # Return to starting point to close triangle
-        ])
-
-        square_points = np.array([
-            [0, 0],  # Left-bottom of square
-            [1, 0],  # Right-bottom of square
-            [1, 1],  # Right-top of square
-            [0, 1],  # Left-top of square
-            [0, 0]   # Left-bottom again to close the square
-        ])
-
-        fig, ax = plt.subplots(figsize=(15, 8))
-        
-        ax.plot(square_points[:, 0], square_points[:, 1], marker="", color="#7457b3", alpha=1, label="Unit Square")
-        ax.plot(triangle_points[:, 0], triangle_points[:, 1], marker="", color="#78bce3", alpha=0.8, label="Right Triangle")
-        
-        ax.scatter(self.all_points[:, 0], self.all_points[:, 1], color="#7aff83", s=1, label="Points Out of Triangle")
-        ax.scatter(self.points_in_triangle[:, 0], self.points_in_triangle[:, 1], color="#dcccff", s=1, label="Points in Triangle")
-        
-        ax.set_title("Monte Carlo Simulation: Area of Right Triangle in Unit Square", fontsize=17, color="#393d47", weight = "bold")
-        
-        
-        fig.text(0.5, 0.03, 
-                    f"Estimated area of the right triangle: {self.area:.4f}\n"
-                    f"Out of {self.num_points} generated points, {len(self.points_in_triangle)} fell inside the right triangle.", 
-                    ha="center", fontsize=12, color="#393d47")
-        
-        plt.legend()
-        plt.show()
-
-    def run(self):
-    
-        self.monte_carlo_triangle_area()
-        self.display_results()
-        self.visualization()
-
-
-def main():
-    try:
-        num_points= int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
-        if num_points < 100000:
-            num_points = 100000
-            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
-    except:
-        num_points = 100000
-        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
-    
-    app = Triangle(num_points = num_points)
-    app.run()
-
-
-if __name__ == "__main__":
-    main()
+import matplotlib.pyplot as plt
+import numpy as np
+from figure_export import show_or_save
+from stratified import BOUNDARY, INSIDE, OUTSIDE, StratifiedEstimator
+from regions import estimate_area
+from mc_engine import DEFAULT_BIT_GENERATOR, DEFAULT_PRECISION, check_precision, float_dtype, make_rng
+
+"""
+Monte Carlo Simulation: Estimating the Area of a Right Triangle Inside a Unit Square
+
+This simulation generates random points within a unit square (1x1) and calculates the proportion of points 
+that fall inside a right triangle defined within the square. The estimated area of the triangle is determined 
+by computing the ratio of points inside the triangle to the total generated points.
+
+Steps:
+1. Generate `num_points` random (x, y) coordinates within the unit square.
+2. Check if the point falls inside the right triangle (x >= y condition).
+3. Compute the estimated area as the ratio of points inside the triangle to total points.
+4. Visualize the results with a scatter plot, highlighting points inside and outside the triangle.
+
+With a QMCSampler (see qmc.py), the points come from a randomized Sobol/Halton sequence instead.
+With strata=<grid size> (see stratified.py), only the grid cells crossed by the diagonal are sampled.
+With a region (see regions.py), any polygon, circle or combination of them is measured instead of the
+triangle; the points are then drawn from the bounding box of the region.
+With precision="single" (see mc_engine.py), the points are float32 draws of a NumPy Generator: half
+the memory of the float64 points, while the count of points inside stays exact.
+With bit_generator=<name> (see mc_engine.py), the points come from a NumPy Generator with that bit
+generator instead of the legacy np.random stream (precision="single" uses PCG64 unless told otherwise).
+"""
+
+class Triangle:
+    def __init__(self, num_points, seed=100, cache=None, sampler=None, strata=None, region=None, precision=DEFAULT_PRECISION,
+                 bit_generator=None):
+        
+        if sampler is not None and strata is not None:
+            raise ValueError("Choose either a QMC sampler or stratified sampling, not both.")
+        if region is not None and strata is not None:
+            raise ValueError("Stratified sampling only supports the built-in triangle, not a custom region.")
+        if check_precision(precision) != DEFAULT_PRECISION and any(option is not None for option in (sampler, strata, region)):
+            raise ValueError("precision only applies to the plain pseudo-random points, not to sampler, strata or region.")
+        if bit_generator is not None and any(option is not None for option in (sampler, region)):
+            raise ValueError("bit_generator only applies to the plain and stratified pseudo-random points, not to sampler or region.")
+
+        self.num_points = num_points
+        self.seed = seed
+        self.cache = cache  # Optional ResultCache, skips the sampling when the same scenario was already run
+        self.sampler = sampler  # Optional QMCSampler (see qmc.py) replacing the pseudo-random points
+        self.strata = strata  # Optional number of strata per axis for stratified sampling
+        self.region = region  # Optional Region (see regions.py) measured instead of the right triangle
+        self.precision = precision  # "single" draws float32 points
+        self.bit_generator = bit_generator  # None: legacy np.random stream, else a name from mc_engine.BIT_GENERATORS
+        self.shape_name = "right triangle" if region is None else "region"
+        self.all_points = None
+        self.points_in_triangle = []
+        self.inside_count = 0  # Count of points inside the shape (None for stratified runs)
+        self.area = 0
+        self.standard_error = None  # Set by the sampler, strata and region branches of monte_carlo_triangle_area
+
+    def draw_points(self):
+
+        if self.region is not None:
+            x_min, x_max, y_min, y_max = self.region.bounds()
+            rng = np.random.default_rng(self.seed)
+            size = min(self.num_points, 1_000_000)  # Same stream as the first chunk of estimate_area
+            x = rng.uniform(x_min, x_max, size)
+            y = rng.uniform(y_min, y_max, size)
+            self.all_points = np.column_stack((x, y))
+            self.points_in_triangle = self.all_points[self.region.contains(x, y)]
+            return
+        if self.sampler is not None:
+            # Only the first chunk of the first replicate is kept, for plotting
+            self.all_points = self.sampler.stream(2, 0).random(min(self.sampler.points_per_replicate(self.num_points), self.sampler.chunk_size))
+        elif self.precision != DEFAULT_PRECISION or self.bit_generator is not None:
+            rng = make_rng(self.seed, self.bit_generator or DEFAULT_BIT_GENERATOR)
+            self.all_points = rng.random((self.num_points, 2), dtype=float_dtype(self.precision))
+        else:
+            np.random.seed(self.seed)
+            self.all_points = np.random.rand(self.num_points, 2)
+        self.points_in_triangle = self.all_points[self.all_points[:, 0] >= self.all_points[:, 1]]
+
+    @staticmethod
+    def triangle_cell_status(x_lo, x_hi, y_lo, y_hi):
+
+        # The triangle is x >= y: a cell is inside if its smallest x still beats its largest y
+        return np.where(x_lo >= y_hi, INSIDE, np.where(x_hi <= y_lo, OUTSIDE, BOUNDARY))
+
+    def monte_carlo_triangle_area(self):
+       
+        if self.cache is not None:
+            params = {}
+            if self.sampler is not None:
+                params["sampler"] = [self.sampler.method, self.sampler.replicates, self.sampler.seed, self.sampler.chunk_size]
+            if self.strata is not None:
+                params["strata"] = self.strata
+            if self.region is not None:
+                params["region"] = self.region.fingerprint()
+            if self.precision != DEFAULT_PRECISION:
+                params["precision"] = self.precision
+            if self.bit_generator is not None:
+                params["bit_generator"] = self.bit_generator
+            key = self.cache.make_key(self, params, self.seed, self.num_points)
+            if self.cache.load_into(self, key):
+                return
+
+        if self.region is not None and self.sampler is not None:
+            x_min, x_max, y_min, y_max = self.region.bounds()
+            in_region = lambda points: self.region.contains(x_min + (x_max - x_min) * points[:, 0], y_min + (y_max - y_min) * points[:, 1])
+            ratio, standard_error, _ = self.sampler.estimate(in_region, self.num_points)
+            box = (x_max - x_min) * (y_max - y_min)
+            self.area, self.standard_error = ratio * box, standard_error * box
+            self.inside_count = round(ratio * self.sampler.points_used(self.num_points))
+        elif self.region is not None:
+            self.area, self.standard_error, self.inside_count, self.all_points = estimate_area(self.region, self.num_points, seed=self.seed)
+            self.points_in_triangle = self.all_points[self.region.contains(self.all_points[:, 0], self.all_points[:, 1])]
+        elif self.sampler is not None:
+            in_triangle = lambda points: points[:, 0] >= points[:, 1]
+            self.area, self.standard_error, _ = self.sampler.estimate(in_triangle, self.num_points)
+            self.inside_count = round(self.area * self.sampler.points_used(self.num_points))
+        elif self.strata is not None:
+            estimator = StratifiedEstimator((0, 1, 0, 1), self.triangle_cell_status, lambda x, y: x >= y,
+                                            grid_size=self.strata, seed=self.seed,
+                                            bit_generator=self.bit_generator or DEFAULT_BIT_GENERATOR)
+            result = estimator.estimate(self.num_points)
+            self.area, self.standard_error = result.estimate, result.standard_error
+            self.inside_count = None  # Inside cells count by area, so there is no count of points inside
+            self.all_points = result.sample_points  # Boundary cells only, for plotting
+            self.points_in_triangle = self.all_points[self.all_points[:, 0] >= self.all_points[:, 1]]
+        else:
+            self.draw_points()
+            self.inside_count = len(self.points_in_triangle)
+            self.area = self.inside_count / self.num_points
+
+        if self.cache is not None:
+            self.cache.put(key, {"inside_count": self.inside_count, "area": self.area, "standard_error": self.standard_error})
+
+    def display_results(self):
+       
+        num_points = self.num_points if self.sampler is None else self.sampler.points_used(self.num_points)
+        if self.inside_count is not None:
+            print(f"Out of {num_points} generated points, {self.inside_count} fell inside the {self.shape_name}.")
+        print(f"Estimated area of the {self.shape_name}: {self.area:.4f}")
+        if self.standard_error is not None:
+            if self.sampler is not None:
+                label = f"{self.sampler.method}, {self.sampler.replicates} replicates, {self.sampler.points_used(self.num_points):,} points"
+            elif self.strata is not None:
+                label = f"stratified, {self.strata}x{self.strata} grid"
+            else:
+                label = "bounding-box sampling"
+            print(f"Standard error ({label}): {self.standard_error:.8f}")
+
+    def visualization(self, output_path=None):
+        
+        if self.all_points is None:
+            self.draw_points()  # Cached results keep no raw points, so redraw them from the same seed
+
+        triangle_points = np.array([
+            [0, 0],  # Starting point of the triangle
+            [1, 0],  # The other end of the base of the triangle
+            [1, 1],  # Height of triangle
+            [0, 0],  # Return to starting point to close triangle
+        ])
+
+        square_points = np.array([
+            [0, 0],  # Left-bottom of square
+            [1, 0],  # Right-bottom of square
+            [1, 1],  # Right-top of square
+            [0, 1],  # Left-top of square
+            [0, 0]   # Left-bottom again to close the square
+        ])
+
+        fig, ax = plt.subplots(figsize=(15, 8))
+        
+        if self.region is not None:
+            self.region.plot_outline(ax, color="#78bce3", alpha=0.8)
+            ax.set_aspect("equal", adjustable="datalim")
+            shape_label = "Region"
+            title = "Monte Carlo Simulation: Area of a Region"
+        else:
+            ax.plot(square_points[:, 0], square_points[:, 1], marker="", color="#7457b3", alpha=1, label="Unit Square")
+            ax.plot(triangle_points[:, 0], triangle_points[:, 1], marker="", color="#78bce3", alpha=0.8, label="Right Triangle")
+            shape_label = "Triangle"
+            title = "Monte Carlo Simulation: Area of Right Triangle in Unit Square"
+        
+        ax.scatter(self.all_points[:, 0], self.all_points[:, 1], color="#7aff83", s=1, label=f"Points Out of {shape_label}")
+        ax.scatter(self.points_in_triangle[:, 0], self.points_in_triangle[:, 1], color="#dcccff", s=1, label=f"Points in {shape_label}")
+        
+        ax.set_title(title, fontsize=17, color="#393d47", weight = "bold")
+        
+        
+        summary = f"Estimated area of the {self.shape_name}: {self.area:.4f}"
+        if self.inside_count is not None:
+            summary += f"\nOut of {self.num_points} generated points, {self.inside_count} fell inside the {self.shape_name}."
+        fig.text(0.5, 0.03, summary, ha="center", fontsize=12, color="#393d47")
+        
+        plt.legend()
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+    
+        self.monte_carlo_triangle_area()
+        self.display_results()
+        self.visualization(output_path)
+
+
+def main():
+    try:
+        num_points= int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
+        if num_points < 100000:
+            num_points = 100000
+            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
+    except:
+        num_points = 100000
+        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
+    
+    app = Triangle(num_points = num_points)
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,89 +1,133 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-
-
-"""
-Monte Carlo Coin Toss Simulation
-
-This program simulates a large number of coin flips using Monte Carlo methods 
-to estimate the probability of getting heads or tails. It follows these steps:
-
-1. **Random Sampling:** Uses `np.random.choice()` to simulate a given number of coin flips.
-2. **Probability Calculation:** Computes the frequency of heads and tails.
-3. **Visualization:** Generates:
-   - A pie chart showing the probability distribution.
-   - A bar chart displaying the total occurrences of heads and tails.
-4. **User Input Handling:** Allows the user to specify the number of flips (default: 100,000).
-5. **Error Handling:** If invalid input is given, it defaults to 100,000 flips.
-
-This simulation demonstrates the **Law of Large Numbers**, as the probability should converge 
-to 50% for each outcome when the sample size is large enough.
-
-"""
-
-class CoinToss:
-
-    def __init__(self, num_flip = 100000):
-        self.num_flip = num_flip
-
-
-    def monte_carlo_flip(self):
-        np.random.seed(100)
-        self.all_flips = np.random.choice(["Heads","Tails"], self.num_flip)
-        self.heads = np.sum(self.all_flips == "Heads")
-        self.tails = np.sum(self.all_flips == "Tails")
-        self.heads_probability = self.heads / self.num_flip
-        self.tails_probability = self.tails / self.num_flip
-
-    def display_result(self):
-        self.text = f"""In {self.num_flip} coin flips, heads appeared {self.heads} times and tails appeared {self.tails} times.\nThe probability distribution shows that heads occurred in %{self.heads_probability} of the flips, while tails appeared in %{self.tails_probability} of the cases."""
-        print(self.text)
-        
-
-    def visualization(self):
-        
-        fig, ax = plt.subplots(1,2, figsize=(12, 8))
-        
-        data= np.array([self.heads_probability, self.tails_probability])
-        labels = ["Heads", "Tails"]
-        colors = ["#81a4f7","#a8f781"]
-        ax[0].pie(data, labels= labels, colors = colors , autopct="%1.1f%%",  textprops={'color':"#393d47", 'fontsize': 12}, startangle = 90)
-        ax[0].set_title("Heads and Tails Distribution", fontsize = 15, color = "#393d47")
-        
-        ax[1].bar(["Heads","Tails"],[self.heads, self.tails], color = colors)
-        ax[1].set_title("Distribution of Heads and Tails in Coin Tosses", fontsize = 15, color = "#393d47")
-        ax[1].set_yticks(np.arange(0,max(self.heads, self.tails)+500, self.num_flip /20))
-        ax[1].grid()
-        ax[1].set_axisbelow(True)
-        
-        line = plt.Line2D((.5,.5),(.1,.90), color = "#6b6c6e", linewidth = 1, linestyle = "--")
-        fig.add_artist(line)
-        fig.tight_layout(pad=7.0)
-        
-        fig.suptitle("Monte Carlo Coin Toss Simulation",fontsize = 17, color = "#393d47", weight = "bold")
-        fig.text(0.5, 0.02, self.text, ha = "center", fontsize = 12, color = "#393d47")
-
-        plt.show()
-
-    def run(self):
-        self.monte_carlo_flip()
-        self.display_result()
-        self.visualization()
-
-def main():
-    try:
-        num_flip = int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
-
-        if (num_flip < 100000):
-            num_flip = 100000
-            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
-    except:
-        num_flip = 100000
-        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
-    
-    app = CoinToss(num_flip = num_flip)
-    app.run()
-
-if __name__ == "__main__":
+import numpy as np
+import matplotlib.pyplot as plt
+import pandas as pd
+from fairness import fairness_statistics, stream_fairness
+from mc_engine import DEFAULT_BIT_GENERATOR, make_rng
+from figure_export import show_or_save
+
+
+"""
+Monte Carlo Coin Toss Simulation
+
+This program simulates a large number of coin flips using Monte Carlo methods 
+to estimate the probability of getting heads or tails. It follows these steps:
+
+1. **Random Sampling:** Uses `np.random.choice()` to simulate a given number of coin flips.
+2. **Probability Calculation:** Computes the frequency of heads and tails.
+3. **Visualization:** Generates:
+   - A pie chart showing the probability distribution.
+   - A bar chart displaying the total occurrences of heads and tails.
+4. **User Input Handling:** Allows the user to specify the number of flips (default: 100,000).
+5. **Error Handling:** If invalid input is given, it defaults to 100,000 flips.
+6. **Fairness Tests:** Chi-square, G-test and maximum deviation p-values; `validate_fairness` streams
+   billions of flips through them and can stop as soon as a bias shows up.
+
+This simulation demonstrates the **Law of Large Numbers**, as the probability should converge 
+to 50% for each outcome when the sample size is large enough.
+
+"""
+
+class CoinToss:
+
+    def __init__(self, num_flip = 100000, seed = 100, cache = None, bit_generator = None):
+        self.num_flip = num_flip
+        self.seed = seed
+        self.bit_generator = bit_generator  # None: legacy np.random stream, else a name from mc_engine.BIT_GENERATORS
+        self.cache = cache  # Optional ResultCache, skips the flips when the same scenario was already run
+
+
+    def monte_carlo_flip(self):
+        if self.cache is not None:
+            params = {"bit_generator": self.bit_generator} if self.bit_generator is not None else {}
+            key = self.cache.make_key(self, params, self.seed, self.num_flip)
+            if self.cache.load_into(self, key):
+                return
+
+        if self.bit_generator is None:
+            np.random.seed(self.seed)
+            self.all_flips = np.random.choice(["Heads","Tails"], self.num_flip)
+            self.heads = np.sum(self.all_flips == "Heads")
+            self.tails = np.sum(self.all_flips == "Tails")
+        else:
+            # Flips as bits (0 = heads), counted directly instead of going through strings
+            flips = make_rng(self.seed, self.bit_generator).integers(0, 2, self.num_flip, dtype=np.uint8)
+            self.heads = self.num_flip - int(np.count_nonzero(flips))
+            self.tails = self.num_flip - self.heads
+        self.heads_probability = self.heads / self.num_flip
+        self.tails_probability = self.tails / self.num_flip
+
+        if self.cache is not None:
+            self.cache.put(key, {
+                "heads": self.heads,
+                "tails": self.tails,
+                "heads_probability": self.heads_probability,
+                "tails_probability": self.tails_probability,
+            })
+
+    @property
+    def fairness(self):
+        return fairness_statistics([self.heads, self.tails], [0.5, 0.5])
+
+    def validate_fairness(self, num_flip=10**10, chunk_size=10_000_000, alpha=0.01, early_stop=True, rng=None):
+        """
+        Streams flips in chunks (only their counts are kept) through the fairness tests.
+
+        :param rng: Generator under test (default: self.bit_generator, or PCG64, seeded with self.seed)
+        :return: FairnessMonitor with the counts, test results and verdict
+        """
+        rng = rng if rng is not None else make_rng(self.seed, self.bit_generator or DEFAULT_BIT_GENERATOR)
+        return stream_fairness(lambda size: rng.integers(0, 2, size, dtype=np.uint8), [0.5, 0.5], num_flip,
+                               chunk_size, alpha, early_stop)
+
+    def display_result(self):
+        self.text = f"""In {self.num_flip} coin flips, heads appeared {self.heads} times and tails appeared {self.tails} times.\nThe probability distribution shows that heads occurred in %{self.heads_probability} of the flips, while tails appeared in %{self.tails_probability} of the cases."""
+        print(self.text)
+        self.fairness.display(labels=["Heads", "Tails"])
+        
+
+    def visualization(self, output_path=None):
+        
+        fig, ax = plt.subplots(1,2, figsize=(12, 8))
+        
+        data= np.array([self.heads_probability, self.tails_probability])
+        labels = ["Heads", "Tails"]
+        colors = ["#81a4f7","#a8f781"]
+        ax[0].pie(data, labels= labels, colors = colors , autopct="%1.1f%%",  textprops={'color':"#393d47", 'fontsize': 12}, startangle = 90)
+        ax[0].set_title("Heads and Tails Distribution", fontsize = 15, color = "#393d47")
+        
+        ax[1].bar(["Heads","Tails"],[self.heads, self.tails], color = colors)
+        ax[1].set_title("Distribution of Heads and Tails in Coin Tosses", fontsize = 15, color = "#393d47")
+        ax[1].set_yticks(np.arange(0,max(self.heads, self.tails)+500, self.num_flip /20))
+        ax[1].grid()
+        ax[1].set_axisbelow(True)
+        
+        line = plt.Line2D((.5,.5),(.1,.90), color = "#6b6c6e", linewidth = 1, linestyle = "--")
+        fig.add_artist(line)
+        fig.tight_layout(pad=7.0)
+        
+        fig.suptitle("Monte Carlo Coin Toss Simulation",fontsize = 17, color = "#393d47", weight = "bold")
+        fig.text(0.5, 0.02, self.text, ha = "center", fontsize = 12, color = "#393d47")
+
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_flip()
+        self.display_result()
+        self.visualization(output_path)
+
+def main():
+    try:
+        num_flip = int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
+
+        if (num_flip < 100000):
+            num_flip = 100000
+            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
+    except:
+        num_flip = 100000
+        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
+    
+    app = CoinToss(num_flip = num_flip)
+    app.run()
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
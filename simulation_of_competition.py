@@ -1,146 +1,461 @@
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import seaborn as sn
-import matplotlib.gridspec as gridspec
-
-"""
-Monte Carlo Simulation: Probability of Being Selected in a Competition and Answering the Question Correctly.
-
-This simulation estimates the probability of a contestant being randomly selected in a competition
-and the probability of them correctly answering a question. The competition consists of a given number 
-of contestants, and each question has multiple-choice options.
-
-Key Features:
-- Simulates a competition where participants are chosen randomly.
-- Computes the probability of selection and of knowing the answer.
-- Visualizes results using bar charts and a heatmap.
-
-"""
-
-class Competition:
-    def __init__(self, size=100000, num_contestants=20, num_question_option=4): 
-        self.size = size
-        self.num_contestants = num_contestants
-        self.num_question_option = num_question_option
-
-    def monte_carlo_competition(self):
-       
-        np.random.seed(100)
-        self.all_chosen_contestants = np.random.choice(self.num_contestants, size=self.size)
-
-        self.df = (pd.DataFrame(self.all_chosen_contestants)
-                   .value_counts()
-                   .reset_index()
-                   .rename(columns={0: "Contestant", "count": "Count"})
-                   .sort_values(by="Contestant", ignore_index=True)
-                   )
-
-        self.df["Probability_Being_Selected"] = self.df["Count"] / self.size
-        self.df["Probability_Knowing_Question"] = self.df["Probability_Being_Selected"] * (1 / self.num_question_option)
-
-    def display_results(self):
-        
-        most_selected = self.df.iloc[self.df["Count"].idxmax()]
-        least_selected = self.df.iloc[self.df["Count"].idxmin()]
-
-        print("\n📌 Simulation Results:")
-        print(f"Total Simulations: {self.size}")
-        print(f"Number of Contestants: {self.num_contestants}")
-        print(f"Number of Answer Choices per Question: {self.num_question_option}\n")
-        
-        print(f"🔹 Highest Selection Probability: Contestant {most_selected['Contestant']} - {most_selected['Probability_Being_Selected']:.4f}")
-        print(f"🔹 Lowest Selection Probability: Contestant {least_selected['Contestant']} - {least_selected['Probability_Being_Selected']:.4f}")
-        print(f"🎯 Probability of a Selected Contestant Knowing the Answer: {self.df['Probability_Knowing_Question'].mean():.4f}")
-
-    def visualization(self):
-
-        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
-        gradient = ["#81a4f7", "#8193f7", "#8381f7", "#9d81f7", "#7457b3"]
-
-
-        fig = plt.figure(figsize=(16.5, 9.5))
-        gs = gridspec.GridSpec(1, 2, width_ratios=[5, 3])
-        gs_left = gridspec.GridSpecFromSubplotSpec(2, 1, subplot_spec=gs[0])
-
-        axes_0 = plt.subplot(gs_left[0])
-        axes_0.bar(self.df["Contestant"], self.df["Probability_Being_Selected"], color=colors[0])
-        axes_0.set_xticks(np.arange(0, self.num_contestants,1))
-        axes_0.grid()
-        axes_0.set_axisbelow(True)
-        axes_0.set_title("Distribution of Probability of Selection of Contestants", fontsize=14, color="#393d47")
-
-        axes_1 = plt.subplot(gs_left[1])
-        axes_1.bar(self.df["Contestant"], self.df["Probability_Knowing_Question"], color=colors[1])
-        axes_1.set_xticks(np.arange(0, self.num_contestants,1))
-        axes_1.grid()
-        axes_1.set_axisbelow(True)
-        axes_1.set_title("Probability of Being Selected and Answering Correctly", fontsize=14, color="#393d47")
-
-        # Heatmap for frequency distribution
-        axes_2 = plt.subplot(gs[1])
-        sn.heatmap(
-            self.df[["Count"]],
-            cmap=sn.color_palette(gradient, len(gradient)),
-            annot=True,
-            annot_kws={"size": 14, "color": "w"},
-            fmt=".2f",
-            linewidths=0.5,
-            linecolor="black",
-            ax=axes_2
-        )
-        axes_2.set_ylabel("Contestants", fontsize=14, color="#393d47")
-        axes_2.set_xlabel("Frequency", fontsize=14, color="#393d47")
-        axes_2.set_title("Frequency Distribution Heatmap", fontsize=14, color="#393d47")
-
-        line = plt.Line2D((.6, .6), (.1, .92), color="#6b6c6e", linewidth=2, linestyle="--")
-        fig.add_artist(line)
-        line2 = plt.Line2D((.05, .52), (0.5, 0.5), color="#6b6c6e", linewidth=2, linestyle="--")
-        fig.add_artist(line2)
-
-        
-        fig.suptitle("Monte Carlo Simulation: Probability of Being Selected in the Competition and Answering the Question Correctly", fontsize=17, color="#393d47", weight="bold")
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.85, wspace=0.4, hspace=0.4)
-        plt.show()
-
-    def run(self):
-        self.monte_carlo_competition()
-        self.display_results()
-        self.visualization()
-
-
-def main():
-
-    try:
-        size = int(input("Enter the number of simulations (default: 100,000): "))
-        if size < 100000:
-            size = 100000
-            print("⚠️ Warning: Input too low. Defaulting to 100,000 simulations.")
-    except:
-        size = 100000
-        print("⚠️ Warning: Invalid input detected. Defaulting to 100,000 simulations.")
-
-    try:
-        num_contestants = int(input("Enter the number of contestants (default: 20): "))
-        if num_contestants < 2:
-            num_contestants = 20
-            print("⚠️ Warning: Contestants must be at least 2. Defaulting to 20.")
-    except:
-        num_contestants = 20
-        print("⚠️ Warning: Invalid input detected. Defaulting to 20 contestants.")
-
-    try:
-        num_question_option = int(input("Enter the number of answer choices (default: 4): "))
-        if num_question_option < 2:
-            num_question_option = 4
-            print("⚠️ Warning: Must be at least 2 answer choices. Defaulting to 4.")
-    except:
-        num_question_option = 4
-        print("⚠️ Warning: Invalid input detected. Defaulting to 4 answer choices.")
-
-    app = Competition(size=size, num_contestants=num_contestants, num_question_option=num_question_option)
-    app.run()
-
-
-if __name__ == "__main__":
-    main()
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sn
+import matplotlib.gridspec as gridspec
+from statistics import NormalDist
+from fairness import fairness_statistics, stream_fairness
+from figure_export import show_or_save
+
+"""
+Monte Carlo Simulation: Probability of Being Selected in a Competition and Answering the Question Correctly.
+
+This simulation estimates the probability of a contestant being randomly selected in a competition
+and the probability of them correctly answering a question. The competition consists of a given number 
+of contestants, and each question has multiple-choice options.
+
+Key Features:
+- Simulates a competition where participants are chosen randomly.
+- Computes the probability of selection and of knowing the answer.
+- Visualizes results using bar charts and a heatmap.
+- Scales to lotteries with millions of contestants: picks are counted with a bincount accumulator
+  (chunked draws, same results as the DataFrame path) or drawn directly as one multinomial vector,
+  and the min / max / chi-square uniformity summary is computed in one pass over the counts.
+- `validate_fairness` streams up to 1e10 picks through the fairness tests (see fairness.py) and can
+  stop as soon as a bias shows up.
+- Above `aggregate_threshold` contestants the charts switch to aggregated bins of contestants.
+- `Tournament` plays multi-round elimination tournaments between contestants of different skill,
+  many tournaments at once (see its docstring).
+
+"""
+
+class Competition:
+    def __init__(self, size=100000, num_contestants=20, num_question_option=4, method="dataframe",
+                 chunk_size=1_000_000, aggregate_threshold=1000, display_bins=200):
+        """
+        :param method: "dataframe" (value counts of all picks), "bincount" (picks counted chunk by chunk,
+                       same counts) or "multinomial" (all counts in one draw, memory O(contestants))
+        :param aggregate_threshold: Above this many contestants the charts use aggregated bins
+        :param display_bins: Number of contestant bins in the aggregated charts
+        """
+        if method not in ("dataframe", "bincount", "multinomial"):
+            raise ValueError("method must be 'dataframe', 'bincount' or 'multinomial'")
+        self.size = size
+        self.num_contestants = num_contestants
+        self.num_question_option = num_question_option
+        self.method = method
+        self.chunk_size = chunk_size
+        self.aggregate_threshold = aggregate_threshold
+        self.display_bins = display_bins
+        self.counts = None
+
+    def monte_carlo_competition(self):
+        if self.method != "dataframe":
+            self.monte_carlo_competition_counts()
+            return
+
+        np.random.seed(100)
+        self.all_chosen_contestants = np.random.choice(self.num_contestants, size=self.size)
+
+        self.df = (pd.DataFrame(self.all_chosen_contestants)
+                   .value_counts()
+                   .reset_index()
+                   .rename(columns={0: "Contestant", "count": "Count"})
+                   .sort_values(by="Contestant", ignore_index=True)
+                   )
+
+        self.df["Probability_Being_Selected"] = self.df["Count"] / self.size
+        self.df["Probability_Knowing_Question"] = self.df["Probability_Being_Selected"] * (1 / self.num_question_option)
+
+    def monte_carlo_competition_counts(self):
+        np.random.seed(100)
+        if self.method == "multinomial":
+            self.counts = np.random.multinomial(self.size, np.full(self.num_contestants, 1 / self.num_contestants))
+        else:
+            # Same random stream as one big draw, but only one chunk of picks is in memory
+            self.counts = np.zeros(self.num_contestants, dtype=np.int64)
+            for start in range(0, self.size, self.chunk_size):
+                picks = np.random.choice(self.num_contestants, size=min(self.chunk_size, self.size - start))
+                self.counts += np.bincount(picks, minlength=self.num_contestants)
+
+        self.summary = self.count_summary(self.counts, self.size)
+        self.df = pd.DataFrame({"Contestant": np.arange(self.num_contestants), "Count": self.counts})
+        self.df["Probability_Being_Selected"] = self.df["Count"] / self.size
+        self.df["Probability_Knowing_Question"] = self.df["Probability_Being_Selected"] * (1 / self.num_question_option)
+
+    @staticmethod
+    def count_summary(counts, size):
+        """
+        Extremes and uniformity tests of the selection counts.
+        """
+        fairness = fairness_statistics(counts)
+        return {
+            "min_contestant": int(np.argmin(counts)),
+            "min_count": int(counts.min()),
+            "max_contestant": int(np.argmax(counts)),
+            "max_count": int(counts.max()),
+            "never_selected": int(np.count_nonzero(counts == 0)),
+            "expected_count": size / len(counts),
+            "chi_square": fairness.chi_square,
+            "dof": fairness.dof,
+            "p_value": fairness.chi_square_p,
+            "fairness": fairness,
+        }
+
+    def validate_fairness(self, num_draws=10**10, chunk_size=10_000_000, alpha=0.01, early_stop=True, rng=None):
+        """
+        Streams picks in chunks (only their counts are kept) through the fairness tests.
+
+        :param rng: Generator under test (default: PCG64 seeded with 100)
+        :return: FairnessMonitor with the counts, test results and verdict
+        """
+        rng = rng if rng is not None else np.random.default_rng(100)
+        return stream_fairness(lambda size: rng.integers(0, self.num_contestants, size),
+                               np.full(self.num_contestants, 1 / self.num_contestants), num_draws, chunk_size, alpha, early_stop)
+
+    def display_results(self):
+        if self.counts is not None:
+            self.display_count_results()
+            return
+        
+        most_selected = self.df.iloc[self.df["Count"].idxmax()]
+        least_selected = self.df.iloc[self.df["Count"].idxmin()]
+
+        print("\n📌 Simulation Results:")
+        print(f"Total Simulations: {self.size}")
+        print(f"Number of Contestants: {self.num_contestants}")
+        print(f"Number of Answer Choices per Question: {self.num_question_option}\n")
+        
+        print(f"🔹 Highest Selection Probability: Contestant {most_selected['Contestant']} - {most_selected['Probability_Being_Selected']:.4f}")
+        print(f"🔹 Lowest Selection Probability: Contestant {least_selected['Contestant']} - {least_selected['Probability_Being_Selected']:.4f}")
+        print(f"🎯 Probability of a Selected Contestant Knowing the Answer: {self.df['Probability_Knowing_Question'].mean():.4f}\n")
+
+        counts = np.zeros(self.num_contestants, dtype=np.int64)
+        counts[self.df["Contestant"].to_numpy()] = self.df["Count"].to_numpy()
+        fairness_statistics(counts).display()
+
+    def display_count_results(self):
+        summary = self.summary
+        print("\n📌 Simulation Results:")
+        print(f"Total Simulations: {self.size}")
+        print(f"Number of Contestants: {self.num_contestants}")
+        print(f"Number of Answer Choices per Question: {self.num_question_option}\n")
+
+        print(f"🔹 Highest Selection Probability: Contestant {summary['max_contestant']} - {summary['max_count'] / self.size:.4g}")
+        print(f"🔹 Lowest Selection Probability: Contestant {summary['min_contestant']} - {summary['min_count'] / self.size:.4g}")
+        print(f"🔹 Expected Selections per Contestant: {summary['expected_count']:.2f} (observed {summary['min_count']} to {summary['max_count']})")
+        print(f"🔹 Never Selected: {summary['never_selected']} contestants")
+        print(f"🎯 Probability of a Selected Contestant Knowing the Answer: {1 / self.num_question_option:.4f}\n")
+        summary["fairness"].display()
+
+    def visualization(self, output_path=None):
+        if self.num_contestants > self.aggregate_threshold:
+            self.visualization_aggregated(output_path)
+            return
+
+        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
+        gradient = ["#81a4f7", "#8193f7", "#8381f7", "#9d81f7", "#7457b3"]
+
+
+        fig = plt.figure(figsize=(16.5, 9.5))
+        gs = gridspec.GridSpec(1, 2, width_ratios=[5, 3])
+        gs_left = gridspec.GridSpecFromSubplotSpec(2, 1, subplot_spec=gs[0])
+
+        axes_0 = plt.subplot(gs_left[0])
+        axes_0.bar(self.df["Contestant"], self.df["Probability_Being_Selected"], color=colors[0])
+        axes_0.set_xticks(np.arange(0, self.num_contestants,1))
+        axes_0.grid()
+        axes_0.set_axisbelow(True)
+        axes_0.set_title("Distribution of Probability of Selection of Contestants", fontsize=14, color="#393d47")
+
+        axes_1 = plt.subplot(gs_left[1])
+        axes_1.bar(self.df["Contestant"], self.df["Probability_Knowing_Question"], color=colors[1])
+        axes_1.set_xticks(np.arange(0, self.num_contestants,1))
+        axes_1.grid()
+        axes_1.set_axisbelow(True)
+        axes_1.set_title("Probability of Being Selected and Answering Correctly", fontsize=14, color="#393d47")
+
+        # Heatmap for frequency distribution
+        axes_2 = plt.subplot(gs[1])
+        sn.heatmap(
+            self.df[["Count"]],
+            cmap=sn.color_palette(gradient, len(gradient)),
+            annot=True,
+            annot_kws={"size": 14, "color": "w"},
+            fmt=".2f",
+            linewidths=0.5,
+            linecolor="black",
+            ax=axes_2
+        )
+        axes_2.set_ylabel("Contestants", fontsize=14, color="#393d47")
+        axes_2.set_xlabel("Frequency", fontsize=14, color="#393d47")
+        axes_2.set_title("Frequency Distribution Heatmap", fontsize=14, color="#393d47")
+
+        line = plt.Line2D((.6, .6), (.1, .92), color="#6b6c6e", linewidth=2, linestyle="--")
+        fig.add_artist(line)
+        line2 = plt.Line2D((.05, .52), (0.5, 0.5), color="#6b6c6e", linewidth=2, linestyle="--")
+        fig.add_artist(line2)
+
+        
+        fig.suptitle("Monte Carlo Simulation: Probability of Being Selected in the Competition and Answering the Question Correctly", fontsize=17, color="#393d47", weight="bold")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.85, wspace=0.4, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def visualization_aggregated(self, output_path=None):
+        """
+        Charts for large pools: contestants are grouped into `display_bins` bins, and the heatmap is
+        replaced by the distribution of the selection counts.
+        """
+        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
+        counts = self.df["Count"].to_numpy()
+        probabilities = counts / self.size
+
+        # Mean, min and max selection probability of each bin of consecutive contestants
+        bins = min(self.display_bins, self.num_contestants)
+        starts = np.linspace(0, self.num_contestants, bins + 1).astype(np.int64)[:-1]
+        widths = np.diff(np.append(starts, self.num_contestants))
+        centers = starts + widths / 2
+        means = np.add.reduceat(probabilities, starts) / widths
+        lows = np.minimum.reduceat(probabilities, starts)
+        highs = np.maximum.reduceat(probabilities, starts)
+
+        fig = plt.figure(figsize=(16.5, 9.5))
+        gs = gridspec.GridSpec(1, 2, width_ratios=[5, 3])
+        gs_left = gridspec.GridSpecFromSubplotSpec(2, 1, subplot_spec=gs[0])
+
+        axes_0 = plt.subplot(gs_left[0])
+        axes_0.fill_between(centers, lows, highs, color=colors[0], alpha=0.35, step="mid", label="Min-Max in Bin")
+        axes_0.step(centers, means, where="mid", color="#393d47", label="Bin Mean")
+        axes_0.axhline(1 / self.num_contestants, color=colors[3], linestyle="--", label="Uniform")
+        axes_0.grid()
+        axes_0.set_axisbelow(True)
+        axes_0.legend(fontsize=9)
+        axes_0.set_title(f"Probability of Selection ({bins} Bins of ~{self.num_contestants // bins:,} Contestants)", fontsize=14, color="#393d47")
+
+        axes_1 = plt.subplot(gs_left[1])
+        axes_1.step(centers, means / self.num_question_option, where="mid", color=colors[1])
+        axes_1.fill_between(centers, lows / self.num_question_option, highs / self.num_question_option,
+                            color=colors[1], alpha=0.35, step="mid")
+        axes_1.set_xlabel("Contestant", fontsize=12, color="#393d47")
+        axes_1.grid()
+        axes_1.set_axisbelow(True)
+        axes_1.set_title("Probability of Being Selected and Answering Correctly (Binned)", fontsize=14, color="#393d47")
+
+        # Distribution of the counts against the binomial count of a fair draw (normal approximation)
+        axes_2 = plt.subplot(gs[1])
+        values = np.arange(counts.min(), counts.max() + 1)
+        frequencies = np.bincount(counts - counts.min())
+        axes_2.bar(values, frequencies, width=1.0, color=colors[2], label="Contestants")
+        p = 1 / self.num_contestants
+        mean, std = self.size * p, np.sqrt(self.size * p * (1 - p))
+        if std > 0:
+            axes_2.plot(values, self.num_contestants * np.exp(-0.5 * ((values - mean) / std)**2) / (std * np.sqrt(2 * np.pi)),
+                        color=colors[3], linewidth=2, label="Fair Draw")
+        axes_2.set_xlabel("Times Selected", fontsize=14, color="#393d47")
+        axes_2.set_ylabel("Contestants", fontsize=14, color="#393d47")
+        axes_2.set_title("Frequency Distribution of Selections", fontsize=14, color="#393d47")
+        axes_2.legend()
+
+        line = plt.Line2D((.6, .6), (.1, .92), color="#6b6c6e", linewidth=2, linestyle="--")
+        fig.add_artist(line)
+        line2 = plt.Line2D((.05, .52), (0.5, 0.5), color="#6b6c6e", linewidth=2, linestyle="--")
+        fig.add_artist(line2)
+
+        fig.suptitle("Monte Carlo Simulation: Probability of Being Selected in the Competition and Answering the Question Correctly", fontsize=17, color="#393d47", weight="bold")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.85, wspace=0.4, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_competition()
+        self.display_results()
+        self.visualization(output_path)
+
+
+class Tournament:
+    """
+    Elimination tournament: every round, one question is asked to all remaining contestants. A contestant
+    knows the answer with probability `skill` and otherwise guesses among the options; wrong answers are
+    eliminated, unless nobody answered correctly (then the round is replayed). The last contestant wins.
+
+    A chunk of tournaments is one (tournaments x contestants) boolean survivor mask, and a round is one
+    vectorized operation on it. Between rounds, finished tournaments are dropped and the survivors of
+    every tournament are packed to the front of their row, so the work shrinks with the field.
+    """
+
+    def __init__(self, skills, num_tournaments=1_000_000, num_question_option=4, seed=100, chunk_size=None,
+                 max_rounds=10_000, confidence=0.95):
+        """
+        :param skills: Probability of every contestant knowing the answer to a question
+        :param chunk_size: Tournaments simulated together (default: about 8 million mask cells per chunk)
+        :param max_rounds: Tournaments still undecided after this many rounds are won by a random survivor
+        """
+        self.skills = np.asarray(skills, dtype=np.float64)
+        if self.skills.ndim != 1 or len(self.skills) < 2 or np.any((self.skills < 0) | (self.skills > 1)):
+            raise ValueError("skills must hold a probability in [0, 1] for at least 2 contestants")
+        self.num_contestants = len(self.skills)
+        self.num_tournaments = num_tournaments
+        self.num_question_option = num_question_option
+        self.seed = seed
+        self.chunk_size = chunk_size or max(1, (1 << 23) // self.num_contestants)
+        self.max_rounds = max_rounds
+        self.confidence = confidence
+        # Knowing the answer, or guessing it right
+        self.answer_probability = self.skills + (1 - self.skills) / num_question_option
+        # Answers are drawn as raw 32-bit integers compared against these thresholds
+        self.answer_thresholds = np.minimum(np.round(self.answer_probability * 2**32), 2**32 - 1).astype(np.uint32)
+
+    def simulate_chunk(self, num_tournaments, rng):
+        wins = np.zeros(self.num_contestants, dtype=np.int64)
+        round_counts = np.zeros(self.max_rounds + 1, dtype=np.int64)
+        ids = np.tile(np.arange(self.num_contestants, dtype=np.int32), (num_tournaments, 1))
+        alive = np.ones(ids.shape, dtype=bool)
+        # Answer threshold of every slot; until the first compaction slot j holds contestant j
+        thresholds = self.answer_thresholds[None, :]
+
+        for round_number in range(1, self.max_rounds + 1):
+            bits = rng.bit_generator.random_raw((ids.size + 1) // 2).view(np.uint32)[:ids.size].reshape(ids.shape)
+            correct = alive & (bits < thresholds)
+            replay = ~correct.any(axis=1)
+            alive = np.where(replay[:, None], alive, correct)
+
+            remaining = alive.sum(axis=1)
+            finished = remaining == 1
+            if finished.any():
+                winners = ids[finished, alive[finished].argmax(axis=1)]
+                wins += np.bincount(winners, minlength=self.num_contestants)
+                round_counts[round_number] += np.count_nonzero(finished)
+
+            # Compaction: drop finished tournaments, then move survivors to the front of their rows
+            ongoing = ~finished
+            ids, alive, remaining = ids[ongoing], alive[ongoing], remaining[ongoing]
+            if thresholds.shape[0] > 1:
+                thresholds = thresholds[ongoing]
+            if len(ids) == 0:
+                return wins, round_counts
+            width = remaining.max()
+            if width <= 0.75 * alive.shape[1]:
+                # Row-major nonzero lists every row's survivors in order, so each one's new slot is
+                # its rank within the row
+                rows, columns = np.nonzero(alive)
+                slots = np.arange(len(rows)) - np.repeat(np.cumsum(remaining) - remaining, remaining)
+                packed = np.zeros((len(ids), width), dtype=np.int32)
+                packed[rows, slots] = ids[rows, columns]
+                ids = packed
+                alive = np.arange(width) < remaining[:, None]
+                thresholds = self.answer_thresholds[ids]
+
+        # Undecided tournaments: a random survivor wins the tie-break draw
+        scores = np.where(alive, rng.random(alive.shape), -1.0)
+        winners = ids[np.arange(len(ids)), scores.argmax(axis=1)]
+        wins += np.bincount(winners, minlength=self.num_contestants)
+        round_counts[self.max_rounds] += len(ids)
+        return wins, round_counts
+
+    def monte_carlo_tournament(self):
+        rng = np.random.default_rng(self.seed)
+        self.wins = np.zeros(self.num_contestants, dtype=np.int64)
+        self.round_counts = np.zeros(self.max_rounds + 1, dtype=np.int64)
+        for start in range(0, self.num_tournaments, self.chunk_size):
+            wins, round_counts = self.simulate_chunk(min(self.chunk_size, self.num_tournaments - start), rng)
+            self.wins += wins
+            self.round_counts += round_counts
+
+        # Wilson score intervals for the win probabilities
+        n = self.num_tournaments
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        p = self.wins / n
+        center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+        half_width = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+
+        self.df = pd.DataFrame({
+            "Contestant": np.arange(self.num_contestants),
+            "Skill": self.skills,
+            "Wins": self.wins,
+            "Win_Probability": p,
+            "CI_Lower": center - half_width,
+            "CI_Upper": center + half_width,
+        })
+        self.mean_rounds = np.sum(np.arange(self.max_rounds + 1) * self.round_counts) / n
+
+    def display_results(self, top=10):
+        print("\n🏆 Tournament Results:")
+        print(f"Tournaments: {self.num_tournaments}")
+        print(f"Contestants: {self.num_contestants}")
+        print(f"Average Rounds per Tournament: {self.mean_rounds:.2f} (longest: {np.flatnonzero(self.round_counts).max()})")
+        print(f"\n🔹 Top {min(top, self.num_contestants)} Contestants by Win Probability ({self.confidence:.0%} CI):")
+        best = self.df.nlargest(top, "Win_Probability")
+        for contestant, skill, probability, lower, upper in zip(best["Contestant"], best["Skill"], best["Win_Probability"],
+                                                                best["CI_Lower"], best["CI_Upper"]):
+            print(f"Contestant {contestant} (skill {skill:.2f}): {probability:.4f} [{lower:.4f}, {upper:.4f}]")
+
+    def visualization(self, output_path=None):
+        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
+        fig, (axes_0, axes_1) = plt.subplots(1, 2, figsize=(16.5, 8), gridspec_kw={"width_ratios": [5, 3]})
+
+        ordered = self.df.sort_values("Skill")
+        errors = [ordered["Win_Probability"] - ordered["CI_Lower"], ordered["CI_Upper"] - ordered["Win_Probability"]]
+        if self.num_contestants <= 50:
+            labels = ordered["Contestant"].astype(str)
+            axes_0.bar(labels, ordered["Win_Probability"], yerr=errors, color=colors[0], capsize=3)
+            axes_0.set_xlabel("Contestant (ordered by skill)", fontsize=12, color="#393d47")
+        else:
+            axes_0.errorbar(ordered["Skill"], ordered["Win_Probability"], yerr=errors, fmt="o", markersize=3,
+                            color=colors[2], ecolor=colors[0])
+            axes_0.set_xlabel("Skill", fontsize=12, color="#393d47")
+        axes_0.set_ylabel("Win Probability", fontsize=12, color="#393d47")
+        axes_0.grid()
+        axes_0.set_axisbelow(True)
+        axes_0.set_title(f"Win Probabilities with {self.confidence:.0%} Confidence Intervals", fontsize=14, color="#393d47")
+
+        rounds = np.flatnonzero(self.round_counts)
+        axes_1.bar(rounds, self.round_counts[rounds] / self.num_tournaments, color=colors[3])
+        axes_1.set_xlabel("Rounds Until a Winner", fontsize=12, color="#393d47")
+        axes_1.set_ylabel("Share of Tournaments", fontsize=12, color="#393d47")
+        axes_1.grid()
+        axes_1.set_axisbelow(True)
+        axes_1.set_title("Tournament Length", fontsize=14, color="#393d47")
+
+        fig.suptitle(f"Monte Carlo Simulation: {self.num_tournaments:,} Elimination Tournaments", fontsize=17, color="#393d47", weight="bold")
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_tournament()
+        self.display_results()
+        self.visualization(output_path)
+
+
+def main():
+
+    try:
+        size = int(input("Enter the number of simulations (default: 100,000): "))
+        if size < 100000:
+            size = 100000
+            print("⚠️ Warning: Input too low. Defaulting to 100,000 simulations.")
+    except:
+        size = 100000
+        print("⚠️ Warning: Invalid input detected. Defaulting to 100,000 simulations.")
+
+    try:
+        num_contestants = int(input("Enter the number of contestants (default: 20): "))
+        if num_contestants < 2:
+            num_contestants = 20
+            print("⚠️ Warning: Contestants must be at least 2. Defaulting to 20.")
+    except:
+        num_contestants = 20
+        print("⚠️ Warning: Invalid input detected. Defaulting to 20 contestants.")
+
+    try:
+        num_question_option = int(input("Enter the number of answer choices (default: 4): "))
+        if num_question_option < 2:
+            num_question_option = 4
+            print("⚠️ Warning: Must be at least 2 answer choices. Defaulting to 4.")
+    except:
+        num_question_option = 4
+        print("⚠️ Warning: Invalid input detected. Defaulting to 4 answer choices.")
+
+    app = Competition(size=size, num_contestants=num_contestants, num_question_option=num_question_option)
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
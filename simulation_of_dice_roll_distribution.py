@@ -1,105 +1,152 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-
-"""
-🎲 Monte Carlo Dice Roll Simulation 🎲
-
-This program simulates rolling a six-sided die a large number of times 
-(100,000 by default) using the Monte Carlo method. It calculates the 
-empirical probability of each face appearing and compares it with the 
-expected theoretical probability (1/6 ≈ 16.67%).
-
-Key Features:
-- Simulates dice rolls and records frequency of each face.
-- Computes and displays empirical vs. theoretical probabilities.
-- Visualizes the distribution using a bar chart and pie chart.
-- Demonstrates the Law of Large Numbers as the sample size increases.
-
-Usage:
-- The user can specify the number of rolls (minimum 100,000).
-- The program outputs the frequency and probability of each face.
-- Graphical representations help in visualizing the probability distribution.
-
-Expected Outcome:
-- As the number of rolls increases, the empirical probabilities should 
-  converge to the theoretical value (≈16.67%) for each face.
-
-📌 Note: The randomness is controlled using np.random.seed(100) to ensure 
-reproducibility of results.
-"""
-
-
-class Dice:
-    def __init__(self,num_rolls):
-        self.num_rolls = num_rolls
-        
-
-    def monte_carlo_dice(self):
-        np.random.seed(100)
-        self.rolls = np.random.randint(1, 7, size= self.num_rolls)  # Rolling the dice (between 1 and 6)
-        self.df = pd.DataFrame(np.array(self.rolls))
-        self.df = self.df.value_counts().reset_index().rename(columns={0: "DiceSide", "count":"Count"}).sort_values(by = ["DiceSide"], ignore_index= True)
-        self.df["Probability"] = self.df["Count"]/ self.num_rolls
-
-    def display_result(self):
-        """ Display the simulation results in a readable format """
-        print("\n🎲 Monte Carlo Dice Roll Simulation Results 🎲")
-        print(f"Total Rolls: {self.num_rolls}\n")
-
-        # Print each face count and probability
-        for index, row in self.df.iterrows():
-            expected_prob = 1/6  # Theoretical probability for a fair die
-            print(f"Face {int(row['DiceSide'])}: Rolled {int(row['Count'])} times, Probability: {row['Probability']:.4f} "
-                f"(Expected: {expected_prob:.4f})")
-
-        print("\n🔍 Note: As the number of rolls increases, the experimental probabilities should converge to the theoretical value (≈16.67%).")
-
-        
-    def visualization(self):
-        
-        colors = ["#81a4f7","#a8f781", "#b081f7"]
-        fig, axes = plt.subplots(1, 2, figsize = (15,8))
-       
-        axes[0].bar(self.df["DiceSide"], self.df["Count"], color = colors[0])
-        
-        axes[0].set_title("Monte Carlo Dice Simulation", fontsize=16, color = "#393d47")
-        axes[0].set_xticks([1, 2, 3, 4, 5, 6])
-        axes[0].set_yticks(np.arange(0,max(self.df["Count"]+1000),1000))
-        axes[0].grid()
-        axes[0].set_axisbelow(True)
-
-        axes[1].pie(self.df["Probability"], labels= self.df["DiceSide"], colors = colors , autopct="%1.1f%%",  textprops={'color':"#393d47", 'fontsize': 12}, startangle = 90)
-        axes[1].set_title("Probability Distribution of Each Face of the Die", fontsize = 16, color = "#393d47")
-        line = plt.Line2D((.5,.5),(.1,.92), color = "#6b6c6e", linewidth = 2, linestyle = "--")
-        fig.add_artist(line)
-        fig.tight_layout(pad=7.0)
-        
-        fig.suptitle("Monte Carlo Simulation: Probability Distribution of Dice Faces", fontsize = 18, color = "#393d47", weight = "bold")
-        
-        plt.show()
-    
-    
-    def run(self):
-        self.monte_carlo_dice()
-        self.display_result()
-        self.visualization()
-
-
-def main():
-
-    try:
-        num_rolls = int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
-        if num_rolls < 100000:
-            num_rolls = 100000
-            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
-    except:
-        num_rolls= 100000
-        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
-    
-    app = Dice(num_rolls)
-    app.run()
-
-
-if __name__ == "__main__":
+import numpy as np
+import matplotlib.pyplot as plt
+import pandas as pd
+from fairness import fairness_statistics, stream_fairness
+from mc_engine import DEFAULT_BIT_GENERATOR, DEFAULT_PRECISION, check_precision, make_rng, outcome_dtype
+from figure_export import show_or_save
+
+"""
+🎲 Monte Carlo Dice Roll Simulation 🎲
+
+This program simulates rolling a six-sided die a large number of times 
+(100,000 by default) using the Monte Carlo method. It calculates the 
+empirical probability of each face appearing and compares it with the 
+expected theoretical probability (1/6 ≈ 16.67%).
+
+Key Features:
+- Simulates dice rolls and records frequency of each face.
+- Computes and displays empirical vs. theoretical probabilities.
+- Visualizes the distribution using a bar chart and pie chart.
+- Demonstrates the Law of Large Numbers as the sample size increases.
+- Tests the die for fairness (chi-square, G-test, maximum deviations); `validate_fairness` streams
+  billions of rolls through the same tests and can stop as soon as a bias shows up.
+- precision="single" (see mc_engine.py) stores the rolls as uint8 instead of int64, an eighth of the
+  memory; the face counts are still exact int64 counts.
+
+Usage:
+- The user can specify the number of rolls (minimum 100,000).
+- The program outputs the frequency and probability of each face.
+- Graphical representations help in visualizing the probability distribution.
+
+Expected Outcome:
+- As the number of rolls increases, the empirical probabilities should 
+  converge to the theoretical value (≈16.67%) for each face.
+
+📌 Note: The randomness is controlled using np.random.seed(100) to ensure 
+reproducibility of results.
+"""
+
+
+class Dice:
+    def __init__(self,num_rolls, seed=100, cache=None, bit_generator=None, precision=DEFAULT_PRECISION):
+        self.num_rolls = num_rolls
+        self.seed = seed
+        self.bit_generator = bit_generator  # None: legacy np.random stream, else a name from mc_engine.BIT_GENERATORS
+        self.cache = cache  # Optional ResultCache, skips the rolls when the same scenario was already run
+        self.precision = check_precision(precision)  # "single" stores the rolls as uint8
+        
+
+    def monte_carlo_dice(self):
+        if self.cache is not None:
+            params = {}
+            if self.bit_generator is not None:
+                params["bit_generator"] = self.bit_generator  # Keeps the keys of legacy-stream runs unchanged
+            if self.precision != DEFAULT_PRECISION:
+                params["precision"] = self.precision
+            key = self.cache.make_key(self, params, self.seed, self.num_rolls)
+            if self.cache.load_into(self, key):
+                return
+
+        dtype = outcome_dtype(7, self.precision)
+        if self.bit_generator is None:
+            np.random.seed(self.seed)
+            self.rolls = np.random.randint(1, 7, size= self.num_rolls, dtype=dtype)  # Rolling the dice (between 1 and 6)
+        else:
+            self.rolls = make_rng(self.seed, self.bit_generator).integers(1, 7, size=self.num_rolls, dtype=dtype)
+        self.df = pd.DataFrame(np.array(self.rolls))
+        self.df = self.df.value_counts().reset_index().rename(columns={0: "DiceSide", "count":"Count"}).sort_values(by = ["DiceSide"], ignore_index= True)
+        self.df["Probability"] = self.df["Count"]/ self.num_rolls
+
+        if self.cache is not None:
+            self.cache.put(key, {"df": self.df})
+
+    @property
+    def fairness(self):
+        counts = np.zeros(6, dtype=np.int64)
+        counts[self.df["DiceSide"].to_numpy() - 1] = self.df["Count"].to_numpy()
+        return fairness_statistics(counts, np.full(6, 1 / 6))
+
+    def validate_fairness(self, num_rolls=10**10, chunk_size=10_000_000, alpha=0.01, early_stop=True, rng=None):
+        """
+        Streams rolls in chunks (only their counts are kept) through the fairness tests.
+
+        :param rng: Generator under test (default: self.bit_generator, or PCG64, seeded with self.seed)
+        :return: FairnessMonitor with the counts, test results and verdict
+        """
+        rng = rng if rng is not None else make_rng(self.seed, self.bit_generator or DEFAULT_BIT_GENERATOR)
+        return stream_fairness(lambda size: rng.integers(0, 6, size, dtype=np.uint8), np.full(6, 1 / 6), num_rolls,
+                               chunk_size, alpha, early_stop)
+
+    def display_result(self):
+        """ Display the simulation results in a readable format """
+        print("\n🎲 Monte Carlo Dice Roll Simulation Results 🎲")
+        print(f"Total Rolls: {self.num_rolls}\n")
+
+        # Print each face count and probability
+        expected_prob = 1/6  # Theoretical probability for a fair die
+        for side, count, probability in zip(self.df["DiceSide"], self.df["Count"], self.df["Probability"]):
+            print(f"Face {side}: Rolled {count} times, Probability: {probability:.4f} (Expected: {expected_prob:.4f})")
+
+        print()
+        self.fairness.display(labels=np.arange(1, 7))
+
+        print("\n🔍 Note: As the number of rolls increases, the experimental probabilities should converge to the theoretical value (≈16.67%).")
+
+        
+    def visualization(self, output_path=None):
+        
+        colors = ["#81a4f7","#a8f781", "#b081f7"]
+        fig, axes = plt.subplots(1, 2, figsize = (15,8))
+       
+        axes[0].bar(self.df["DiceSide"], self.df["Count"], color = colors[0])
+        
+        axes[0].set_title("Monte Carlo Dice Simulation", fontsize=16, color = "#393d47")
+        axes[0].set_xticks([1, 2, 3, 4, 5, 6])
+        axes[0].set_yticks(np.arange(0,max(self.df["Count"]+1000),1000))
+        axes[0].grid()
+        axes[0].set_axisbelow(True)
+
+        axes[1].pie(self.df["Probability"], labels= self.df["DiceSide"], colors = colors , autopct="%1.1f%%",  textprops={'color':"#393d47", 'fontsize': 12}, startangle = 90)
+        axes[1].set_title("Probability Distribution of Each Face of the Die", fontsize = 16, color = "#393d47")
+        line = plt.Line2D((.5,.5),(.1,.92), color = "#6b6c6e", linewidth = 2, linestyle = "--")
+        fig.add_artist(line)
+        fig.tight_layout(pad=7.0)
+        
+        fig.suptitle("Monte Carlo Simulation: Probability Distribution of Dice Faces", fontsize = 18, color = "#393d47", weight = "bold")
+        
+        show_or_save(fig, output_path)
+    
+    
+    def run(self, output_path=None):
+        self.monte_carlo_dice()
+        self.display_result()
+        self.visualization(output_path)
+
+
+def main():
+
+    try:
+        num_rolls = int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
+        if num_rolls < 100000:
+            num_rolls = 100000
+            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
+    except:
+        num_rolls= 100000
+        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
+    
+    app = Dice(num_rolls)
+    app.run()
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
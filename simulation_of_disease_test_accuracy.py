@@ -1,124 +1,375 @@
-import matplotlib.pyplot as plt
-import random
-
-
-class MonteCarloAccuracyDisease:
-
-    def __init__(self, population_size=10000, disease_rate=0.01, true_positive_rate=0.95, false_positive_rate=0.05):
-        self.population_size = population_size
-        self.disease_rate = disease_rate
-        self.true_positive_rate = true_positive_rate
-        self.false_positive_rate = false_positive_rate
-
-        self.false_negative_rate = 1 - self.true_positive_rate 
-        self.true_negative_rate = 1 - self.false_positive_rate 
-
-        self.true_positives = 0
-        self.false_positives = 0
-        self.true_negatives = 0
-        self.false_negatives = 0
-
-        self.healthy_population_size = 0
-        self.diseased_population_size = 0
-
-        self.positives_test = 0
-        self.negatives_test = 0
-
-    def monte_carlo_accuracy_simulation(self):
-        for _ in range(self.population_size):
-            if random.uniform(0, 1) < self.disease_rate:
-                self.diseased_population_size += 1
-
-                if random.uniform(0, 1) < self.true_positive_rate:
-                    self.true_positives += 1
-                else:
-                    self.false_negatives += 1
-            else:
-                self.healthy_population_size += 1
-
-                if random.uniform(0, 1) < self.false_positive_rate:
-                    self.false_positives += 1
-                else:
-                    self.true_negatives += 1
-
-        self.positives_test = self.true_positives + self.false_positives
-        self.negatives_test = self.true_negatives + self.false_negatives
-
-    def display_results(self):
-        print("\n🔬 Monte Carlo Simulation Results on Disease Testing Device Accuracy 🔬")
-        print(f"Population Size: {self.population_size}")
-        print(f"True Positives: {self.true_positives}")
-        print(f"False Positives: {self.false_positives}")
-        print(f"True Negatives: {self.true_negatives}")
-        print(f"False Negatives: {self.false_negatives}\n")
-
-        print("🎯 Precision (Proportion of positive results that are actually sick)")
-        precision = self.true_positives / (self.true_positives + self.false_positives)
-        print(f"Precision = TP / (TP + FP): {precision:.4f}")
-
-        print("\n💉 Sensitivity / Recall (Proportion of actual sick people caught by the test)")
-        sensitivity = self.true_positives / (self.true_positives + self.false_negatives)
-        print(f"Sensitivity = TP / (TP + FN): {sensitivity:.4f}")
-
-    def visualization(self):
-        colors = ["#81a4f7", "#a8f781", "#ffa81c", "#fc5252"]
-        labels = ["True Positives", "False Positives", "True Negatives", "False Negatives"]
-        sizes = [self.true_positives, self.false_positives, self.true_negatives, self.false_negatives]
-        explode = [0.1, 0.1, 0.1, 0]
-
-        fig, ax = plt.subplots(figsize=(10,10))
-        ax.pie(sizes, labels=labels, colors=colors, autopct="%1.1f%%",
-               textprops={'color': "#393d47", 'fontsize': 13}, startangle=45,explode=explode,wedgeprops={'edgecolor': 'white', 'linewidth': 2},radius=1.3)
-
-        ax.set_title("Diagnostic Accuracy Breakdown", color="#393d47", fontsize=15)
-        fig.suptitle("Monte Carlo Simulation: Diagnostic Performance of Disease Test Device",
-                     fontsize=17, color="#393d47", weight="bold")
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
-        plt.show()
-
-
-def main():
-    print("\n💡 Welcome to the Disease Diagnosis Simulation using Monte Carlo Method 💡\n")
-
-    try:
-        population_size = int(input("Please enter population size for the simulation (e.g., 10,000): "))
-        if population_size < 1000:
-            population_size = 10000
-            print("⚠️ Population size too small. Automatically adjusted to 10,000.")
-    except:
-        population_size = 10000
-        print("⚠️ Invalid input. Default population size set to 10,000.")
-
-    try:
-        disease_rate = float(input("Enter disease prevalence rate (e.g., 0.01 for 1%): "))
-        if not 0 < disease_rate < 1:
-            disease_rate = 0.01
-            print("⚠️ Invalid range. Default disease rate of 1% applied.")
-    except:
-        disease_rate = 0.01
-        print("⚠️ Invalid input. Default disease rate of 1% applied.")
-
-    try:
-        tpr = float(input("Enter True Positive Rate (e.g., 0.95): "))
-        fpr = float(input("Enter False Positive Rate (e.g., 0.05): "))
-        if not (0 <= tpr <= 1) or not (0 <= fpr <= 1):
-            raise ValueError
-    except:
-        tpr = 0.95
-        fpr = 0.05
-        print("⚠️ Invalid input. Default rates applied: TPR = 0.95, FPR = 0.05")
-
-    print("\n⏳ Running simulation... Please wait.\n")
-
-    app = MonteCarloAccuracyDisease(population_size=population_size,
-                                    disease_rate=disease_rate,
-                                    true_positive_rate=tpr,
-                                    false_positive_rate=fpr)
-
-    app.monte_carlo_accuracy_simulation()
-    app.display_results()
-    app.visualization()
-
-
-if __name__ == "__main__":
-    main()
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import random
+from figure_export import show_or_save
+from bootstrap import multinomial_bootstrap
+
+
+class MonteCarloAccuracyDisease:
+
+    # Metrics as functions of (..., [TP, FP, TN, FN]) count arrays, for the bootstrap
+    METRIC_FUNCTIONS = {
+        "precision": lambda counts: counts[..., 0] / (counts[..., 0] + counts[..., 1]),
+        "sensitivity": lambda counts: counts[..., 0] / (counts[..., 0] + counts[..., 3]),
+        "specificity": lambda counts: counts[..., 2] / (counts[..., 2] + counts[..., 1]),
+        "npv": lambda counts: counts[..., 2] / (counts[..., 2] + counts[..., 3]),
+    }
+
+    def __init__(self, population_size=10000, disease_rate=0.01, true_positive_rate=0.95, false_positive_rate=0.05,
+                 bootstrap_replicates=10000, confidence=0.95, stages=None, seed=None):
+        """
+        :param stages: Optional chain of tests [(TPR, FPR), ...]. Only the positives of a stage go on
+                       to the next one, and a person counts as positive if every stage was positive.
+                       Replaces the single test given by true_positive_rate / false_positive_rate.
+        :param seed: Seed of the multi-stage simulation
+        """
+        self.population_size = population_size
+        self.disease_rate = disease_rate
+        self.true_positive_rate = true_positive_rate
+        self.false_positive_rate = false_positive_rate
+
+        self.false_negative_rate = 1 - self.true_positive_rate 
+        self.true_negative_rate = 1 - self.false_positive_rate 
+
+        self.true_positives = 0
+        self.false_positives = 0
+        self.true_negatives = 0
+        self.false_negatives = 0
+
+        self.healthy_population_size = 0
+        self.diseased_population_size = 0
+
+        self.positives_test = 0
+        self.negatives_test = 0
+
+        self.bootstrap_replicates = bootstrap_replicates
+        self.confidence = confidence
+        self.intervals = {}
+
+        self.stages = stages
+        self.seed = seed
+        self.stage_df = None
+
+    def monte_carlo_accuracy_simulation(self):
+        if self.stages is not None:
+            self.monte_carlo_multistage_simulation()
+            return
+
+        for _ in range(self.population_size):
+            if random.uniform(0, 1) < self.disease_rate:
+                self.diseased_population_size += 1
+
+                if random.uniform(0, 1) < self.true_positive_rate:
+                    self.true_positives += 1
+                else:
+                    self.false_negatives += 1
+            else:
+                self.healthy_population_size += 1
+
+                if random.uniform(0, 1) < self.false_positive_rate:
+                    self.false_positives += 1
+                else:
+                    self.true_negatives += 1
+
+        self.positives_test = self.true_positives + self.false_positives
+        self.negatives_test = self.true_negatives + self.false_negatives
+
+    def monte_carlo_multistage_simulation(self):
+        """
+        Screening chain resolved with count-level binomial draws: each stage only needs to know how
+        many sick and healthy people it tests, so the cost grows with the number of stages, not people.
+        """
+        rng = np.random.default_rng(self.seed)
+        self.diseased_population_size = int(rng.binomial(self.population_size, self.disease_rate))
+        self.healthy_population_size = self.population_size - self.diseased_population_size
+
+        sick_positive = self.diseased_population_size
+        healthy_positive = self.healthy_population_size
+        sensitivity_chain = false_positive_chain = 1.0  # Products of TPR and FPR of the stages so far
+        rows = []
+        for stage, (true_positive_rate, false_positive_rate) in enumerate(self.stages, start=1):
+            tested = sick_positive + healthy_positive
+            sick_positive = int(rng.binomial(sick_positive, true_positive_rate))
+            healthy_positive = int(rng.binomial(healthy_positive, false_positive_rate))
+            positives = sick_positive + healthy_positive
+
+            sensitivity_chain *= true_positive_rate
+            false_positive_chain *= false_positive_rate
+            exact_positive_sick = self.disease_rate * sensitivity_chain
+            exact_positive_healthy = (1 - self.disease_rate) * false_positive_chain
+            rows.append({
+                "Stage": stage,
+                "TPR": true_positive_rate,
+                "FPR": false_positive_rate,
+                "Tested": tested,
+                "Positives": positives,
+                "Yield": positives / tested if tested else np.nan,
+                "True Positives": sick_positive,
+                "False Positives": healthy_positive,
+                "PPV": sick_positive / positives if positives else np.nan,
+                "PPV (Bayes)": exact_positive_sick / (exact_positive_sick + exact_positive_healthy),
+            })
+
+        self.stage_df = pd.DataFrame(rows)
+        self.true_positives = sick_positive
+        self.false_positives = healthy_positive
+        self.false_negatives = self.diseased_population_size - sick_positive
+        self.true_negatives = self.healthy_population_size - healthy_positive
+        self.positives_test = self.true_positives + self.false_positives
+        self.negatives_test = self.true_negatives + self.false_negatives
+
+    def confidence_intervals(self, seed=None):
+        """
+        Percentile and BCa bootstrap intervals of the metrics, resampling the confusion-matrix counts
+        with multinomial draws (see bootstrap.py) instead of re-running the population.
+        """
+        counts = [self.true_positives, self.false_positives, self.true_negatives, self.false_negatives]
+        rng = np.random.default_rng(seed)
+        self.intervals = {name: multinomial_bootstrap(counts, metric, self.bootstrap_replicates, self.confidence, rng)
+                          for name, metric in self.METRIC_FUNCTIONS.items()}
+        return self.intervals
+
+    def print_interval(self, name):
+        interval = self.intervals[name]
+        print(f"{self.confidence:.0%} CI: percentile [{interval.percentile[0]:.4f}, {interval.percentile[1]:.4f}], "
+              f"BCa [{interval.bca[0]:.4f}, {interval.bca[1]:.4f}] ({self.bootstrap_replicates} bootstrap replicates)")
+
+    def display_results(self):
+        print("\n🔬 Monte Carlo Simulation Results on Disease Testing Device Accuracy 🔬")
+        print(f"Population Size: {self.population_size}")
+        print(f"True Positives: {self.true_positives}")
+        print(f"False Positives: {self.false_positives}")
+        print(f"True Negatives: {self.true_negatives}")
+        print(f"False Negatives: {self.false_negatives}\n")
+
+        if self.stage_df is not None:
+            print("🧪 Screening Stages (positives of each stage are tested again)")
+            print(self.stage_df.to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+            print()
+
+        print("🎯 Precision (Proportion of positive results that are actually sick)")
+        precision = self.true_positives / (self.true_positives + self.false_positives)
+        print(f"Precision = TP / (TP + FP): {precision:.4f}")
+        if not self.intervals:
+            self.confidence_intervals()
+        self.print_interval("precision")
+
+        print("\n💉 Sensitivity / Recall (Proportion of actual sick people caught by the test)")
+        sensitivity = self.true_positives / (self.true_positives + self.false_negatives)
+        print(f"Sensitivity = TP / (TP + FN): {sensitivity:.4f}")
+        self.print_interval("sensitivity")
+
+    def visualization(self, output_path=None):
+        colors = ["#81a4f7", "#a8f781", "#ffa81c", "#fc5252"]
+        labels = ["True Positives", "False Positives", "True Negatives", "False Negatives"]
+        sizes = [self.true_positives, self.false_positives, self.true_negatives, self.false_negatives]
+        explode = [0.1, 0.1, 0.1, 0]
+
+        if self.stage_df is not None:
+            fig, (ax, ax_stages) = plt.subplots(1, 2, figsize=(18, 10))
+            stage_labels = [f"Stage {stage}" for stage in self.stage_df["Stage"]]
+            ax_stages.bar(stage_labels, self.stage_df["True Positives"], color="#81a4f7", label="True Positives")
+            ax_stages.bar(stage_labels, self.stage_df["False Positives"], bottom=self.stage_df["True Positives"],
+                          color="#a8f781", label="False Positives")
+            for i, ppv in enumerate(self.stage_df["PPV"]):
+                ax_stages.text(i, self.stage_df["Positives"].iloc[i], f"PPV {ppv:.1%}", ha="center", va="bottom",
+                               color="#393d47", fontsize=12)
+            ax_stages.set_yscale("log")
+            ax_stages.set_ylabel("Positive Results (log scale)")
+            ax_stages.set_title("Positives After Each Screening Stage", color="#393d47", fontsize=15)
+            ax_stages.legend()
+        else:
+            fig, ax = plt.subplots(figsize=(10,10))
+        ax.pie(sizes, labels=labels, colors=colors, autopct="%1.1f%%",
+               textprops={'color': "#393d47", 'fontsize': 13}, startangle=45,explode=explode,wedgeprops={'edgecolor': 'white', 'linewidth': 2},radius=1.3)
+
+        ax.set_title("Diagnostic Accuracy Breakdown", color="#393d47", fontsize=15)
+        fig.suptitle("Monte Carlo Simulation: Diagnostic Performance of Disease Test Device",
+                     fontsize=17, color="#393d47", weight="bold")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
+        show_or_save(fig, output_path)
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    Wilson score interval of a binomial proportion, elementwise; NaN where there are no trials.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        estimate = successes / trials
+        center = (successes + z**2 / 2) / (trials + z**2)
+        half_width = z * np.sqrt(successes * (trials - successes) / trials + z**2 / 4) / (trials + z**2)
+    lower = np.where(trials > 0, center - half_width, np.nan)
+    upper = np.where(trials > 0, center + half_width, np.nan)
+    return estimate, lower, upper
+
+
+class DiseaseTestSweep:
+
+    METRICS = ("precision", "recall", "npv", "accuracy")
+
+    def __init__(self, disease_rates, true_positive_rates, false_positive_rates, population_size=10000, seed=None,
+                 outer=True, chunk_size=1_000_000):
+        """
+        Simulates the disease test for a whole grid of parameter combinations at once. Instead of
+        testing people one by one, the confusion-matrix counts of every grid point are drawn directly
+        from their binomial distributions, with one broadcasted call per count and chunk of grid points.
+
+        :param outer: True builds the grid of all combinations of the three arrays; False broadcasts them as given
+        :param chunk_size: Grid points drawn together
+        """
+        arrays = [np.asarray(values, dtype=np.float64) for values in (disease_rates, true_positive_rates, false_positive_rates)]
+        if outer:
+            arrays = np.meshgrid(*[array.ravel() for array in arrays], indexing="ij")
+        self.disease_rates, self.true_positive_rates, self.false_positive_rates = np.broadcast_arrays(*arrays)
+        self.grid_shape = self.disease_rates.shape
+        self.population_size = population_size
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+
+    def simulate_counts(self):
+        disease_rate = self.disease_rates.ravel()
+        true_positive_rate = self.true_positive_rates.ravel()
+        false_positive_rate = self.false_positive_rates.ravel()
+        counts = np.empty((4, disease_rate.size), dtype=np.int64)
+
+        for start in range(0, disease_rate.size, self.chunk_size):
+            grid_points = slice(start, start + self.chunk_size)
+            diseased = self.rng.binomial(self.population_size, disease_rate[grid_points])
+            true_positives = self.rng.binomial(diseased, true_positive_rate[grid_points])
+            false_positives = self.rng.binomial(self.population_size - diseased, false_positive_rate[grid_points])
+            counts[0, grid_points] = true_positives
+            counts[1, grid_points] = false_positives
+            counts[2, grid_points] = self.population_size - diseased - false_positives
+            counts[3, grid_points] = diseased - true_positives
+
+        self.true_positives, self.false_positives, self.true_negatives, self.false_negatives = counts.reshape(4, *self.grid_shape)
+
+    def bayes_values(self):
+        """
+        Closed-form values of the metrics from Bayes' theorem.
+        """
+        p, tpr, fpr = self.disease_rates, self.true_positive_rates, self.false_positive_rates
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "precision": p * tpr / (p * tpr + (1 - p) * fpr),
+                "recall": tpr.copy(),
+                "npv": (1 - p) * (1 - fpr) / ((1 - p) * (1 - fpr) + p * (1 - tpr)),
+                "accuracy": p * tpr + (1 - p) * (1 - fpr),
+            }
+
+    def monte_carlo_sweep(self, z=1.96):
+        self.simulate_counts()
+        tp, fp, tn, fn = self.true_positives, self.false_positives, self.true_negatives, self.false_negatives
+        fractions = {
+            "precision": (tp, tp + fp),
+            "recall": (tp, tp + fn),
+            "npv": (tn, tn + fn),
+            "accuracy": (tp + tn, np.full(self.grid_shape, self.population_size)),
+        }
+        exact = self.bayes_values()
+
+        self.metrics = {}
+        for name, (successes, trials) in fractions.items():
+            estimate, lower, upper = wilson_interval(successes, trials, z)
+            self.metrics[name] = {"estimate": estimate, "lower": lower, "upper": upper, "exact": exact[name]}
+
+        columns = {
+            "Disease Rate": self.disease_rates.ravel(),
+            "True Positive Rate": self.true_positive_rates.ravel(),
+            "False Positive Rate": self.false_positive_rates.ravel(),
+            "TP": tp.ravel(), "FP": fp.ravel(), "TN": tn.ravel(), "FN": fn.ravel(),
+        }
+        for name, values in self.metrics.items():
+            for key, array in values.items():
+                columns[name if key == "estimate" else f"{name}_{key}"] = array.ravel()
+        self.df = pd.DataFrame(columns)
+
+    def coverage(self, name):
+        """
+        Share of grid points whose confidence interval contains the Bayes value (≈ 95% expected).
+        """
+        metric = self.metrics[name]
+        valid = ~np.isnan(metric["lower"]) & ~np.isnan(metric["exact"])
+        inside = (metric["lower"] <= metric["exact"]) & (metric["exact"] <= metric["upper"])
+        return np.count_nonzero(inside & valid) / max(np.count_nonzero(valid), 1)
+
+    def display_results(self):
+        print("\n🔬 Monte Carlo Sweep of Disease Test Parameters 🔬")
+        print(f"Grid Points: {self.disease_rates.size} {self.grid_shape}, Population per Point: {self.population_size}")
+        for name in self.METRICS:
+            metric = self.metrics[name]
+            with np.errstate(invalid="ignore"):
+                deviation = np.nanmax(np.abs(metric["estimate"] - metric["exact"]))
+            print(f"{name.upper():>9}: CI covers the Bayes value at {self.coverage(name):.1%} of the points, "
+                  f"largest deviation {deviation:.4f}")
+
+    def visualization(self, output_path=None):
+        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+        titles = {"precision": "Precision (PPV)", "recall": "Sensitivity / Recall", "npv": "Negative Predictive Value", "accuracy": "Accuracy"}
+
+        for ax, name in zip(axes.ravel(), self.METRICS):
+            metric = self.metrics[name]
+            ax.scatter(metric["exact"].ravel(), metric["estimate"].ravel(), s=4, color="#81a4f7", alpha=0.6, label="Simulated")
+            ax.plot([0, 1], [0, 1], color="#fc5252", linestyle="--", label="Bayes (exact)")
+            ax.set_title(titles[name], color="#393d47", fontsize=13)
+            ax.set_xlabel("Closed-Form Value")
+            ax.set_ylabel("Simulated Value")
+            ax.legend(loc="upper left")
+
+        fig.suptitle("Monte Carlo Simulation: Disease Test Metrics Across the Parameter Grid",
+                     fontsize=17, color="#393d47", weight="bold")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.88, wspace=0.3, hspace=0.35)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_sweep()
+        self.display_results()
+        self.visualization(output_path)
+
+
+def main():
+    print("\n💡 Welcome to the Disease Diagnosis Simulation using Monte Carlo Method 💡\n")
+
+    try:
+        population_size = int(input("Please enter population size for the simulation (e.g., 10,000): "))
+        if population_size < 1000:
+            population_size = 10000
+            print("⚠️ Population size too small. Automatically adjusted to 10,000.")
+    except:
+        population_size = 10000
+        print("⚠️ Invalid input. Default population size set to 10,000.")
+
+    try:
+        disease_rate = float(input("Enter disease prevalence rate (e.g., 0.01 for 1%): "))
+        if not 0 < disease_rate < 1:
+            disease_rate = 0.01
+            print("⚠️ Invalid range. Default disease rate of 1% applied.")
+    except:
+        disease_rate = 0.01
+        print("⚠️ Invalid input. Default disease rate of 1% applied.")
+
+    try:
+        tpr = float(input("Enter True Positive Rate (e.g., 0.95): "))
+        fpr = float(input("Enter False Positive Rate (e.g., 0.05): "))
+        if not (0 <= tpr <= 1) or not (0 <= fpr <= 1):
+            raise ValueError
+    except:
+        tpr = 0.95
+        fpr = 0.05
+        print("⚠️ Invalid input. Default rates applied: TPR = 0.95, FPR = 0.05")
+
+    print("\n⏳ Running simulation... Please wait.\n")
+
+    app = MonteCarloAccuracyDisease(population_size=population_size,
+                                    disease_rate=disease_rate,
+                                    true_positive_rate=tpr,
+                                    false_positive_rate=fpr)
+
+    app.monte_carlo_accuracy_simulation()
+    app.display_results()
+    app.visualization()
+
+
+if __name__ == "__main__":
+    main()
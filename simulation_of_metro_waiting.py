@@ -1,115 +1,241 @@
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import matplotlib.lines as mlines
-
-"""
-🚇 Monte Carlo Simulation: Metro Station Waiting Time 🚇
-
-This simulation estimates the probability that two people arriving 
-randomly between 0 and 10 minutes at a metro station will NOT meet, 
-i.e., the time difference between them exceeds 5 minutes.
-
-Key Features:
-- Simulates random arrival times for two people.
-- Calculates how often the absolute time difference exceeds 5 minutes.
-- Visualizes arrival time pairs and highlights the meeting region.
-- Estimates the probability of not meeting (|A - B| > 5).
-- Computes error margin to understand statistical uncertainty.
-
-🎯 Expected Outcome:
-- Theoretically, the probability that two people do *not* meet 
-  (|A - B| > 5) is 25%.
-"""
-
-class MetroWaitSim:
-    def __init__(self, num_samples=100000):
-        self.num_samples = max(num_samples, 100000)  # at least 100,000
-        self.seed = 100
-        np.random.seed(self.seed)
-
-    def simulate(self):
-        self.arrival_a = np.random.uniform(0, 10, self.num_samples)
-        self.arrival_b = np.random.uniform(0, 10, self.num_samples)
-
-        time_diff = np.abs(self.arrival_a - self.arrival_b)
-        self.not_meeting = time_diff > 5
-        self.not_meet_prob = np.mean(self.not_meeting)
-
-        self.calculate_error_margin()
-
-    def calculate_error_margin(self, confidence=0.95):
-        z = 1.96 if confidence == 0.95 else 1.64
-        p = self.not_meet_prob
-        n = self.num_samples
-        self.error_margin = z * np.sqrt((p * (1 - p)) / n)
-
-    def display_result(self):
-        print("\n🚇 Monte Carlo Simulation: Metro Station Meeting Probability 🚇")
-        print(f"Total Simulations: {self.num_samples}")
-        print(f"\n❌ Probability that they do NOT meet (|A - B| > 5 min): {self.not_meet_prob:.4f}")
-        print(f"📏 Error Margin (95% confidence): ±{self.error_margin:.4f}")
-        print("\n📌 Note: As the number of samples increases, the result should converge to the theoretical value (≈ 0.25).")
-
-    def visualize(self):
-        fig, ax = plt.subplots(figsize=(12,8))
-        ax.scatter(self.arrival_a, self.arrival_b, 
-                   c=np.where(self.not_meeting, "red", "green"), 
-                   alpha=0.3, s=1)
-
-        x = np.linspace(0, 10, 1000)
-        y1 = x - 5  # B = A - 5
-        y2 = x + 5  # B = A + 5
-
-        ax.plot(x, y1, "k--", lw=1.5)
-        ax.plot(x, y2, "k--", lw=1.5)
-
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-
-        ax.set_xlabel("Arrival Time of Person A (min)", fontsize=12)
-        ax.set_ylabel("Arrival Time of Person B (min)", fontsize=12)
-
-        green_patch = mpatches.Patch(color="#a8f781", label="They meet (≤ 5 min)")
-        red_patch = mpatches.Patch(color="#ff9999", label="Do not meet (> 5 min)")
-        border_line = mlines.Line2D([], [], color="black", linestyle="--", linewidth=1.5, label="|A - B| = 5")
-
-        ax.legend(handles=[green_patch, red_patch, border_line], loc="upper left", frameon=True, facecolor="white", edgecolor="gray")
-
-        fig.suptitle(
-            "Monte Carlo Simulation: Probability of Metro Station Waiting Time",
-            fontsize=17, color="#393d47", weight="bold"
-        )
-
-        fig.text(
-            0.5, 0.05,
-            f"Theoretical Probability: ≈ 0.25 | Estimated Probability: {self.not_meet_prob:.6%} | Error Margin: {self.error_margin:.6f}",
-            ha="center", fontsize=12, color="#555555"
-        )
-        plt.grid(True)
-        plt.gca().set_axisbelow(True)
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
-        plt.show()
-
-    def run(self):
-        self.simulate()
-        self.display_result()
-        self.visualize()
-
-
-def main():
-    try:
-        user_input = int(input("Please enter number of simulations (minimum 100,000): "))
-        if user_input < 100000:
-            print("⚠️ Input adjusted to 100,000 for better accuracy.")
-            user_input = 100000
-    except:
-        print("⚠️ Invalid input detected. Defaulting to 100,000 simulations.")
-        user_input = 100000
-
-    app = MetroWaitSim(user_input)
-    app.run()
-
-
-if __name__ == "__main__":
-    main()
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.patches as mpatches
+import matplotlib.lines as mlines
+from figure_export import show_or_save
+from kernels import MeetingKernel
+from mc_engine import DEFAULT_CHUNK_SIZE, DEFAULT_PRECISION, check_precision, float_dtype
+from variance_reduction import make_accumulator
+from stratified import BOUNDARY, INSIDE, OUTSIDE, StratifiedEstimator
+
+"""
+🚇 Monte Carlo Simulation: Metro Station Waiting Time 🚇
+
+This simulation estimates the probability that two people arriving 
+randomly between 0 and 10 minutes at a metro station will NOT meet, 
+i.e., the time difference between them exceeds 5 minutes.
+
+Key Features:
+- Simulates random arrival times for two people.
+- Calculates how often the absolute time difference exceeds 5 minutes.
+- Visualizes arrival time pairs and highlights the meeting region.
+- Estimates the probability of not meeting (|A - B| > 5).
+- Computes error margin to understand statistical uncertainty.
+- Optionally uses a randomized Sobol/Halton sequence (see qmc.py) for near O(1/N) convergence.
+- Optionally uses antithetic or control variates (see variance_reduction.py) to cut the variance.
+- Optionally uses stratified sampling (see stratified.py) that only samples cells crossed by |A - B| = 5.
+- Optionally (chunk_size=...) simulates in chunks with a buffer-reusing kernel (see kernels.py):
+  no per-chunk allocations and bounded memory for any number of samples; only the first chunk is
+  kept for the plot.
+- Optionally (precision="single") draws the arrival times as float32 in that chunked mode, halving
+  the memory traffic; the count of pairs that do not meet stays an exact int64.
+
+🎯 Expected Outcome:
+- Theoretically, the probability that two people do *not* meet 
+  (|A - B| > 5) is 25%.
+"""
+
+class MetroWaitSim:
+    def __init__(self, num_samples=100000, sampler=None, variance_reduction=None, strata=None, chunk_size=None,
+                 precision=DEFAULT_PRECISION):
+        if sum(option is not None for option in (sampler, variance_reduction, strata, chunk_size)) > 1:
+            raise ValueError("Choose only one of sampler, variance_reduction, strata and chunk_size.")
+        if variance_reduction == "antithetic" and max(num_samples, 100000) % 2:
+            raise ValueError("Antithetic sampling draws mirrored pairs, so num_samples must be even.")
+        if check_precision(precision) != DEFAULT_PRECISION and any(option is not None for option in (sampler, variance_reduction, strata)):
+            raise ValueError("precision only applies to the plain and chunked runs, not to sampler, variance_reduction or strata.")
+
+        self.num_samples = max(num_samples, 100000)  # at least 100,000
+        self.seed = 100
+        self.sampler = sampler  # Optional QMCSampler (see qmc.py) replacing the random arrival times
+        self.variance_reduction = variance_reduction  # None, "antithetic" or "control"
+        self.strata = strata  # Optional number of strata per axis for stratified sampling
+        self.chunk_size = chunk_size  # Optional chunk size of the buffer-reusing kernel
+        self.precision = precision  # "single" runs the chunked kernel on float32 arrival times
+        self.standard_error = None  # Set by simulate_qmc, simulate_variance_reduced and simulate_stratified
+        self.variance_reduction_factor = None
+        np.random.seed(self.seed)
+
+    def simulate(self):
+        if self.sampler is not None:
+            self.simulate_qmc()
+            return
+        if self.variance_reduction is not None:
+            self.simulate_variance_reduced()
+            return
+        if self.strata is not None:
+            self.simulate_stratified()
+            return
+        if self.chunk_size is not None or self.precision != DEFAULT_PRECISION:
+            self.simulate_chunked()
+            return
+
+        self.arrival_a = np.random.uniform(0, 10, self.num_samples)
+        self.arrival_b = np.random.uniform(0, 10, self.num_samples)
+
+        time_diff = np.abs(self.arrival_a - self.arrival_b)
+        self.not_meeting = time_diff > 5
+        self.not_meet_prob = np.mean(self.not_meeting)
+
+        self.calculate_error_margin()
+
+    def simulate_chunked(self):
+        rng = np.random.default_rng(self.seed)
+        chunk_size = self.chunk_size or DEFAULT_CHUNK_SIZE
+        kernel = MeetingKernel(min(chunk_size, self.num_samples), window=10, max_gap=5, dtype=float_dtype(self.precision))
+        not_meeting_count = 0
+
+        for index, start in enumerate(range(0, self.num_samples, chunk_size)):
+            count, arrivals = kernel(rng, min(chunk_size, self.num_samples - start), keep_arrivals=index == 0)
+            not_meeting_count += count
+            if index == 0:
+                self.arrival_a, self.arrival_b = arrivals
+
+        # Arrival times of the first chunk, kept for plotting
+        self.not_meeting = np.abs(self.arrival_a - self.arrival_b) > 5
+        self.not_meet_prob = not_meeting_count / self.num_samples
+
+        self.calculate_error_margin()
+
+    def simulate_qmc(self):
+        not_meeting = lambda unit_points: np.abs(unit_points[:, 0] - unit_points[:, 1]) > 0.5  # 5 of 10 minutes
+        self.not_meet_prob, self.standard_error, unit_points = self.sampler.estimate(not_meeting, self.num_samples)
+
+        # Arrival times of the first chunk, kept for plotting
+        self.arrival_a = 10 * unit_points[:, 0]
+        self.arrival_b = 10 * unit_points[:, 1]
+        self.not_meeting = not_meeting(unit_points)
+
+        self.calculate_error_margin()
+
+    def simulate_variance_reduced(self):
+        rng = np.random.default_rng(self.seed)
+        accumulator = make_accumulator(self.variance_reduction, control_mean=10 / 3)  # E|A - B| = 10/3 min
+
+        if self.variance_reduction == "antithetic":
+            # Mirroring A's arrival (A -> 10 - A) moves a pair from one "not meeting" corner to the
+            # other diagonal's corners, so the two outcomes are negatively correlated
+            self.arrival_a = rng.uniform(0, 10, self.num_samples // 2)
+            self.arrival_b = rng.uniform(0, 10, self.num_samples // 2)
+            self.not_meeting = np.abs(self.arrival_a - self.arrival_b) > 5
+            accumulator.update(self.not_meeting, np.abs(10 - self.arrival_a - self.arrival_b) > 5)
+        else:
+            self.arrival_a = rng.uniform(0, 10, self.num_samples)
+            self.arrival_b = rng.uniform(0, 10, self.num_samples)
+            time_diff = np.abs(self.arrival_a - self.arrival_b)
+            self.not_meeting = time_diff > 5
+            accumulator.update(self.not_meeting, time_diff)
+
+        result = accumulator.result()
+        self.not_meet_prob = result.estimate
+        self.standard_error = result.standard_error
+        self.variance_reduction_factor = result.variance_reduction_factor
+        self.calculate_error_margin()
+
+    @staticmethod
+    def meeting_cell_status(a_lo, a_hi, b_lo, b_hi):
+        # A - B ranges over [a_lo - b_hi, a_hi - b_lo] inside a cell
+        diff_lo, diff_hi = a_lo - b_hi, a_hi - b_lo
+        never_meet = (diff_lo >= 5) | (diff_hi <= -5)
+        always_meet = (diff_lo >= -5) & (diff_hi <= 5)
+        return np.where(never_meet, INSIDE, np.where(always_meet, OUTSIDE, BOUNDARY))
+
+    def simulate_stratified(self):
+        estimator = StratifiedEstimator((0, 10, 0, 10), self.meeting_cell_status, lambda a, b: np.abs(a - b) > 5,
+                                        grid_size=self.strata, seed=self.seed)
+        result = estimator.estimate(self.num_samples)
+        self.not_meet_prob = result.estimate
+        self.standard_error = result.standard_error
+
+        # Arrival times of the boundary cells, kept for plotting
+        self.arrival_a = result.sample_points[:, 0]
+        self.arrival_b = result.sample_points[:, 1]
+        self.not_meeting = np.abs(self.arrival_a - self.arrival_b) > 5
+
+        self.calculate_error_margin()
+
+    def calculate_error_margin(self, confidence=0.95):
+        z = 1.96 if confidence == 0.95 else 1.64
+        if self.standard_error is not None:
+            # Those modes measure their own error; the binomial margin below only holds for plain draws
+            self.error_margin = z * self.standard_error
+            return
+        p = self.not_meet_prob
+        n = self.num_samples
+        self.error_margin = z * np.sqrt((p * (1 - p)) / n)
+
+    def display_result(self):
+        print("\n🚇 Monte Carlo Simulation: Metro Station Meeting Probability 🚇")
+        print(f"Total Simulations: {self.num_samples}")
+        print(f"\n❌ Probability that they do NOT meet (|A - B| > 5 min): {self.not_meet_prob:.4f}")
+        print(f"📏 Error Margin (95% confidence): ±{self.error_margin:.4f}")
+        if self.variance_reduction is not None:
+            print(f"📉 Variance Reduction Factor ({self.variance_reduction}): {self.variance_reduction_factor:.2f}x")
+        if self.sampler is not None:
+            print(f"🧮 QMC sampling ({self.sampler.method}, {self.sampler.replicates} replicates): {self.sampler.points_used(self.num_samples):,} points used")
+        if self.strata is not None:
+            print(f"🧩 Stratified sampling over a {self.strata}x{self.strata} grid (standard error {self.standard_error:.6f})")
+        print("\n📌 Note: As the number of samples increases, the result should converge to the theoretical value (≈ 0.25).")
+
+    def visualize(self, output_path=None):
+        fig, ax = plt.subplots(figsize=(12,8))
+        ax.scatter(self.arrival_a, self.arrival_b, 
+                   c=np.where(self.not_meeting, "red", "green"), 
+                   alpha=0.3, s=1)
+
+        x = np.linspace(0, 10, 1000)
+        y1 = x - 5  # B = A - 5
+        y2 = x + 5  # B = A + 5
+
+        ax.plot(x, y1, "k--", lw=1.5)
+        ax.plot(x, y2, "k--", lw=1.5)
+
+        ax.set_xlim(0, 10)
+        ax.set_ylim(0, 10)
+
+        ax.set_xlabel("Arrival Time of Person A (min)", fontsize=12)
+        ax.set_ylabel("Arrival Time of Person B (min)", fontsize=12)
+
+        green_patch = mpatches.Patch(color="#a8f781", label="They meet (≤ 5 min)")
+        red_patch = mpatches.Patch(color="#ff9999", label="Do not meet (> 5 min)")
+        border_line = mlines.Line2D([], [], color="black", linestyle="--", linewidth=1.5, label="|A - B| = 5")
+
+        ax.legend(handles=[green_patch, red_patch, border_line], loc="upper left", frameon=True, facecolor="white", edgecolor="gray")
+
+        fig.suptitle(
+            "Monte Carlo Simulation: Probability of Metro Station Waiting Time",
+            fontsize=17, color="#393d47", weight="bold"
+        )
+
+        fig.text(
+            0.5, 0.05,
+            f"Theoretical Probability: ≈ 0.25 | Estimated Probability: {self.not_meet_prob:.6%} | Error Margin: {self.error_margin:.6f}",
+            ha="center", fontsize=12, color="#555555"
+        )
+        plt.grid(True)
+        plt.gca().set_axisbelow(True)
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.simulate()
+        self.display_result()
+        self.visualize(output_path)
+
+
+def main():
+    try:
+        user_input = int(input("Please enter number of simulations (minimum 100,000): "))
+        if user_input < 100000:
+            print("⚠️ Input adjusted to 100,000 for better accuracy.")
+            user_input = 100000
+    except:
+        print("⚠️ Invalid input detected. Defaulting to 100,000 simulations.")
+        user_input = 100000
+
+    app = MetroWaitSim(user_input)
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,355 @@
-import numpy as np
-import matplotlib.pyplot as plt
-
-"""
-Monte Carlo simulation to estimate the value of π using random points.
-- Generates random points in a [-1,1] x [-1,1] square.
-- Counts how many points fall inside the unit circle.
-- Uses the ratio of inside points to total points to approximate π.
-- Visualizes the simulation results with a scatter plot.
-"""
-
-class MonteCarloPi:
-    def __init__(self, num_points=10000):
-        
-        self.num_points = num_points
-        self.inside_circle = 0  # Count of points inside the unit circle
-        self.points = None  # Store generated points
-        self.estimated_pi = 0  # Store estimated π value
-
-    def monte_carlo_pi(self):
-        
-        x = np.random.uniform(-1, 1, self.num_points)
-        y = np.random.uniform(-1, 1, self.num_points)
-        distances = np.sqrt(x**2 + y**2)
-        self.inside_circle = np.sum(distances <= 1)
-        self.points = (x, y)
-        self.estimated_pi = (self.inside_circle / self.num_points) * 4
-
-    def display_results(self):
-        
-        error = abs((self.estimated_pi - np.pi) / np.pi) * 100  # Error percentage
-        print(f"Estimated π: {self.estimated_pi:.6f}")
-        print(f"Actual π: {np.pi:.6f}")
-        print(f"Error: {error:.6f}%")
-
-    def visualization(self):
-        
-        x, y = self.points
-        inside = (x**2 + y**2) <= 1
-        fig = plt.figure(figsize=(15,8))
-        plt.scatter(x[inside], y[inside], color="#7aff83", s=1, label='Points Inside Circle')
-        plt.scatter(x[~inside], y[~inside], color="#7ecefc", s=1, label="Points Outside Circle")
-        circle = plt.Circle((0, 0), 1, color="black", fill=False, linewidth=2)
-        plt.gca().add_patch(circle)
-        plt.xlim(-1, 1)
-        plt.ylim(-1, 1)
-        plt.gca().set_aspect("equal", adjustable="datalim")
-        plt.title("Monte Carlo Simulation: Estimate π", fontsize=17, color="#393d47", weight="bold")
-        plt.legend()
-        plt.grid(True)
-        
-        # Add estimated π value and error percentage as text on the plot
-        fig.text(0.5, 0.02, f"Estimated π: {self.estimated_pi:.6f}\nActual π: {np.pi:.6f}\nError: {abs((self.estimated_pi - np.pi) / np.pi) * 100:.6f}%",
-                 fontsize=12, color="#393d47", ha="left")
-        
-        plt.show()
-
-    def run(self):
-        self.monte_carlo_pi()
-        self.display_results()
-        self.visualization()
-        
-
-def main():
-    try:
-        num_points= int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
-        if num_points < 100000:
-            num_points = 100000
-            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
-    except:
-        num_points = 100000
-        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
-    
-    app = MonteCarloPi(num_points=num_points)
-    app.run()
-
-if __name__ == "__main__":
-    main()
+import math
+
+import numpy as np
+import matplotlib.pyplot as plt
+from figure_export import show_or_save
+from kernels import CircleKernel
+from mc_engine import (DEFAULT_BIT_GENERATOR, DEFAULT_CHUNK_SIZE, DEFAULT_PRECISION, PRECISIONS, check_precision, chunk_rng,
+                       float_dtype, resolve_seed, run_counting_chunks)
+from variance_reduction import make_accumulator
+from stratified import BOUNDARY, INSIDE, OUTSIDE, StratifiedEstimator
+
+"""
+Monte Carlo simulation to estimate the value of π using random points.
+- Generates random points in a [-1,1] x [-1,1] square.
+- Counts how many points fall inside the unit circle.
+- Uses the ratio of inside points to total points to approximate π.
+- Visualizes the simulation results with a scatter plot.
+- Points are generated in chunks, counted by a buffer-reusing kernel (see kernels.py) that allocates
+  nothing per chunk (precision="single" halves its memory traffic), and with a ResultCache a run can be
+  extended to more points by simulating only the missing ones (the result equals a fresh run with the same seed).
+- With a QMCSampler (see qmc.py) the points come from a randomized Sobol/Halton sequence instead,
+  which converges close to O(1/N) and reports a standard error from independent replicates.
+- With variance_reduction="antithetic" or "control" (see variance_reduction.py) the estimate uses
+  mirrored point pairs or the known mean of the squared distance, and reports the factor saved.
+- With strata=<grid size> (see stratified.py) only the grid cells crossed by the circle are sampled;
+  cells entirely inside the circle are counted exactly.
+- With dimensions=d > 2 the volume of the unit d-ball is estimated and π is recovered from
+  V_d = π^(d/2) / Γ(d/2 + 1). The squared norm is accumulated one coordinate at a time in reused
+  float32/float64 buffers, so no (N x d) array is ever created.
+  * "cube": points uniform in [-1, 1]^d. The hit rate V_d / 2^d vanishes quickly (0.4% at d = 9).
+  * "ratio" (used for d > 8 by default): V_k = 2·V_(k-1)·P_k, where P_k is the probability that a point
+    uniform inside the (k-1)-ball, extended by a uniform coordinate t in [-1, 1], lies inside the k-ball.
+    Inside the (k-1)-ball the squared radius is distributed as U^(2/(k-1)), so each P_k needs only
+    two uniforms per sample and stays large (≈ 0.12 at d = 100).
+"""
+
+class MonteCarloPi:
+    def __init__(self, num_points=10000, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, sampler=None, variance_reduction=None, strata=None,
+                 dimensions=2, dtype=None, hypersphere_method="auto", bit_generator=DEFAULT_BIT_GENERATOR, precision=DEFAULT_PRECISION):
+        
+        if sum(option is not None for option in (cache, sampler, variance_reduction, strata)) > 1:
+            raise ValueError("Choose only one of cache, sampler, variance_reduction and strata.")
+        if variance_reduction == "antithetic" and (num_points % 2 or chunk_size % 2):
+            raise ValueError("Antithetic sampling draws mirrored pairs, so num_points and chunk_size must be even.")
+        if cache is not None and seed is None:
+            # An unseeded run draws fresh entropy, so its cache key would never be seen again
+            raise ValueError("A cache needs an explicit seed, otherwise no later run can reuse its entries.")
+        if sampler is not None and bit_generator != DEFAULT_BIT_GENERATOR:
+            raise ValueError("QMC points do not come from a bit generator; choose either sampler or bit_generator.")
+        if dimensions < 2:
+            raise ValueError("dimensions must be at least 2.")
+        if dimensions > 2 and any(option is not None for option in (cache, sampler, variance_reduction, strata)):
+            raise ValueError("The hypersphere mode (dimensions > 2) supports none of cache, sampler, variance_reduction and strata.")
+        precision = check_precision(precision)
+        if dtype is not None:
+            # dtype= predates the precision policy and still selects it
+            dtype_precision = next((name for name in PRECISIONS if float_dtype(name) == np.dtype(dtype)), None)
+            if dtype_precision is None:
+                raise ValueError(f"dtype={np.dtype(dtype).name} matches no precision policy; pass precision instead.")
+            if precision not in (DEFAULT_PRECISION, dtype_precision):
+                raise ValueError(f"dtype={np.dtype(dtype).name} contradicts precision={precision!r}; pass only precision.")
+            precision = dtype_precision
+        if hypersphere_method not in ("auto", "cube", "ratio"):
+            raise ValueError("hypersphere_method must be 'auto', 'cube' or 'ratio'.")
+
+        self.num_points = num_points
+        self.seed = resolve_seed(seed)
+        self.chunk_size = chunk_size
+        self.cache = cache  # Optional ResultCache holding the extendable accumulator state
+        self.sampler = sampler  # Optional QMCSampler replacing the pseudo-random points
+        self.variance_reduction = variance_reduction  # None, "antithetic" or "control"
+        self.strata = strata  # Optional number of strata per axis for stratified sampling
+        self.dimensions = dimensions
+        self.precision = precision  # "single" draws float32 points, halving the memory traffic of the chunk kernels
+        self.dtype = float_dtype(precision)
+        if hypersphere_method == "auto":
+            hypersphere_method = "cube" if dimensions <= 8 else "ratio"
+        self.hypersphere_method = hypersphere_method
+        self.bit_generator = bit_generator  # Name of the bit generator behind the pseudo-random chunks
+        self.ball_volumes = None  # Estimated volumes of the unit k-balls, k = 1..dimensions
+        self.ball_volume_errors = None
+        self.standard_error = None  # Set by the QMC, variance-reduced, stratified and hypersphere modes
+        self.variance_reduction_factor = None
+        self.inside_circle = 0  # Count of points inside the unit circle (None for variance-reduced and stratified runs)
+        self.points = None  # Store generated points (first chunk only, used for plotting)
+        self.circle_kernel = None  # Work buffers of the chunk kernel, allocated on first use
+        self.estimated_pi = 0  # Store estimated π value
+
+    def count_inside(self, rng, size, index):
+
+        if self.circle_kernel is None or len(self.circle_kernel.inside) < size:
+            self.circle_kernel = CircleKernel(max(size, min(self.chunk_size, self.num_points)), dtype=self.dtype)
+        inside, points = self.circle_kernel(rng, size, keep_points=index == 0)
+        if index == 0:
+            self.points = (points[:, 0], points[:, 1])
+        return inside
+
+    def monte_carlo_pi(self):
+        
+        if self.dimensions > 2:
+            self.monte_carlo_hypersphere()
+            return
+        if self.sampler is not None:
+            self.monte_carlo_pi_qmc()
+            return
+        if self.variance_reduction is not None:
+            self.monte_carlo_pi_variance_reduced()
+            return
+        if self.strata is not None:
+            self.monte_carlo_pi_stratified()
+            return
+
+        state = None
+        if self.cache is not None:
+            params = {"chunk_size": self.chunk_size}
+            if self.bit_generator != DEFAULT_BIT_GENERATOR:
+                params["bit_generator"] = self.bit_generator  # Keeps the keys of PCG64 runs unchanged
+            if self.dtype != np.float64:
+                params["dtype"] = self.dtype.name  # Keeps the keys of float64 runs unchanged
+            key = self.cache.make_key(self, params, self.seed, None)
+            state = self.cache.get(key)
+
+        new_state = run_counting_chunks(self.count_inside, self.seed, self.num_points, self.chunk_size, state, self.bit_generator)
+
+        if self.cache is not None and (state is None or new_state["sample_size"] > state["sample_size"]):
+            self.cache.put(key, new_state)
+
+        self.inside_circle = new_state["hits"]
+        self.estimated_pi = (self.inside_circle / self.num_points) * 4
+
+    def monte_carlo_pi_qmc(self):
+
+        inside = lambda unit_points: np.sum((2 * unit_points - 1)**2, axis=1) <= 1
+        ratio, standard_error, unit_points = self.sampler.estimate(inside, self.num_points)
+        points = 2 * unit_points - 1  # Map [0,1) x [0,1) onto the [-1,1] x [-1,1] square
+        self.points = (points[:, 0], points[:, 1])
+        self.inside_circle = round(ratio * self.sampler.points_used(self.num_points))  # Hits over all replicates
+        self.estimated_pi = ratio * 4
+        self.standard_error = standard_error * 4
+
+    def monte_carlo_pi_variance_reduced(self):
+
+        # Points in the unit square land inside the quarter circle with probability π/4
+        inside = lambda unit_points: np.sum(unit_points**2, axis=1) <= 1
+        accumulator = make_accumulator(self.variance_reduction, control_mean=2 / 3)  # E[x² + y²] = 1/3 + 1/3
+
+        for index, start in enumerate(range(0, self.num_points, self.chunk_size)):
+            size = min(self.chunk_size, self.num_points - start)
+            rng = chunk_rng(self.seed, index, self.bit_generator)
+
+            if self.variance_reduction == "antithetic":
+                unit_points = rng.random((size // 2, 2))  # Each point is paired with its mirror image
+                accumulator.update(inside(unit_points), inside(1 - unit_points))
+            else:
+                unit_points = rng.random((size, 2))
+                accumulator.update(inside(unit_points), np.sum(unit_points**2, axis=1))
+
+            if index == 0:
+                points = 2 * unit_points - 1
+                self.points = (points[:, 0], points[:, 1])
+
+        result = accumulator.result()
+        self.inside_circle = None  # The estimate is a weighted mean, not a count of points inside
+        self.estimated_pi = result.estimate * 4
+        self.standard_error = result.standard_error * 4
+        self.variance_reduction_factor = result.variance_reduction_factor
+
+    @staticmethod
+    def circle_cell_status(x_lo, x_hi, y_lo, y_hi):
+
+        # Squared distance from the origin to the nearest and farthest point of each cell
+        nearest = np.clip(0, x_lo, x_hi)**2 + np.clip(0, y_lo, y_hi)**2
+        farthest = np.maximum(x_lo**2, x_hi**2) + np.maximum(y_lo**2, y_hi**2)
+        return np.where(farthest <= 1, INSIDE, np.where(nearest >= 1, OUTSIDE, BOUNDARY))
+
+    def monte_carlo_pi_stratified(self):
+
+        estimator = StratifiedEstimator((-1, 1, -1, 1), self.circle_cell_status, lambda x, y: x**2 + y**2 <= 1,
+                                        grid_size=self.strata, seed=self.seed, chunk_size=self.chunk_size, bit_generator=self.bit_generator)
+        result = estimator.estimate(self.num_points)
+        self.points = (result.sample_points[:, 0], result.sample_points[:, 1])  # Boundary cells only
+        self.inside_circle = None  # Inside cells count by area, so there is no count of points inside
+        self.estimated_pi = result.estimate * 4
+        self.standard_error = result.standard_error * 4
+        self.stratified_result = result
+
+    def cube_ball_counts(self, rng, squared_norm, coordinate):
+
+        # Hits of the unit k-ball for every k <= d, adding one squared coordinate at a time in place
+        squared_norm[:] = 0
+        counts = np.empty(self.dimensions, dtype=np.int64)
+        for k in range(self.dimensions):
+            rng.random(out=coordinate, dtype=self.dtype)
+            coordinate *= 2
+            coordinate -= 1
+            np.square(coordinate, out=coordinate)
+            squared_norm += coordinate
+            counts[k] = np.count_nonzero(squared_norm <= 1)
+        return counts
+
+    def ratio_hits(self, rng, k, squared_radius, extra_coordinate):
+
+        # Squared radius of a point uniform inside the (k-1)-ball, plus a uniform extra coordinate
+        rng.random(out=squared_radius, dtype=self.dtype)
+        np.power(squared_radius, 2 / (k - 1), out=squared_radius)
+        rng.random(out=extra_coordinate, dtype=self.dtype)
+        np.square(extra_coordinate, out=extra_coordinate)
+        squared_radius += extra_coordinate
+        return np.count_nonzero(squared_radius <= 1)
+
+    def monte_carlo_hypersphere(self):
+
+        d = self.dimensions
+        buffer_size = min(self.chunk_size, self.num_points)
+        first = np.empty(buffer_size, dtype=self.dtype)  # Buffers are reused by every chunk
+        second = np.empty(buffer_size, dtype=self.dtype)
+        dims = np.arange(1, d + 1)
+
+        if self.hypersphere_method == "cube":
+            counts = np.zeros(d, dtype=np.int64)
+            for index, start in enumerate(range(0, self.num_points, self.chunk_size)):
+                size = min(self.chunk_size, self.num_points - start)
+                counts += self.cube_ball_counts(chunk_rng(self.seed, index, self.bit_generator), first[:size], second[:size])
+
+            p = counts / self.num_points
+            with np.errstate(divide="ignore", invalid="ignore"):
+                log_volumes = dims * np.log(2) + np.log(p)
+                relative_variance = (1 - p) / (self.num_points * p)
+        else:
+            samples = max(self.num_points // (d - 1), 1)  # The budget is shared by the d - 1 ratios
+            log_volumes = np.empty(d)
+            relative_variance = np.zeros(d)
+            log_volumes[0] = np.log(2)  # V_1 = 2 exactly
+            index = 0
+            for k in range(2, d + 1):
+                hits = 0
+                for start in range(0, samples, self.chunk_size):
+                    size = min(self.chunk_size, samples - start)
+                    hits += self.ratio_hits(chunk_rng(self.seed, index, self.bit_generator), k, first[:size], second[:size])
+                    index += 1
+                p_k = hits / samples
+                log_volumes[k - 1] = log_volumes[k - 2] + np.log(2 * p_k)
+                relative_variance[k - 1] = relative_variance[k - 2] + (1 - p_k) / (samples * p_k)
+
+        self.ball_volumes = np.exp(log_volumes)
+        self.ball_volume_errors = self.ball_volumes * np.sqrt(relative_variance)
+        self.ball_volume = self.ball_volumes[-1]
+
+        # π = (V_d · Γ(d/2 + 1))^(2/d), computed in log space because V_100 ≈ 1e-40
+        self.estimated_pi = np.exp(2 / d * (log_volumes[-1] + math.lgamma(d / 2 + 1)))
+        self.standard_error = self.estimated_pi * 2 / d * np.sqrt(relative_variance[-1])
+
+    @staticmethod
+    def exact_ball_volume(k):
+        log_gamma = np.vectorize(math.lgamma)(np.asarray(k) / 2 + 1)
+        return np.exp(np.asarray(k) / 2 * np.log(np.pi) - log_gamma)
+
+    def display_hypersphere_results(self):
+
+        d = self.dimensions
+        exact = self.exact_ball_volume(d)
+        print(f"Dimensions: {d} ({self.hypersphere_method} method, {self.dtype.name})")
+        print(f"Estimated volume of the unit {d}-ball: {self.ball_volume:.6e} ± {self.ball_volume_errors[-1]:.2e}")
+        print(f"Exact volume: {exact:.6e}")
+        print(f"Estimated π: {self.estimated_pi:.6f} ± {self.standard_error:.6f}")
+        print(f"Actual π: {np.pi:.6f}")
+        print(f"Error: {abs((self.estimated_pi - np.pi) / np.pi) * 100:.6f}%")
+
+    def visualize_hypersphere(self, output_path=None):
+
+        dims = np.arange(1, self.dimensions + 1)
+        fig, ax = plt.subplots(figsize=(15, 8))
+        ax.plot(dims, self.exact_ball_volume(dims), color="#7457b3", label="Exact Volume π^(k/2) / Γ(k/2 + 1)")
+        ax.errorbar(dims, self.ball_volumes, yerr=1.96 * self.ball_volume_errors, fmt="o", markersize=3,
+                    color="#7aff83", ecolor="#393d47", label="Monte Carlo Estimate (95% CI)")
+        ax.set_yscale("log")
+        ax.set_xlabel("Dimension k")
+        ax.set_ylabel("Volume of the Unit k-Ball")
+        ax.set_title(f"Monte Carlo Simulation: Volume of the Unit Ball up to {self.dimensions} Dimensions",
+                     fontsize=17, color="#393d47", weight="bold")
+        ax.legend()
+        ax.grid(True)
+        fig.text(0.5, 0.02, f"Estimated π: {self.estimated_pi:.6f} ± {self.standard_error:.6f}   Actual π: {np.pi:.6f}",
+                 fontsize=12, color="#393d47", ha="center")
+        show_or_save(fig, output_path)
+
+    def display_results(self):
+        
+        if self.dimensions > 2:
+            self.display_hypersphere_results()
+            return
+        error = abs((self.estimated_pi - np.pi) / np.pi) * 100  # Error percentage
+        print(f"Estimated π: {self.estimated_pi:.6f}")
+        print(f"Actual π: {np.pi:.6f}")
+        print(f"Error: {error:.6f}%")
+        if self.sampler is not None:
+            print(f"Standard Error ({self.sampler.method}, {self.sampler.replicates} replicates, {self.sampler.points_used(self.num_points):,} points): "
+                  f"{self.standard_error:.8f}")
+        if self.variance_reduction is not None:
+            print(f"Standard Error ({self.variance_reduction}): {self.standard_error:.8f}")
+            print(f"Variance Reduction Factor: {self.variance_reduction_factor:.2f}x")
+        if self.strata is not None:
+            result = self.stratified_result
+            print(f"Standard Error (stratified, {result.boundary_cells} of {result.total_cells} cells sampled): {self.standard_error:.8f}")
+
+    def visualization(self, output_path=None):
+        
+        if self.dimensions > 2:
+            self.visualize_hypersphere(output_path)
+            return
+        if self.points is None:
+            # Extended runs skip the first chunk, so redraw it from its own stream for plotting
+            self.count_inside(chunk_rng(self.seed, 0, self.bit_generator), min(self.num_points, self.chunk_size), 0)
+
+        x, y = self.points
+        inside = (x**2 + y**2) <= 1
+        fig = plt.figure(figsize=(15,8))
+        plt.scatter(x[inside], y[inside], color="#7aff83", s=1, label='Points Inside Circle')
+        plt.scatter(x[~inside], y[~inside], color="#7ecefc", s=1, label="Points Outside Circle")
+        circle = plt.Circle((0, 0), 1, color="black", fill=False, linewidth=2)
+        plt.gca().add_patch(circle)
+        plt.xlim(-1, 1)
+        plt.ylim(-1, 1)
+        plt.gca().set_aspect("equal", adjustable="datalim")
+        plt.title("Monte Carlo Simulation: Estimate π", fontsize=17, color="#393d47", weight="bold")
+        plt.legend()
+        plt.grid(True)
+        
+        # Add estimated π value and error percentage as text on the plot
+        fig.text(0.5, 0.02, f"Estimated π: {self.estimated_pi:.6f}\nActual π: {np.pi:.6f}\nError: {abs((self.estimated_pi - np.pi) / np.pi) * 100:.6f}%",
+                 fontsize=12, color="#393d47", ha="left")
+        
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_pi()
+        self.display_results()
+        self.visualization(output_path)
+        
+
+def main():
+    try:
+        num_points= int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
+        if num_points < 100000:
+            num_points = 100000
+            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
+    except:
+        num_points = 100000
+        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
+    
+    app = MonteCarloPi(num_points=num_points)
+    app.run()
+
+if __name__ == "__main__":
+    main()
@@ -1,116 +1,710 @@
-import numpy as np
-import matplotlib.pyplot as plt
-
-"""
-📈 Monte Carlo Trade Market Simulation 📈
-
-Simulates random stock price changes over 30 days using normally distributed daily returns.
-Calculates the probability of reaching a profit (take-profit) or a loss (stop-loss) threshold 
-before the month ends. Includes visualization of the final outcomes.
-
-Key Features:
-- Uses daily returns with Gaussian distribution (mean = 0.05%, std = 1%)
-- Simulates 30-day price evolution for each run
-- Applies stop-loss and take-profit exit rules
-- Calculates probability of profit
-- Visualizes outcome distribution
-
-Author: 💕Your Favorite AI Assistant
-"""
-
-
-class MonteCarloTradeMarket:
-
-    def __init__(self, starting_price, take_profit_price, stop_loss_price, rep_num):
-        self.starting_price = starting_price
-        self.take_profit_price = take_profit_price
-        self.stop_loss_price = stop_loss_price
-        self.rep_num = rep_num
-        self.all_monthly_profit = []
-        self.probability = 0
-
-    def monte_carlo_trade(self):
-        np.random.seed(100)
-        
-        for _ in range(self.rep_num):
-            price = self.starting_price
-            success = None
-
-            for _ in range(30):
-                daily_return = np.random.normal(loc=0.0005, scale=0.01)
-                price *= (1 + daily_return)
-
-                if price >= self.take_profit_price:
-                    success = True  # Take-profit triggered
-                    break
-                elif price <= self.stop_loss_price:
-                    success = False  # Stop-loss triggered
-                    break
-
-            # If neither stop-loss nor take-profit was hit after 30 days
-            if success is None:
-                success = price > self.starting_price
-
-            self.all_monthly_profit.append(success)
-
-        # Calculate probability of making a profit
-        self.probability = np.mean(self.all_monthly_profit)
-
-    def display_results(self):
-        total_success = sum(self.all_monthly_profit)
-        total_failures = self.rep_num - total_success
-
-        print("\n📊 Monte Carlo Trading Simulation Results 📊")
-        print(f"Total Simulations      : {self.rep_num}")
-        print(f"✅ Profitable Outcomes : {total_success}")
-        print(f"❌ Losing Outcomes     : {total_failures}")
-        print(f"📈 Probability of Profit: {self.probability:.4f} ({self.probability * 100:.2f}%)")
-
-    def visualization(self):
-        # Bar chart of outcomes
-        labels = ['Profit', 'Loss']
-        counts = [sum(self.all_monthly_profit), self.rep_num - sum(self.all_monthly_profit)]
-        colors = ["#f6be06", "#370560"]
-
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.bar(labels, counts, color=colors)
-
-        for i, count in enumerate(counts):
-            ax.text(i, count + self.rep_num * 0.01, f"{count}", ha='center', fontsize=12)
-
-        ax.set_title("Monte Carlo Simulation: Trading Outcome Distribution Over One Month", fontsize=17, color="#393d47")
-        ax.set_ylabel("Count", fontsize=12)
-        ax.set_axisbelow(True)
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.5, hspace=0.4)
-        plt.show()
-
-        plt.show()
-
-    def run(self):
-        self.monte_carlo_trade()
-        self.display_results()
-        self.visualization()
-
-
-def main():
-    try:
-        rep_num = int(input("🔢 Enter number of simulations (minimum 100,000 recommended): "))
-        if rep_num < 100_000:
-            print("⚠️ Too low! Setting number of simulations to 100,000.")
-            rep_num = 100_000
-    except:
-        print("⚠️ Invalid input. Using default value: 100,000 simulations.")
-        rep_num = 100_000
-
-    app = MonteCarloTradeMarket(
-        starting_price=100,
-        take_profit_price=110,  # +10%
-        stop_loss_price=95,     # -5%
-        rep_num=rep_num
-    )
-
-    app.run()
-
-
-if __name__ == "__main__":
-    main()
+import hashlib
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from figure_export import show_or_save
+from mc_engine import DEFAULT_BIT_GENERATOR, make_rng
+from variance_reduction import make_accumulator
+from mlmc import run_mlmc
+from streaming_stats import StreamingHistogram, conditional_value_at_risk, value_at_risk
+
+"""
+📈 Monte Carlo Trade Market Simulation 📈
+
+Simulates random stock price changes over 30 days using normally distributed daily returns.
+Calculates the probability of reaching a profit (take-profit) or a loss (stop-loss) threshold 
+before the month ends. Includes visualization of the final outcomes.
+
+The horizon (`days`) and the number of price steps per day (`steps_per_day`) are configurable.
+Checking the exit rules only at the simulated steps misses the barrier crossings that happen between
+them, so coarse grids underestimate barrier hits. With `barrier_correction=True` each step is treated
+as a Brownian bridge in log price: the path crosses a barrier h between log prices a and b with
+probability exp(-2 (h - a)(h - b) / (σ² Δt)), which a uniform draw per step and barrier decides.
+A coarse grid with the correction then matches the hit probabilities of a far finer grid.
+
+Key Features:
+- Uses daily returns with Gaussian distribution (mean = 0.05%, std = 1%)
+- Simulates 30-day price evolution for each run, in vectorized chunks of paths
+- Applies stop-loss and take-profit exit rules
+- Calculates probability of profit
+- Visualizes outcome distribution
+- Streams the P&L at exit and the exit day into mergeable histograms (see streaming_stats.py),
+  giving Value at Risk and expected shortfall (CVaR) at 95% / 99% with bounded memory
+- Optional checkpointing, so very long runs can be resumed after a crash (see checkpoint.py)
+- Optional antithetic or control variates (see variance_reduction.py) for tighter estimates
+- Optional multilevel Monte Carlo (see mlmc.py) for the continuously monitored barriers at a target RMSE
+- `MonteCarloTradeSweep`: a grid of take-profit / stop-loss prices evaluated on the same paths
+  (common random numbers), with paired-difference confidence intervals between combinations
+- `MonteCarloPortfolio`: hundreds of correlated assets with per-asset and portfolio-level
+  take-profit / stop-loss levels, simulated in memory-bounded chunks
+
+Author: 💕Your Favorite AI Assistant
+"""
+
+
+class PricePathModel:
+    def __init__(self, starting_price, rep_num, seed=100, chunk_size=100_000, days=30, steps_per_day=1,
+                 barrier_correction=False, bit_generator=DEFAULT_BIT_GENERATOR):
+        """
+        Return-path model shared by the single exit pair and the sweep over a grid of exit levels.
+        """
+        self.starting_price = starting_price
+        self.rep_num = rep_num
+        self.seed = seed
+        self.bit_generator = bit_generator  # Name of the bit generator (see mc_engine.py)
+        self.chunk_size = chunk_size  # Paths simulated together; bounds memory to chunk_size x num_steps returns
+        self.days = days
+        self.steps_per_day = steps_per_day
+        self.num_steps = days * steps_per_day
+        # Daily returns have mean 0.05% and std 1%; a step of 1/steps_per_day day scales both accordingly
+        self.step_mean = 0.0005 / steps_per_day
+        self.step_std = 0.01 / np.sqrt(steps_per_day)
+        self.barrier_correction = barrier_correction
+
+    def bridge_crossing_probability(self, log_prices, log_barrier, step_std=None):
+        """
+        Probability that the log price crosses the barrier within each step, given the log prices
+        at both ends of the step (1 where an end point is already on the other side).
+        """
+        step_std = self.step_std if step_std is None else step_std
+        previous = np.empty_like(log_prices)
+        previous[:, 0] = np.log(self.starting_price)
+        previous[:, 1:] = log_prices[:, :-1]
+        # Distances to the barrier, positive while the path is on the starting side of it
+        side = 1 if log_barrier > np.log(self.starting_price) else -1
+        distance_before = np.maximum(side * (log_barrier - previous), 0)
+        distance_after = np.maximum(side * (log_barrier - log_prices), 0)
+        return np.exp(-2 * distance_before * distance_after / step_std**2)
+
+
+class MonteCarloTradeMarket(PricePathModel):
+
+    checkpoint_method = "monte_carlo_trade"
+
+    def __init__(self, starting_price, take_profit_price, stop_loss_price, rep_num, seed=100, chunk_size=100_000, checkpoint=None, variance_reduction=None,
+                 days=30, steps_per_day=1, barrier_correction=False, mlmc_rmse=None, bit_generator=DEFAULT_BIT_GENERATOR):
+        if checkpoint is not None and (variance_reduction is not None or mlmc_rmse is not None):
+            raise ValueError("Checkpointing is only supported for plain sampling runs.")
+        if variance_reduction is not None and mlmc_rmse is not None:
+            raise ValueError("Choose either variance reduction or multilevel Monte Carlo, not both.")
+        if variance_reduction == "antithetic" and (rep_num % 2 or chunk_size % 2):
+            raise ValueError("Antithetic sampling draws mirrored pairs, so rep_num and chunk_size must be even.")
+
+        super().__init__(starting_price, rep_num, seed=seed, chunk_size=chunk_size, days=days, steps_per_day=steps_per_day,
+                         barrier_correction=barrier_correction, bit_generator=bit_generator)
+        self.take_profit_price = take_profit_price
+        self.stop_loss_price = stop_loss_price
+        self.mlmc_rmse = mlmc_rmse  # Target RMSE of the multilevel estimator (optional)
+        self.mlmc_result = None
+        self.checkpoint = checkpoint  # Optional Checkpointer for long runs
+        self.variance_reduction = variance_reduction  # None, "antithetic" or "control"
+        self.standard_error = None
+        self.variance_reduction_factor = None
+        self.profit_count = 0
+        self.probability = 0
+        self.pnl_histogram = self.new_pnl_histogram()
+        self.exit_step_counts = np.zeros(self.num_steps + 1, dtype=np.int64)  # Last slot: held to the end
+
+    def new_pnl_histogram(self):
+        # Bins of 1/10,000 of the starting price, over ±50% of it (outliers go to the overflow bins)
+        return StreamingHistogram(-0.5 * self.starting_price, 0.5 * self.starting_price, bins=10_000)
+
+    def checkpoint_params(self):
+        return {
+            "starting_price": self.starting_price,
+            "take_profit_price": self.take_profit_price,
+            "stop_loss_price": self.stop_loss_price,
+            "rep_num": self.rep_num,
+            "seed": self.seed,
+            "chunk_size": self.chunk_size,
+            "days": self.days,
+            "steps_per_day": self.steps_per_day,
+            "barrier_correction": self.barrier_correction,
+            "bit_generator": self.bit_generator,
+        }
+
+    def simulate_chunk(self, rng, size):
+        step_returns = rng.normal(loc=self.step_mean, scale=self.step_std, size=(size, self.num_steps))
+        profit, exit_step, exit_price = self.path_exits(step_returns, rng)
+        self.pnl_histogram.update(exit_price - self.starting_price)
+        self.exit_step_counts += np.bincount(exit_step, minlength=self.num_steps + 1)
+        return np.count_nonzero(profit)
+
+    def path_outcomes(self, step_returns, rng=None):
+        """
+        Returns True for every path (row of step returns) that ends in profit.
+        The Brownian-bridge correction needs `rng` for its crossing draws.
+        """
+        return self.path_exits(step_returns, rng)[0]
+
+    def path_exits(self, step_returns, rng=None):
+        """
+        Returns, for every path, whether it ends in profit, the step on which the position is closed
+        (num_steps if it is held to the end) and the price it is closed at.
+        """
+        prices = self.starting_price * np.cumprod(1 + step_returns, axis=1)
+
+        if self.barrier_correction:
+            log_prices = np.log(prices)
+            take_profit_probability = self.bridge_crossing_probability(log_prices, np.log(self.take_profit_price))
+            stop_loss_probability = self.bridge_crossing_probability(log_prices, np.log(self.stop_loss_price))
+            take_profit = rng.random(prices.shape) < take_profit_probability
+            stop_loss = rng.random(prices.shape) < stop_loss_probability
+        else:
+            take_profit = prices >= self.take_profit_price
+            stop_loss = prices <= self.stop_loss_price
+
+        # First step on which each exit rule triggers (num_steps means it never did)
+        take_profit_day = np.where(take_profit.any(axis=1), take_profit.argmax(axis=1), self.num_steps)
+        stop_loss_day = np.where(stop_loss.any(axis=1), stop_loss.argmax(axis=1), self.num_steps)
+        take_profit_first = take_profit_day < stop_loss_day
+
+        if self.barrier_correction:
+            # Both barriers may be crossed within the same step; the more likely crossing counts as the first
+            both = (take_profit_day == stop_loss_day) & (take_profit_day < self.num_steps)
+            rows = np.flatnonzero(both)
+            steps = take_profit_day[rows]
+            take_profit_first[rows] = take_profit_probability[rows, steps] >= stop_loss_probability[rows, steps]
+
+        # If neither stop-loss nor take-profit was hit by the end of the horizon, the final price decides
+        held = (take_profit_day == self.num_steps) & (stop_loss_day == self.num_steps)
+        profit = np.where(held, prices[:, -1] > self.starting_price, take_profit_first)
+
+        exit_step = np.where(take_profit_first, take_profit_day, stop_loss_day)
+        if self.barrier_correction:
+            # A crossing between steps fills exactly at the barrier
+            exit_price = np.where(take_profit_first, self.take_profit_price, self.stop_loss_price)
+        else:
+            exit_price = prices[np.arange(len(prices)), np.minimum(exit_step, self.num_steps - 1)]
+        exit_price = np.where(held, prices[:, -1], exit_price)
+        return profit, exit_step, exit_price
+
+    def conditional_profit(self, step_returns, step_std):
+        """
+        Probability of ending in profit given the simulated steps. The barrier crossings between
+        steps are integrated out with the Brownian-bridge probabilities instead of being drawn, which
+        makes the payoff smooth in the path and keeps fine/coarse MLMC differences small.
+        """
+        prices = self.starting_price * np.cumprod(1 + step_returns, axis=1)
+        log_prices = np.log(prices)
+        take_profit = self.bridge_crossing_probability(log_prices, np.log(self.take_profit_price), step_std)
+        stop_loss = self.bridge_crossing_probability(log_prices, np.log(self.stop_loss_price), step_std)
+
+        # Exit in profit within a step; if both barriers are crossed, the more likely one counts (as in path_outcomes)
+        profit_exit = take_profit * (1 - stop_loss) + take_profit * stop_loss * (take_profit >= stop_loss)
+        survival = np.cumprod((1 - take_profit) * (1 - stop_loss), axis=1)
+        survival_before = np.hstack([np.ones((len(prices), 1)), survival[:, :-1]])
+        return np.sum(survival_before * profit_exit, axis=1) + survival[:, -1] * (prices[:, -1] > self.starting_price)
+
+    def mlmc_level(self, level, num_samples, rng):
+        """
+        MLMC level function: level l uses 2^l steps per day, and its correction is computed from the
+        same Gaussian increments on the fine grid and on the coarse grid (pairs of fine steps summed).
+        """
+        fine_steps_per_day = 2**level
+        fine_steps = self.days * fine_steps_per_day
+        fine_mean = 0.0005 / fine_steps_per_day
+        fine_std = 0.01 / np.sqrt(fine_steps_per_day)
+        chunk = max(1, self.chunk_size * self.days // fine_steps)  # Same number of increments per chunk on every level
+
+        sums = np.zeros(4)
+        for start in range(0, num_samples, chunk):
+            shocks = rng.standard_normal((min(chunk, num_samples - start), fine_steps))
+            fine = self.conditional_profit(fine_mean + fine_std * shocks, fine_std)
+            if level == 0:
+                difference = fine
+            else:
+                coarse_shocks = (shocks[:, 0::2] + shocks[:, 1::2]) / np.sqrt(2)
+                coarse = self.conditional_profit(2 * fine_mean + np.sqrt(2) * fine_std * coarse_shocks, np.sqrt(2) * fine_std)
+                difference = fine - coarse
+            sums += [difference.sum(), difference @ difference, fine.sum(), fine @ fine]
+
+        cost = num_samples * fine_steps * (1.5 if level > 0 else 1)  # The coarse partner path costs half a fine one
+        return sums, cost
+
+    def monte_carlo_trade_mlmc(self):
+        # With the bridge-corrected payoff the bias of a level falls like its step size (weak order 1)
+        self.mlmc_result = run_mlmc(self.mlmc_level, self.mlmc_rmse, seed=self.seed, alpha=1, bit_generator=self.bit_generator)
+        self.probability = self.mlmc_result.estimate
+        self.profit_count = None  # No rep_num paths were simulated, only the levels' samples
+        self.standard_error = self.mlmc_result.rmse
+
+    def monte_carlo_trade(self, resume_from=None):
+        if self.mlmc_rmse is not None:
+            self.monte_carlo_trade_mlmc()
+            return
+        if self.variance_reduction is not None:
+            self.monte_carlo_trade_variance_reduced()
+            return
+
+        rng = make_rng(self.seed, self.bit_generator)
+        completed = 0
+        self.profit_count = 0
+        self.pnl_histogram = self.new_pnl_histogram()
+        self.exit_step_counts = np.zeros(self.num_steps + 1, dtype=np.int64)
+
+        if resume_from is not None:
+            rng.bit_generator.state = resume_from["rng_state"]
+            completed = resume_from["completed"]
+            self.profit_count = resume_from["accumulators"]["profit_count"]
+            self.pnl_histogram = resume_from["accumulators"]["pnl_histogram"]
+            self.exit_step_counts = resume_from["accumulators"]["exit_step_counts"]
+
+        while completed < self.rep_num:
+            size = min(self.chunk_size, self.rep_num - completed)
+            self.profit_count += self.simulate_chunk(rng, size)
+            completed += size
+
+            if self.checkpoint is not None and completed < self.rep_num:
+                accumulators = {"profit_count": self.profit_count, "pnl_histogram": self.pnl_histogram,
+                                "exit_step_counts": self.exit_step_counts}
+                self.checkpoint.maybe_save(self, completed, accumulators, rng)
+
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+
+        # Calculate probability of making a profit
+        self.probability = self.profit_count / self.rep_num
+
+    def monte_carlo_trade_variance_reduced(self):
+        rng = make_rng(self.seed, self.bit_generator)
+        # Control variate: the untruncated gross return, whose mean is exactly (1 + mean step return)^steps
+        accumulator = make_accumulator(self.variance_reduction, control_mean=(1 + self.step_mean) ** self.num_steps)
+        completed = 0
+
+        while completed < self.rep_num:
+            size = min(self.chunk_size, self.rep_num - completed)
+            if self.variance_reduction == "antithetic":
+                # Each path is paired with the path whose shocks are negated
+                shocks = rng.standard_normal(size=(size // 2, self.num_steps))
+                accumulator.update(self.path_outcomes(self.step_mean + self.step_std * shocks, rng),
+                                   self.path_outcomes(self.step_mean - self.step_std * shocks, rng))
+            else:
+                step_returns = rng.normal(loc=self.step_mean, scale=self.step_std, size=(size, self.num_steps))
+                accumulator.update(self.path_outcomes(step_returns, rng), np.prod(1 + step_returns, axis=1))
+            completed += size
+
+        result = accumulator.result()
+        self.probability = result.estimate
+        self.profit_count = None  # The estimate is corrected by the pairs / control, not a count of profitable paths
+        self.standard_error = result.standard_error
+        self.variance_reduction_factor = result.variance_reduction_factor
+
+    def display_results(self):
+        print("\n📊 Monte Carlo Trading Simulation Results 📊")
+        if self.mlmc_result is None:
+            print(f"Total Simulations      : {self.rep_num}")
+        print(f"⏱️ Horizon              : {self.days} days x {self.steps_per_day} steps"
+              + (" (Brownian-bridge barrier correction)" if self.barrier_correction else ""))
+        if self.profit_count is not None:
+            print(f"✅ Profitable Outcomes : {self.profit_count}")
+            print(f"❌ Losing Outcomes     : {self.rep_num - self.profit_count}")
+            print(f"📈 Probability of Profit: {self.probability:.4f} ({self.probability * 100:.2f}%)")
+        else:
+            error_name = "RMSE" if self.mlmc_result is not None else "standard error"
+            print(f"📈 Probability of Profit: {self.probability:.4f} ± {self.standard_error:.6f} ({error_name})")
+        if self.variance_reduction is not None:
+            print(f"📉 Variance Reduction ({self.variance_reduction}): {self.variance_reduction_factor:.2f}x")
+        if self.pnl_histogram.count > 0:
+            print(f"💰 Mean P&L at Exit      : {self.pnl_histogram.mean():+.4f}")
+            for confidence in (0.95, 0.99):
+                print(f"⚠️ VaR / CVaR ({confidence:.0%})    : {value_at_risk(self.pnl_histogram, confidence):.4f} / "
+                      f"{conditional_value_at_risk(self.pnl_histogram, confidence):.4f}")
+            held_share = self.exit_step_counts[-1] / self.rep_num
+            print(f"📅 Held to the End       : {held_share:.4f}")
+        if self.mlmc_result is not None:
+            result = self.mlmc_result
+            print(f"🪜 Multilevel Monte Carlo: {result.levels + 1} levels, RMSE {result.rmse:.6f} (target {result.target_rmse})")
+            for level, samples in enumerate(result.samples):
+                print(f"   Level {level} ({self.days * 2**level} steps): {samples} samples, "
+                      f"mean {result.level_means[level]:+.6f}, variance {result.level_variances[level]:.3e}")
+            print(f"💰 Total Cost: {result.total_cost:.3e} path steps (plain Monte Carlo: {result.plain_cost:.3e})")
+
+    def visualization(self, output_path=None):
+        # Bar chart of outcomes: counts of simulated paths, or the estimated shares (± 1.96 errors)
+        # for variance-reduced and multilevel runs, which have no such counts
+        labels = ['Profit', 'Loss']
+        if self.profit_count is not None:
+            counts = [self.profit_count, self.rep_num - self.profit_count]
+        else:
+            counts = [self.probability, 1 - self.probability]
+        colors = ["#f6be06", "#370560"]
+
+        # The P&L and exit-day histograms are only streamed by plain sampling runs
+        with_distributions = self.pnl_histogram.count > 0
+        if with_distributions:
+            fig, (ax, ax_pnl, ax_exit) = plt.subplots(1, 3, figsize=(20, 6))
+        else:
+            fig, ax = plt.subplots(figsize=(8, 6))
+        if self.profit_count is not None:
+            ax.bar(labels, counts, color=colors)
+            for i, count in enumerate(counts):
+                ax.text(i, count + self.rep_num * 0.01, f"{count}", ha='center', fontsize=12)
+            ax.set_ylabel("Count", fontsize=12)
+        else:
+            ax.bar(labels, counts, yerr=1.96 * self.standard_error, capsize=8, color=colors)
+            for i, share in enumerate(counts):
+                ax.text(i, share + 0.02, f"{share:.4f}", ha='center', fontsize=12)
+            ax.set_ylabel("Estimated Probability", fontsize=12)
+        ax.set_axisbelow(True)
+
+        if with_distributions:
+            # Merge neighbouring fine bins into about 100 bars over the observed range
+            centers, bin_counts = self.pnl_histogram.bin_centers_and_counts()
+            used = np.flatnonzero(bin_counts)
+            group = max(1, (used[-1] - used[0] + 1) // 100) if len(used) else 1
+            start = used[0] if len(used) else 0
+            grouped = np.add.reduceat(bin_counts[start:], np.arange(0, len(bin_counts) - start, group))
+            ax_pnl.bar(centers[start::group][:len(grouped)], grouped, width=group * self.pnl_histogram.width, color="#f6be06")
+            for confidence, style in ((0.95, "--"), (0.99, ":")):
+                ax_pnl.axvline(-value_at_risk(self.pnl_histogram, confidence), color="#370560", linestyle=style,
+                               label=f"VaR {confidence:.0%}")
+            ax_pnl.set_xlim(self.pnl_histogram.minimum, self.pnl_histogram.maximum)
+            ax_pnl.set_title("P&L at Exit", fontsize=14, color="#393d47")
+            ax_pnl.set_xlabel("Exit Price - Starting Price", fontsize=12)
+            ax_pnl.legend()
+
+            exit_days = np.arange(self.num_steps + 1) / self.steps_per_day
+            ax_exit.bar(exit_days[:-1], self.exit_step_counts[:-1], width=1 / self.steps_per_day, color="#370560", label="Exit on barrier")
+            ax_exit.bar(exit_days[-1], self.exit_step_counts[-1], width=1 / self.steps_per_day, color="#f6be06", label="Held to the end")
+            ax_exit.set_title("Exit Day", fontsize=14, color="#393d47")
+            ax_exit.set_xlabel("Day", fontsize=12)
+            ax_exit.legend()
+
+        fig.suptitle(f"Monte Carlo Simulation: Trading Outcome Distribution Over {self.days} Days", fontsize=17, color="#393d47")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.2, top=0.85, wspace=0.3, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_trade()
+        self.display_results()
+        self.visualization(output_path)
+
+
+class MonteCarloTradeSweep(PricePathModel):
+    def __init__(self, starting_price, take_profit_prices, stop_loss_prices, rep_num, seed=100, chunk_size=100_000,
+                 days=30, steps_per_day=1, barrier_correction=False, baseline=(0, 0), bit_generator=DEFAULT_BIT_GENERATOR):
+        """
+        Every chunk of return paths is simulated once and all take-profit / stop-loss combinations are
+        evaluated on it, so one set of random numbers serves the whole grid and the differences between
+        combinations are not swamped by independent sampling noise.
+
+        :param take_profit_prices: Take-profit levels (rows of the result grid)
+        :param stop_loss_prices: Stop-loss levels (columns of the result grid)
+        :param baseline: (row, column) of the combination the others are compared with
+        """
+        self.take_profit_prices = np.asarray(take_profit_prices, dtype=np.float64)
+        self.stop_loss_prices = np.asarray(stop_loss_prices, dtype=np.float64)
+        if np.any(self.take_profit_prices <= starting_price) or np.any(self.stop_loss_prices >= starting_price):
+            raise ValueError("Take-profit prices must be above and stop-loss prices below the starting price.")
+
+        super().__init__(starting_price, rep_num, seed=seed, chunk_size=chunk_size, days=days, steps_per_day=steps_per_day,
+                         barrier_correction=barrier_correction, bit_generator=bit_generator)
+        self.baseline = baseline
+        self.grid_shape = (len(self.take_profit_prices), len(self.stop_loss_prices))
+        num_cells = self.grid_shape[0] * self.grid_shape[1]
+        self.joint_counts = np.zeros((num_cells, num_cells))  # Paths in profit under both combinations
+
+    def first_passages(self, prices, levels, log_prices=None, draws=None):
+        """
+        First step at which the path reaches each barrier level (num_steps if never), and the
+        crossing probability on that step (1 for crossings observed at a step).
+        """
+        days = np.empty((len(prices), len(levels)), dtype=np.int64)
+        probabilities = np.ones((len(prices), len(levels)))
+        rows = np.arange(len(prices))
+        for i, level in enumerate(levels):
+            if draws is None:
+                hits = prices >= level if level > self.starting_price else prices <= level
+            else:
+                # Brownian-bridge crossings; the same draws for every level keep the sweep coupled
+                probability = self.bridge_crossing_probability(log_prices, np.log(level))
+                hits = draws < probability
+            days[:, i] = np.where(hits.any(axis=1), hits.argmax(axis=1), self.num_steps)
+            if draws is not None:
+                probabilities[:, i] = probability[rows, np.minimum(days[:, i], self.num_steps - 1)]
+        return days, probabilities
+
+    def sweep_chunk(self, rng, size):
+        step_returns = rng.normal(loc=self.step_mean, scale=self.step_std, size=(size, self.num_steps))
+        prices = self.starting_price * np.cumprod(1 + step_returns, axis=1)
+
+        log_prices = up_draws = down_draws = None
+        if self.barrier_correction:
+            log_prices = np.log(prices)
+            up_draws = rng.random(prices.shape)
+            down_draws = rng.random(prices.shape)
+        take_profit_day, take_profit_probability = self.first_passages(prices, self.take_profit_prices, log_prices, up_draws)
+        stop_loss_day, stop_loss_probability = self.first_passages(prices, self.stop_loss_prices, log_prices, down_draws)
+
+        # Outcome of every path under every combination: (paths, take-profit levels, stop-loss levels)
+        take_profit_day, stop_loss_day = take_profit_day[:, :, None], stop_loss_day[:, None, :]
+        same_step = (take_profit_day == stop_loss_day) & (take_profit_day < self.num_steps)
+        take_profit_first = (take_profit_day < stop_loss_day) | (
+            same_step & (take_profit_probability[:, :, None] >= stop_loss_probability[:, None, :]))
+        held = (take_profit_day == self.num_steps) & (stop_loss_day == self.num_steps)
+        profit = np.where(held, (prices[:, -1] > self.starting_price)[:, None, None], take_profit_first)
+
+        outcomes = profit.reshape(size, -1).astype(np.float64)
+        self.joint_counts += outcomes.T @ outcomes
+
+    def monte_carlo_sweep(self):
+        rng = make_rng(self.seed, self.bit_generator)
+        completed = 0
+        while completed < self.rep_num:
+            size = min(self.chunk_size, self.rep_num - completed)
+            self.sweep_chunk(rng, size)
+            completed += size
+
+        self.probabilities = (np.diag(self.joint_counts) / self.rep_num).reshape(self.grid_shape)
+        self.df = pd.DataFrame(self.probabilities, index=pd.Index(self.take_profit_prices, name="Take Profit"),
+                               columns=pd.Index(self.stop_loss_prices, name="Stop Loss"))
+
+    def difference(self, cell, other=None, z=1.96):
+        """
+        Paired difference P(cell) - P(other) with its confidence interval. Both come from the same paths,
+        so the variance of the difference uses their joint outcomes:
+        Var = (p_a + p_b - 2 p_ab - (p_a - p_b)²) / N.
+
+        :return: (difference, lower bound, upper bound, half-width an unpaired comparison would have)
+        """
+        other = self.baseline if other is None else other
+        a = np.ravel_multi_index(cell, self.grid_shape)
+        b = np.ravel_multi_index(other, self.grid_shape)
+        n = self.rep_num
+        p_a, p_b, p_ab = self.joint_counts[a, a] / n, self.joint_counts[b, b] / n, self.joint_counts[a, b] / n
+
+        difference = p_a - p_b
+        half_width = z * np.sqrt(max(p_a + p_b - 2 * p_ab - difference**2, 0) / n)
+        unpaired_half_width = z * np.sqrt((p_a * (1 - p_a) + p_b * (1 - p_b)) / n)
+        return difference, difference - half_width, difference + half_width, unpaired_half_width
+
+    def difference_grid(self, z=1.96):
+        rows = [[self.difference((i, j), z=z) for j in range(self.grid_shape[1])] for i in range(self.grid_shape[0])]
+        return np.array(rows)  # (take-profit levels, stop-loss levels, 4)
+
+    def display_results(self):
+        baseline_tp = self.take_profit_prices[self.baseline[0]]
+        baseline_sl = self.stop_loss_prices[self.baseline[1]]
+        differences = self.difference_grid()
+
+        print("\n📊 Monte Carlo Take-Profit / Stop-Loss Sweep 📊")
+        print(f"Total Simulations: {self.rep_num} shared paths for {self.probabilities.size} combinations")
+        print(f"⏱️ Horizon        : {self.days} days x {self.steps_per_day} steps"
+              + (" (Brownian-bridge barrier correction)" if self.barrier_correction else ""))
+        print("\n📈 Probability of Profit:")
+        print(self.df.round(4))
+        print(f"\n⚖️ Paired differences vs. take profit {baseline_tp:g} / stop loss {baseline_sl:g} (95% CI):")
+        for i, take_profit in enumerate(self.take_profit_prices):
+            for j, stop_loss in enumerate(self.stop_loss_prices):
+                if (i, j) == tuple(self.baseline):
+                    continue
+                difference, lower, upper, unpaired = differences[i, j]
+                print(f"   TP {take_profit:g} / SL {stop_loss:g}: {difference:+.4f} [{lower:+.4f}, {upper:+.4f}]"
+                      f" (unpaired ±{unpaired:.4f})")
+
+    def visualization(self, output_path=None):
+        differences = self.difference_grid()
+        fig, ax = plt.subplots(figsize=(12, 8))
+        image = ax.imshow(self.probabilities, cmap="viridis", aspect="auto", origin="lower")
+        fig.colorbar(image, ax=ax, label="Probability of Profit")
+
+        for i in range(self.grid_shape[0]):
+            for j in range(self.grid_shape[1]):
+                difference, lower, upper, _ = differences[i, j]
+                significant = lower > 0 or upper < 0
+                ax.text(j, i, f"{self.probabilities[i, j]:.3f}\n{difference:+.3f}{' *' if significant else ''}",
+                        ha="center", va="center", fontsize=9, color="white")
+
+        ax.set_xticks(range(self.grid_shape[1]), [f"{level:g}" for level in self.stop_loss_prices])
+        ax.set_yticks(range(self.grid_shape[0]), [f"{level:g}" for level in self.take_profit_prices])
+        ax.set_xlabel("Stop-Loss Price", fontsize=12)
+        ax.set_ylabel("Take-Profit Price", fontsize=12)
+        ax.set_title("Monte Carlo Simulation: Probability of Profit by Exit Levels", fontsize=17, color="#393d47")
+        fig.text(0.5, 0.02, "Second line: paired difference to the baseline combination (* = 95% CI excludes 0)",
+                 ha="center", fontsize=11, color="#393d47")
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_sweep()
+        self.display_results()
+        self.visualization(output_path)
+
+
+CHOLESKY_CACHE = {}
+
+
+def cholesky_factor(covariance):
+    """
+    Lower-triangular L with L @ L.T == covariance. Factors are cached by the matrix contents,
+    so every batch (and every portfolio with the same covariance) reuses the same factorization.
+    """
+    covariance = np.ascontiguousarray(covariance, dtype=np.float64)
+    key = (covariance.shape, hashlib.sha256(covariance.tobytes()).hexdigest())
+    if key not in CHOLESKY_CACHE:
+        try:
+            CHOLESKY_CACHE[key] = np.linalg.cholesky(covariance)
+        except np.linalg.LinAlgError as error:
+            raise ValueError("The covariance matrix must be symmetric positive definite.") from error
+    return CHOLESKY_CACHE[key]
+
+
+class MonteCarloPortfolio:
+    def __init__(self, starting_prices, covariance, take_profit_prices, stop_loss_prices, rep_num,
+                 mean_returns=0.0005, weights=None, portfolio_take_profit=None, portfolio_stop_loss=None,
+                 days=30, seed=100, memory_limit=512 * 1024**2, dtype=np.float64, bit_generator=DEFAULT_BIT_GENERATOR):
+        """
+        :param starting_prices: (n,) starting price of every asset
+        :param covariance: (n, n) covariance matrix of the daily returns
+        :param take_profit_prices: Per-asset take-profit prices, shape (n,) or a scalar
+        :param stop_loss_prices: Per-asset stop-loss prices, shape (n,) or a scalar
+        :param mean_returns: Mean daily return of every asset, shape (n,) or a scalar
+        :param weights: Units held of every asset (default: one unit each)
+        :param portfolio_take_profit: Portfolio value at which the whole portfolio is closed in profit (optional)
+        :param portfolio_stop_loss: Portfolio value at which the whole portfolio is closed at a loss (optional)
+        :param memory_limit: Bytes the paths x days x assets tensors of one chunk may use
+        :param dtype: float32 halves the memory per path
+        """
+        self.starting_prices = np.asarray(starting_prices, dtype=np.float64)
+        num_assets = len(self.starting_prices)
+        self.num_assets = num_assets
+        self.cholesky = cholesky_factor(covariance)
+        if self.cholesky.shape != (num_assets, num_assets):
+            raise ValueError(f"The covariance matrix must be {num_assets} x {num_assets}.")
+
+        self.take_profit_prices = np.broadcast_to(np.asarray(take_profit_prices, dtype=np.float64), (num_assets,))
+        self.stop_loss_prices = np.broadcast_to(np.asarray(stop_loss_prices, dtype=np.float64), (num_assets,))
+        self.mean_returns = np.broadcast_to(np.asarray(mean_returns, dtype=np.float64), (num_assets,))
+        self.weights = np.ones(num_assets) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.portfolio_take_profit = portfolio_take_profit
+        self.portfolio_stop_loss = portfolio_stop_loss
+        self.starting_value = self.weights @ self.starting_prices
+        self.rep_num = rep_num
+        self.days = days
+        self.seed = seed
+        self.bit_generator = bit_generator
+        self.dtype = np.dtype(dtype)
+
+        # Per path: correlated returns/prices and the shocks they came from, plus two boolean masks
+        bytes_per_path = days * num_assets * (2 * self.dtype.itemsize + 2)
+        self.chunk_size = int(max(1, min(rep_num, memory_limit // bytes_per_path)))
+
+        self.asset_profit_counts = np.zeros(num_assets, dtype=np.int64)
+        self.profit_count = 0
+        self.take_profit_count = 0
+        self.stop_loss_count = 0
+        self.final_value_sum = 0.0
+
+    def first_day(self, hits, axis):
+        # First index along `axis` where hits is True; the length of the axis if it never is
+        return np.where(hits.any(axis=axis), hits.argmax(axis=axis), hits.shape[axis])
+
+    def simulate_chunk(self, rng, size):
+        shocks = rng.standard_normal((size, self.days, self.num_assets), dtype=self.dtype)
+        prices = shocks @ self.cholesky.T.astype(self.dtype)  # Correlated daily returns
+        del shocks
+        prices += self.mean_returns.astype(self.dtype)
+        prices += 1
+        np.cumprod(prices, axis=1, out=prices)
+        prices *= self.starting_prices.astype(self.dtype)
+
+        # Per-asset exits: first day each asset hits its take-profit or stop-loss level
+        take_profit_day = self.first_day(prices >= self.take_profit_prices.astype(self.dtype), axis=1)
+        stop_loss_day = self.first_day(prices <= self.stop_loss_prices.astype(self.dtype), axis=1)
+        exit_day = np.minimum(np.minimum(take_profit_day, stop_loss_day), self.days - 1)
+
+        # After its exit, an asset's position is frozen at the exit price
+        exit_prices = np.take_along_axis(prices, exit_day[:, None, :], axis=1)
+        after_exit = np.arange(self.days)[None, :, None] > exit_day[:, None, :]
+        np.copyto(prices, exit_prices, where=after_exit)
+
+        # Portfolio-level exits on the value of the (partly frozen) positions
+        values = prices @ self.weights.astype(self.dtype)
+        portfolio_take_profit_day = np.full(size, self.days)
+        portfolio_stop_loss_day = np.full(size, self.days)
+        if self.portfolio_take_profit is not None:
+            portfolio_take_profit_day = self.first_day(values >= self.portfolio_take_profit, axis=1)
+        if self.portfolio_stop_loss is not None:
+            portfolio_stop_loss_day = self.first_day(values <= self.portfolio_stop_loss, axis=1)
+        close_day = np.minimum(np.minimum(portfolio_take_profit_day, portfolio_stop_loss_day), self.days - 1)
+
+        final_values = values[np.arange(size), close_day]
+        sold_prices = prices[np.arange(size), close_day, :]  # A portfolio exit sells the assets still held
+        self.asset_profit_counts += np.count_nonzero(sold_prices > self.starting_prices, axis=0)
+        self.profit_count += np.count_nonzero(final_values > self.starting_value)
+        self.take_profit_count += np.count_nonzero(portfolio_take_profit_day < portfolio_stop_loss_day)
+        self.stop_loss_count += np.count_nonzero(portfolio_stop_loss_day < portfolio_take_profit_day)
+        self.final_value_sum += final_values.sum(dtype=np.float64)
+
+    def monte_carlo_portfolio(self):
+        rng = make_rng(self.seed, self.bit_generator)
+        completed = 0
+        while completed < self.rep_num:
+            size = min(self.chunk_size, self.rep_num - completed)
+            self.simulate_chunk(rng, size)
+            completed += size
+
+        self.probability = self.profit_count / self.rep_num
+        self.asset_probabilities = self.asset_profit_counts / self.rep_num
+        self.mean_final_value = self.final_value_sum / self.rep_num
+
+    def display_results(self):
+        print("\n📊 Monte Carlo Portfolio Simulation Results 📊")
+        print(f"Total Simulations       : {self.rep_num} paths x {self.days} days x {self.num_assets} assets")
+        print(f"Paths per Chunk         : {self.chunk_size}")
+        print(f"📈 Probability of Portfolio Profit: {self.probability:.4f} ({self.probability * 100:.2f}%)")
+        print(f"🎯 Portfolio Take-Profit Hit      : {self.take_profit_count / self.rep_num:.4f}")
+        print(f"🛑 Portfolio Stop-Loss Hit        : {self.stop_loss_count / self.rep_num:.4f}")
+        print(f"💰 Mean Final Value               : {self.mean_final_value:.2f} (start {self.starting_value:.2f})")
+        print(f"📋 Per-Asset Profit Probability   : min {self.asset_probabilities.min():.4f}, "
+              f"mean {self.asset_probabilities.mean():.4f}, max {self.asset_probabilities.max():.4f}")
+
+    def visualization(self, output_path=None):
+        fig, (ax_portfolio, ax_assets) = plt.subplots(1, 2, figsize=(15, 6))
+
+        counts = [self.profit_count, self.rep_num - self.profit_count]
+        ax_portfolio.bar(["Profit", "Loss"], counts, color=["#f6be06", "#370560"])
+        for i, count in enumerate(counts):
+            ax_portfolio.text(i, count + self.rep_num * 0.01, f"{count}", ha="center", fontsize=12)
+        ax_portfolio.set_title("Portfolio Outcome", fontsize=14, color="#393d47")
+        ax_portfolio.set_ylabel("Count", fontsize=12)
+
+        # With hundreds of assets a histogram of their profit probabilities stays readable
+        ax_assets.hist(self.asset_probabilities, bins=min(50, self.num_assets), color="#f6be06", edgecolor="#370560")
+        ax_assets.set_title("Per-Asset Probability of Profit", fontsize=14, color="#393d47")
+        ax_assets.set_xlabel("Probability of Profit", fontsize=12)
+        ax_assets.set_ylabel("Assets", fontsize=12)
+
+        fig.suptitle("Monte Carlo Simulation: Correlated Portfolio Over One Month", fontsize=17, color="#393d47")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.15, top=0.85, wspace=0.3)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_portfolio()
+        self.display_results()
+        self.visualization(output_path)
+
+
+def main():
+    try:
+        rep_num = int(input("🔢 Enter number of simulations (minimum 100,000 recommended): "))
+        if rep_num < 100_000:
+            print("⚠️ Too low! Setting number of simulations to 100,000.")
+            rep_num = 100_000
+    except:
+        print("⚠️ Invalid input. Using default value: 100,000 simulations.")
+        rep_num = 100_000
+
+    app = MonteCarloTradeMarket(
+        starting_price=100,
+        take_profit_price=110,  # +10%
+        stop_loss_price=95,     # -5%
+        rep_num=rep_num
+    )
+
+    app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,141 +1,308 @@
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-import numpy as np
-import pandas as pd
-import seaborn as sn
-
-class Wheel_EqualDivide:
-    def __init__(self, num_spin=100000, section_size=8):
-        """
-        Initialize the simulation with the number of spins and section size.
-        
-        :param num_spin: Number of wheel spins (default is 100,000)
-        :param section_size: Number of sections on the wheel (default is 8)
-        """
-        self.num_spin = num_spin
-        self.section_size = section_size
-
-    def monte_carlo_wheel(self):
-        """
-        Simulate the wheel spins and compute the frequency of each section.
-        Also, calculates the probability for each section based on its frequency.
-        """
-        np.random.seed(100)
-        self.all_spins = np.random.randint(low=1, high=self.section_size + 1, size=self.num_spin)
-        
-        self.df = (pd.DataFrame(self.all_spins)
-                   .value_counts()
-                   .reset_index()
-                   .rename(columns={0: "Chosen Section", "count": "Frequency"})
-                   .sort_values(by="Chosen Section", ignore_index=True)
-                  )
-
-        # Calculate probability for each section
-        self.df["Probability"] = self.df["Frequency"] / self.num_spin
-
-    def display_results(self):
-        """
-        Display the results of the Monte Carlo simulation, including the chosen section and its frequency.
-        This is a detailed output of the outcome of the simulation.
-        """
-        print("Results of the Monte Carlo Simulation:")
-        print(f"Total Spins: {self.num_spin}")
-        print(f"Total Sections: {self.section_size}")
-        print("\nDistribution of Outcomes (Section, Frequency, Probability):\n")
-        
-        for index, row in self.df.iterrows():
-            print(f"Section: {row['Chosen Section']} | Frequency: {row['Frequency']} | Probability: {row['Probability']:.4f}")
-
-    def visualization(self):
-        """
-        Visualize the results of the simulation through a pie chart, bar graph, and heatmap.
-        The pie chart shows the probability distribution, the bar chart shows the frequency of outcomes,
-        and the heatmap visualizes the frequency distribution.
-        """
-        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
-        gradient = ["#81a4f7", "#8193f7", "#8381f7", "#9d81f7", "#7457b3"]
-        
-        # Create a figure with subplots
-        fig = plt.figure(figsize=(16.5, 9.5))
-        gs = gridspec.GridSpec(1, 2, width_ratios=[5, 3])
-        gs_left = gridspec.GridSpecFromSubplotSpec(2, 1, subplot_spec=gs[0])
-    
-        # Pie chart showing the probability distribution
-        axes_0 = plt.subplot(gs_left[0])
-        axes_0.pie(
-            self.df["Probability"], 
-            labels=self.df["Chosen Section"], 
-            colors=colors, 
-            autopct="%1.2f%%",
-            startangle=90,
-            textprops={'color': "#393d47", 'fontsize': 12}
-        )
-        axes_0.set_title("Chance of Landing on Each Section", fontsize=14, color="#393d47")
-        
-        # Bar chart showing the frequency distribution
-        axes_1 = plt.subplot(gs_left[1])
-        axes_1.bar(self.df["Chosen Section"], self.df["Frequency"], color=colors[0])
-        axes_1.grid()
-        axes_1.set_axisbelow(True)
-        axes_1.set_title("Distribution of Wheel Spin Outcomes", fontsize=14, color="#393d47")
-        
-        # Heatmap for frequency distribution
-        axes_2 = plt.subplot(gs[1])
-        axes_2 = sn.heatmap(
-            self.df[["Frequency"]],
-            cmap=sn.color_palette(gradient, len(gradient)),
-            annot=True,
-            annot_kws={"size": 14, "color": "w"},
-            fmt=".2f", 
-            linewidths=0.5, 
-            linecolor="black"
-        )
-        axes_2.set_ylabel("Section", fontsize=14, color="#393d47")
-        axes_2.set_xlabel("Frequency", fontsize=14, color="#393d47")
-        axes_2.set_title("Frequency Distribution Heatmap", fontsize=14, color="#393d47")
-        
-        # Add dividing lines for better layout
-        line = plt.Line2D((.55, .55), (.1, .92), color="#6b6c6e", linewidth=2, linestyle="--")
-        fig.add_artist(line)
-        
-        line2 = plt.Line2D((.05, .52), (0.5, 0.5), color="#6b6c6e", linewidth=2, linestyle="--")
-        fig.add_artist(line2)
-        
-        # Main title for the figure
-        fig.suptitle("Monte Carlo Simulation: Probability Analysis of an Equally Divided Wheel", fontsize=17, color="#393d47", weight="bold")
-        
-        # Adjust layout and show the figure
-        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.85, wspace=0.4, hspace=0.4)
-        plt.show()
-
-    def run(self):
-        
-        self.monte_carlo_wheel()
-        self.display_results()
-        self.visualization()
-
-def main():
-    
-    try:
-        num_spin = int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
-        if num_spin < 100000:
-            num_spin = 100000
-            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
-    except:
-        num_spin = 100000
-        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
-    
-    try:
-        section_size = int(input("Enter the number of sections for the wheel (e.g., 8, 10, 12): "))
-        if section_size < 1:
-            section_size = 8
-            print("Warning: The number of sections must be positive. Defaulting to 8 sections.")
-    except:
-        section_size = 8
-        print("Warning: Invalid input detected, defaulting to 8 sections.")
-    
-    app = Wheel_EqualDivide(num_spin=num_spin, section_size=section_size)
-    app.run()
-
-if __name__ == "__main__":
-    main()
+import matplotlib.pyplot as plt
+import matplotlib.gridspec as gridspec
+import numpy as np
+import pandas as pd
+import seaborn as sn
+from fairness import fairness_statistics, stream_fairness
+from figure_export import show_or_save
+
+class Wheel_EqualDivide:
+    def __init__(self, num_spin=100000, section_size=8):
+        """
+        Initialize the simulation with the number of spins and section size.
+        
+        :param num_spin: Number of wheel spins (default is 100,000)
+        :param section_size: Number of sections on the wheel (default is 8)
+        """
+        self.num_spin = num_spin
+        self.section_size = section_size
+
+    def monte_carlo_wheel(self):
+        """
+        Simulate the wheel spins and compute the frequency of each section.
+        Also, calculates the probability for each section based on its frequency.
+        """
+        np.random.seed(100)
+        self.all_spins = np.random.randint(low=1, high=self.section_size + 1, size=self.num_spin)
+        
+        self.df = (pd.DataFrame(self.all_spins)
+                   .value_counts()
+                   .reset_index()
+                   .rename(columns={0: "Chosen Section", "count": "Frequency"})
+                   .sort_values(by="Chosen Section", ignore_index=True)
+                  )
+
+        # Calculate probability for each section
+        self.df["Probability"] = self.df["Frequency"] / self.num_spin
+
+    @property
+    def fairness(self):
+        frequencies = np.zeros(self.section_size, dtype=np.int64)
+        frequencies[self.df["Chosen Section"].to_numpy() - 1] = self.df["Frequency"].to_numpy()
+        return fairness_statistics(frequencies)
+
+    def validate_fairness(self, num_spin=10**10, chunk_size=10_000_000, alpha=0.01, early_stop=True, rng=None):
+        """
+        Streams spins in chunks (only their counts are kept) through the fairness tests.
+
+        :param rng: Generator under test (default: PCG64 seeded with 100)
+        :return: FairnessMonitor with the counts, test results and verdict
+        """
+        rng = rng if rng is not None else np.random.default_rng(100)
+        return stream_fairness(lambda size: rng.integers(0, self.section_size, size), np.full(self.section_size, 1 / self.section_size),
+                               num_spin, chunk_size, alpha, early_stop)
+
+    def display_results(self):
+        """
+        Display the results of the Monte Carlo simulation, including the chosen section and its frequency.
+        This is a detailed output of the outcome of the simulation.
+        """
+        print("Results of the Monte Carlo Simulation:")
+        print(f"Total Spins: {self.num_spin}")
+        print(f"Total Sections: {self.section_size}")
+        print("\nDistribution of Outcomes (Section, Frequency, Probability):\n")
+        
+        for section, frequency, probability in zip(self.df["Chosen Section"], self.df["Frequency"], self.df["Probability"]):
+            print(f"Section: {section} | Frequency: {frequency} | Probability: {probability:.4f}")
+
+        print()
+        self.fairness.display(labels=np.arange(1, self.section_size + 1))
+
+    def visualization(self, output_path=None):
+        """
+        Visualize the results of the simulation through a pie chart, bar graph, and heatmap.
+        The pie chart shows the probability distribution, the bar chart shows the frequency of outcomes,
+        and the heatmap visualizes the frequency distribution.
+        """
+        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
+        gradient = ["#81a4f7", "#8193f7", "#8381f7", "#9d81f7", "#7457b3"]
+        
+        # Create a figure with subplots
+        fig = plt.figure(figsize=(16.5, 9.5))
+        gs = gridspec.GridSpec(1, 2, width_ratios=[5, 3])
+        gs_left = gridspec.GridSpecFromSubplotSpec(2, 1, subplot_spec=gs[0])
+    
+        # Pie chart showing the probability distribution
+        axes_0 = plt.subplot(gs_left[0])
+        axes_0.pie(
+            self.df["Probability"], 
+            labels=self.df["Chosen Section"], 
+            colors=colors, 
+            autopct="%1.2f%%",
+            startangle=90,
+            textprops={'color': "#393d47", 'fontsize': 12}
+        )
+        axes_0.set_title("Chance of Landing on Each Section", fontsize=14, color="#393d47")
+        
+        # Bar chart showing the frequency distribution
+        axes_1 = plt.subplot(gs_left[1])
+        axes_1.bar(self.df["Chosen Section"], self.df["Frequency"], color=colors[0])
+        axes_1.grid()
+        axes_1.set_axisbelow(True)
+        axes_1.set_title("Distribution of Wheel Spin Outcomes", fontsize=14, color="#393d47")
+        
+        # Heatmap for frequency distribution
+        axes_2 = plt.subplot(gs[1])
+        axes_2 = sn.heatmap(
+            self.df[["Frequency"]],
+            cmap=sn.color_palette(gradient, len(gradient)),
+            annot=True,
+            annot_kws={"size": 14, "color": "w"},
+            fmt=".2f", 
+            linewidths=0.5, 
+            linecolor="black"
+        )
+        axes_2.set_ylabel("Section", fontsize=14, color="#393d47")
+        axes_2.set_xlabel("Frequency", fontsize=14, color="#393d47")
+        axes_2.set_title("Frequency Distribution Heatmap", fontsize=14, color="#393d47")
+        
+        # Add dividing lines for better layout
+        line = plt.Line2D((.55, .55), (.1, .92), color="#6b6c6e", linewidth=2, linestyle="--")
+        fig.add_artist(line)
+        
+        line2 = plt.Line2D((.05, .52), (0.5, 0.5), color="#6b6c6e", linewidth=2, linestyle="--")
+        fig.add_artist(line2)
+        
+        # Main title for the figure
+        fig.suptitle("Monte Carlo Simulation: Probability Analysis of an Equally Divided Wheel", fontsize=17, color="#393d47", weight="bold")
+        
+        # Adjust layout and show the figure
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.85, wspace=0.4, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        
+        self.monte_carlo_wheel()
+        self.display_results()
+        self.visualization(output_path)
+
+class AliasTable:
+    def __init__(self, weights):
+        """
+        Vose's alias method: every section gets one column of height 1/n that holds part of the section
+        itself and, above it, part of one "alias" section. Built once in O(n), it turns every draw into one
+        uniform column pick plus one comparison, whatever the number of sections.
+
+        :param weights: Non-negative section weights (need not sum to 1)
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0 or np.any(weights < 0) or weights.sum() <= 0:
+            raise ValueError("weights must be a non-empty list of non-negative numbers with a positive sum")
+        self.size = len(weights)
+        self.probabilities = weights / weights.sum()
+        self.keep = np.ones(self.size)  # Share of column i that belongs to section i
+        self.alias = np.arange(self.size)
+
+        scaled = self.probabilities * self.size
+        small = [i for i in range(self.size) if scaled[i] < 1]
+        large = [i for i in range(self.size) if scaled[i] >= 1]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.keep[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+        # Leftovers are 1 up to rounding errors
+        for i in small + large:
+            self.keep[i] = 1.0
+
+    def sample(self, rng, size):
+        # One uniform per draw: its integer part picks the column, its fraction decides section or alias
+        scaled = rng.random(size) * self.size
+        columns = np.minimum(scaled.astype(np.int64), self.size - 1)  # Rounding can reach size itself
+        return np.where(scaled - columns < self.keep[columns], columns, self.alias[columns])
+
+
+class Wheel_Weighted:
+    def __init__(self, weights, payouts=None, num_spin=100000, seed=100, chunk_size=1_000_000):
+        """
+        Wheel with unequal sections, sampled through an alias table.
+
+        :param weights: Relative size of every section
+        :param payouts: Prize of every section (default: the section number)
+        :param num_spin: Number of wheel spins
+        :param chunk_size: Spins drawn at a time; frequencies are accumulated with bincount
+        """
+        self.table = AliasTable(weights)
+        self.section_size = self.table.size
+        self.payouts = np.arange(1, self.section_size + 1, dtype=np.float64) if payouts is None else np.asarray(payouts, dtype=np.float64)
+        if self.payouts.shape != (self.section_size,):
+            raise ValueError("payouts needs one value per section")
+        self.num_spin = num_spin
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        # Exact payout distribution of one spin, to validate the simulation against
+        self.expected_payout = float(np.dot(self.table.probabilities, self.payouts))
+        self.payout_variance = float(np.dot(self.table.probabilities, (self.payouts - self.expected_payout)**2))
+
+    def monte_carlo_wheel(self):
+        rng = np.random.default_rng(self.seed)
+        self.frequencies = np.zeros(self.section_size, dtype=np.int64)
+        for start in range(0, self.num_spin, self.chunk_size):
+            sections = self.table.sample(rng, min(self.chunk_size, self.num_spin - start))
+            self.frequencies += np.bincount(sections, minlength=self.section_size)
+
+        self.df = pd.DataFrame({
+            "Chosen Section": np.arange(1, self.section_size + 1),
+            "Frequency": self.frequencies,
+            "Probability": self.frequencies / self.num_spin,
+            "Expected Probability": self.table.probabilities,
+            "Payout": self.payouts,
+        })
+        self.mean_payout = float(np.dot(self.frequencies, self.payouts) / self.num_spin)
+        self.payout_standard_error = np.sqrt(self.payout_variance / self.num_spin)
+        self.fairness = fairness_statistics(self.frequencies, self.table.probabilities)
+
+    def validate_fairness(self, num_spin=10**10, chunk_size=10_000_000, alpha=0.01, early_stop=True, rng=None):
+        """
+        Streams spins in chunks (only their counts are kept) through the fairness tests against the weights.
+
+        :param rng: Generator under test (default: PCG64 seeded with self.seed)
+        :return: FairnessMonitor with the counts, test results and verdict
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.seed)
+        return stream_fairness(lambda size: self.table.sample(rng, size), self.table.probabilities, num_spin,
+                               chunk_size, alpha, early_stop)
+
+    def display_results(self, top=10):
+        print("Results of the Monte Carlo Simulation:")
+        print(f"Total Spins: {self.num_spin}")
+        print(f"Total Sections: {self.section_size}")
+        print(f"\nExpected Payout per Spin: {self.expected_payout:.4f} (exact) | {self.mean_payout:.4f} (simulated)")
+        print(f"Payout Variance per Spin: {self.payout_variance:.4f} (exact), standard error of the simulated mean: {self.payout_standard_error:.4f}")
+        z = (self.mean_payout - self.expected_payout) / self.payout_standard_error if self.payout_standard_error > 0 else 0.0
+        print(f"Simulated mean is {abs(z):.2f} standard errors from the exact value")
+
+        print(f"\nLargest {min(top, self.section_size)} Sections (Section, Frequency, Probability, Expected):\n")
+        largest = self.df.nlargest(top, "Expected Probability")
+        for section, frequency, probability, expected in zip(largest["Chosen Section"], largest["Frequency"],
+                                                             largest["Probability"], largest["Expected Probability"]):
+            print(f"Section: {section} | Frequency: {frequency} | Probability: {probability:.4f} | Expected: {expected:.4f}")
+
+        print()
+        self.fairness.display(labels=np.arange(1, self.section_size + 1))
+
+    def visualization(self, output_path=None):
+        colors = ["#81a4f7", "#a8f781", "#b081f7", "#faa946"]
+        fig, (axes_0, axes_1) = plt.subplots(2, 1, figsize=(16.5, 9.5))
+        sections = self.df["Chosen Section"]
+        expected = self.table.probabilities
+
+        if self.section_size <= 50:
+            axes_0.bar(sections, self.df["Probability"], color=colors[0], label="Simulated")
+            axes_0.scatter(sections, expected, color=colors[3], zorder=3, label="Exact")
+        else:
+            axes_0.plot(sections, self.df["Probability"], color=colors[0], linewidth=0.8, label="Simulated")
+            axes_0.plot(sections, expected, color=colors[3], linewidth=1.5, label="Exact")
+        axes_0.grid()
+        axes_0.set_axisbelow(True)
+        axes_0.legend()
+        axes_0.set_title("Chance of Landing on Each Section", fontsize=14, color="#393d47")
+
+        # Standardized deviation of every frequency from its binomial expectation
+        spread = np.sqrt(self.num_spin * expected * (1 - expected))
+        residuals = np.divide(self.frequencies - self.num_spin * expected, spread, out=np.zeros(self.section_size), where=spread > 0)
+        axes_1.bar(sections, residuals, color=colors[2], width=1.0 if self.section_size > 50 else 0.8)
+        axes_1.axhline(2, color=colors[3], linestyle="--")
+        axes_1.axhline(-2, color=colors[3], linestyle="--")
+        axes_1.grid()
+        axes_1.set_axisbelow(True)
+        axes_1.set_xlabel("Section", fontsize=12, color="#393d47")
+        axes_1.set_title("Standardized Deviation from the Exact Frequency", fontsize=14, color="#393d47")
+
+        fig.suptitle(f"Monte Carlo Simulation: Weighted Wheel (Expected Payout {self.expected_payout:.3f}, Simulated {self.mean_payout:.3f})",
+                     fontsize=17, color="#393d47", weight="bold")
+        plt.subplots_adjust(left=0.1, right=0.9, bottom=0.1, top=0.88, hspace=0.4)
+        show_or_save(fig, output_path)
+
+    def run(self, output_path=None):
+        self.monte_carlo_wheel()
+        self.display_results()
+        self.visualization(output_path)
+
+def main():
+    
+    try:
+        num_spin = int(input("Please enter a value greater than 100,000 for the simulation sample rate: "))
+        if num_spin < 100000:
+            num_spin = 100000
+            print("Warning: Your input was less than 100,000, so the sample rate has been adjusted to 100,000.")
+    except:
+        num_spin = 100000
+        print("Warning: A non-numeric input was detected, so the sample rate has been adjusted to 100,000.")
+    
+    try:
+        section_size = int(input("Enter the number of sections for the wheel (e.g., 8, 10, 12): "))
+        if section_size < 1:
+            section_size = 8
+            print("Warning: The number of sections must be positive. Defaulting to 8 sections.")
+    except:
+        section_size = 8
+        print("Warning: Invalid input detected, defaulting to 8 sections.")
+    
+    app = Wheel_EqualDivide(num_spin=num_spin, section_size=section_size)
+    app.run()
+
+if __name__ == "__main__":
+    main()
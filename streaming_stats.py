@@ -0,0 +1,116 @@
+import numpy as np
+
+"""
+📊 Streaming Histograms & Quantiles 📊
+
+Keeping every simulated value to compute quantiles afterwards needs memory proportional to the
+number of simulations. A streaming histogram keeps a fixed number of fine bins instead, updated chunk
+by chunk. Histograms with the same bins are merged by adding them, so runs split over workers
+(or resumed from a checkpoint) combine exactly.
+
+Key Features:
+- `StreamingHistogram(low, high, bins)`: counts AND value sums per bin, plus under/overflow bins and
+  the exact minimum and maximum, so no value is ever dropped.
+- `quantile(q)` interpolates inside the bin holding the q-th value; its error is below one bin width.
+  Choose `low` and `high` to cover the bulk of the values: the under/overflow bins only know their
+  count, sum and extreme value, so quantiles falling inside them are rough.
+- `tail_mean(q)` is the mean of the lowest q fraction of the values (exact for full bins, which
+  know their sums), as needed for the expected shortfall (CVaR).
+- `value_at_risk` / `conditional_value_at_risk` turn a P&L histogram into loss figures.
+"""
+
+
+class StreamingHistogram:
+    def __init__(self, low, high, bins=4096):
+        self.low = float(low)
+        self.high = float(high)
+        self.bins = bins
+        self.width = (self.high - self.low) / bins
+        # Slot 0 holds values below `low`, slot bins + 1 values at or above `high`
+        self.counts = np.zeros(bins + 2, dtype=np.int64)
+        self.sums = np.zeros(bins + 2)
+        self.count = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @property
+    def edges(self):
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        slots = np.clip(np.floor((values - self.low) / self.width), -1, self.bins).astype(np.int64) + 1
+        self.counts += np.bincount(slots, minlength=self.bins + 2)
+        self.sums += np.bincount(slots, weights=values, minlength=self.bins + 2)
+        self.count += len(values)
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+
+    def merge(self, other):
+        if (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError("Only histograms with the same bins can be merged.")
+        self.counts += other.counts
+        self.sums += other.sums
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def slot_bounds(self, slot):
+        if slot == 0:
+            return self.minimum, min(self.low, self.maximum)
+        if slot == self.bins + 1:
+            return max(self.high, self.minimum), self.maximum
+        return self.low + (slot - 1) * self.width, self.low + slot * self.width
+
+    def locate(self, q):
+        # Slot holding the q-th value, and how many of its values lie below that position
+        target = q * self.count
+        cumulative = np.cumsum(self.counts)
+        slot = min(int(np.searchsorted(cumulative, target, side="left")), self.bins + 1)
+        before = cumulative[slot] - self.counts[slot]
+        return slot, target - before
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+        slot, inside = self.locate(q)
+        lower, upper = self.slot_bounds(slot)
+        fraction = inside / self.counts[slot] if self.counts[slot] else 0.0
+        return float(np.clip(lower + fraction * (upper - lower), self.minimum, self.maximum))
+
+    def tail_mean(self, q):
+        """
+        Mean of the lowest q fraction of the values.
+        """
+        if self.count == 0 or q <= 0:
+            return np.nan
+        slot, inside = self.locate(q)
+        total = self.sums[:slot].sum()
+        if self.counts[slot]:
+            # Part of the boundary slot: its values are assumed evenly spread over the slot
+            lower, upper = self.slot_bounds(slot)
+            fraction = inside / self.counts[slot]
+            total += inside * (lower + fraction * (upper - lower) / 2)
+        return total / (q * self.count)
+
+    def mean(self):
+        return self.sums.sum() / self.count if self.count else np.nan
+
+    def bin_centers_and_counts(self):
+        return self.low + (np.arange(self.bins) + 0.5) * self.width, self.counts[1:-1]
+
+
+def value_at_risk(pnl_histogram, confidence=0.95):
+    """
+    Loss that is exceeded only with probability 1 - confidence (positive numbers are losses).
+    """
+    return -pnl_histogram.quantile(1 - confidence)
+
+
+def conditional_value_at_risk(pnl_histogram, confidence=0.95):
+    """
+    Expected loss in the worst 1 - confidence fraction of outcomes (expected shortfall).
+    """
+    return -pnl_histogram.tail_mean(1 - confidence)
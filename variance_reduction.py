@@ -0,0 +1,123 @@
+import numpy as np
+
+"""
+📉 Variance Reduction: Antithetic Variates and Control Variates 📉
+
+Plain Monte Carlo spends many samples just averaging out noise. These accumulators give the same
+confidence-interval width with a fraction of the samples, and report how much they saved.
+
+Key Features:
+- `AntitheticAccumulator`: every sample is paired with a mirrored one (u → 1 - u for uniforms,
+  z → -z for normal returns). Negatively correlated pairs cancel part of each other's noise.
+- `ControlVariateAccumulator`: the estimate is corrected with a quantity whose expectation is
+  known exactly (e.g. the untruncated 30-day return of a trading path), using the optimal
+  regression coefficient.
+- Both keep only running sums, so they are updated chunk by chunk with bounded memory.
+- `variance_reduction_factor` compares against plain sampling with the same number of samples;
+  a factor of 4 means plain Monte Carlo would need 4× the samples for the same accuracy.
+"""
+
+VARIANCE_REDUCTION_METHODS = ("antithetic", "control")
+
+
+class VarianceReducedEstimate:
+    def __init__(self, estimate, standard_error, variance_reduction_factor, num_samples):
+        self.estimate = estimate
+        self.standard_error = standard_error
+        self.variance_reduction_factor = variance_reduction_factor
+        self.num_samples = num_samples
+
+
+class AntitheticAccumulator:
+    def __init__(self):
+        self.pairs = 0
+        self.sum_pair = 0.0
+        self.sum_pair_sq = 0.0
+        self.sum_single = 0.0
+        self.sum_single_sq = 0.0
+
+    def update(self, values, mirrored_values):
+        values = np.asarray(values, dtype=np.float64)
+        mirrored_values = np.asarray(mirrored_values, dtype=np.float64)
+        pair_means = (values + mirrored_values) / 2
+
+        self.pairs += len(pair_means)
+        self.sum_pair += pair_means.sum()
+        self.sum_pair_sq += np.dot(pair_means, pair_means)
+        self.sum_single += values.sum() + mirrored_values.sum()
+        self.sum_single_sq += np.dot(values, values) + np.dot(mirrored_values, mirrored_values)
+
+    def merge(self, other):
+        self.pairs += other.pairs
+        self.sum_pair += other.sum_pair
+        self.sum_pair_sq += other.sum_pair_sq
+        self.sum_single += other.sum_single
+        self.sum_single_sq += other.sum_single_sq
+
+    def result(self):
+        n = self.pairs
+        mean = self.sum_pair / n
+        pair_variance = (self.sum_pair_sq - n * mean**2) / (n - 1)
+        single_variance = (self.sum_single_sq - 2 * n * mean**2) / (2 * n - 1)
+
+        # Plain sampling with the same 2n samples would have variance single_variance / (2n)
+        plain_variance = single_variance / (2 * n)
+        reduced_variance = pair_variance / n
+        factor = plain_variance / reduced_variance if reduced_variance > 0 else np.inf
+        return VarianceReducedEstimate(mean, np.sqrt(reduced_variance), factor, 2 * n)
+
+
+class ControlVariateAccumulator:
+    def __init__(self, control_mean):
+        """
+        :param control_mean: Exact expectation of the control variate
+        """
+        self.control_mean = control_mean
+        self.n = 0
+        self.sum_y = 0.0
+        self.sum_c = 0.0
+        self.sum_yy = 0.0
+        self.sum_cc = 0.0
+        self.sum_yc = 0.0
+
+    def update(self, values, controls):
+        values = np.asarray(values, dtype=np.float64)
+        controls = np.asarray(controls, dtype=np.float64)
+
+        self.n += len(values)
+        self.sum_y += values.sum()
+        self.sum_c += controls.sum()
+        self.sum_yy += np.dot(values, values)
+        self.sum_cc += np.dot(controls, controls)
+        self.sum_yc += np.dot(values, controls)
+
+    def merge(self, other):
+        self.n += other.n
+        self.sum_y += other.sum_y
+        self.sum_c += other.sum_c
+        self.sum_yy += other.sum_yy
+        self.sum_cc += other.sum_cc
+        self.sum_yc += other.sum_yc
+
+    def result(self):
+        n = self.n
+        mean_y = self.sum_y / n
+        mean_c = self.sum_c / n
+        var_y = (self.sum_yy - n * mean_y**2) / (n - 1)
+        var_c = (self.sum_cc - n * mean_c**2) / (n - 1)
+        cov_yc = (self.sum_yc - n * mean_y * mean_c) / (n - 1)
+
+        # Optimal coefficient: removes the part of y explained by the control
+        beta = cov_yc / var_c if var_c > 0 else 0.0
+        estimate = mean_y - beta * (mean_c - self.control_mean)
+        reduced_variance = max(var_y - beta * cov_yc, 0.0)
+        factor = var_y / reduced_variance if reduced_variance > 0 else np.inf
+        return VarianceReducedEstimate(estimate, np.sqrt(reduced_variance / n), factor, n)
+
+
+def make_accumulator(method, control_mean=None):
+    if method == "antithetic":
+        return AntitheticAccumulator()
+    if method == "control":
+        return ControlVariateAccumulator(control_mean)
+    raise ValueError(f"Unknown variance reduction method '{method}'. Use one of: {', '.join(VARIANCE_REDUCTION_METHODS)}")